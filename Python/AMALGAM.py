@@ -92,12 +92,38 @@
 #                    → Discrete AMALGAM                                   #
 #   options     [input] Structure with computational settings/options     #
 #    .parallel      Multi-core computation chains?        DEF: 'yes'      #
+#     = 'broker'    TCP broker: local and remote AMALGAM_worker's         #
+#    .address       'host:port' of broker    DEF: 'localhost:0'           #
+#                   non-local host requires env. AMALGAM_AUTHKEY          #
+#    .backend       'process'/'thread'/'serial'/Executor  DEF: 'process'  #
+#                   Executor is not saved: pass again on restart          #
+#    .concurrency   # concurrent evaluations async def    DEF: 100        #
+#    .surrogate     Pre-screen children: 'no'/'knn'/'rbf' DEF: 'no'       #
+#    .oversample    # candidates per child if surrogate   DEF: 4          #
+#    .abort         Func_name may stop dominated children DEF: 'no'       #
+#    .epsilon       Box size each objective: Z is bounded DEF: 'no'       #
+#                   epsilon-dominance archive [updated each generation]   #
 #    .IO            If parallel, IO writing model?        DEF: 'no'       #
 #    .screen        Print screen output during trial?     DEF: 'no'       #
 #    .density       Density of rank 1,2,3, etc. solutions DEF: 'crowding' #
 #     = 'crowding'  Crowding distance:Deb et al: NSGA-II  DEFault         #
-#     = 'strength'  Strength Pareto:Zitzler&Thiele: SPEA-2                #
+#     = 'strength'  SPEA-2 strength and k-NN density: Zitzler et al.      #
+#     = 'hypervolume' Exclusive hypervolume contribution: SMS-EMOA        #
+#    .ranking       Pareto ranking: 'fast'/'matlab'/      DEF: 'fast'     #
+#                   'incremental' [reuses parents]                        #
 #    .modout        Return model simulations?             DEF: 'no'       #
+#    .vectorized    Func_name evaluates Nxd matrix at once DEF: 'no'      #
+#    .async         Steady-state: no barrier between gen. DEF: 'no'       #
+#    .chunksize     # parameter vectors per task of pool  DEF: 'auto'     #
+#    .cache         Reuse FX,Y of evaluated vectors [LRU] DEF: 'no'       #
+#    .cache_size    Maximum # parameter vectors in cache  DEF: 10000      #
+#    .store         Share FX,Y of runs [AMALGAM_store.db] DEF: 'no'       #
+#    .timeout       Maximum run time one evaluation [sec] DEF: np.inf     #
+#                   finite: backend 'process' or 'serial'                 #
+#    .retry         # retries of failed evaluation        DEF: 0          #
+#    .failure       Failed evaluation: 'error'/'penalty'/'resample'       #
+#                                                         DEF: 'error'    #
+#    .penalty       Objective function values failed eval DEF: np.inf     #
 #    .save          Save AMALGAM output during the run?   DEF: 'no'       #
 #    .restart       Restart run? (only with "save")       DEF: 'no'       #
 #    .print         Output writing screen (tables/figs)   DEF: 'yes'      #
@@ -108,8 +134,18 @@
 #   output      [outpt] Structure summarizes algorithmic performance      #
 #    .p_alg         Selection probability crossover methods               #
 #    .IGD           Inverse generational distance [if F_par defined]      #
+#    .HV            Hypervolume of population [reference point .HV_ref]   #
+#    .idle          Wall time and idle time of workers [if parallel]      #
+#    .cache         # parameter vectors, # cache hits and # store hits    #
+#    .failed        # failed evaluations, # retries, # pool restarts and  #
+#                   # aborted children                                    #
+#    .Y             Simulations of all evaluations if modout [memmap of   #
+#                   AMALGAM_Y.dat if save, file is removed otherwise]     #
+#    .Y_row         Row of .Y with simulation of each row of Z            #
+#    .pareto        Rows of Z not dominated by other rows [rank 1]        #
 #    .RunTime   [outpt] CPU time in seconds                               #
 #   Z           [outpt] NxTxd matrix of past populations                  #
+#                   [epsilon-dominance archive if options.epsilon]        #
 #   YX          [outpt] Model simulations of Pareto solutions             #
 #                                                                         #
 # ####################################################################### #
@@ -240,83 +276,141 @@ def AMALGAM(AMALGAMPar, Func_name, Par_info, options = None, plugin = None, Ftru
 
     printed_warnings = set()                                                                                # Initialize a set to track warnings for Evaluate_target
     file_name = 'AMALGAM'                                                                                   # Name of memory dump
-    if options['restart'] == 'no':                                                                          # New trial: No restart
+    new_run = options['restart'] == 'no'                                                                    # Restart file overwrites options
+    if new_run:                                                                                             # New trial: No restart
 
         AMALGAMPar, Par_info, options = AMALGAM_check(Func_name, AMALGAMPar, Par_info, options, Ftrue)      # Check input variables
         AMALGAMPar, Par_info, options, T_start = AMALGAM_setup(AMALGAMPar, Par_info, options)               # Define all algorithmic variables
-        AMALGAMPar, func_handle, base_dir = AMALGAM_calc_setup(AMALGAMPar, Func_name, options, plugin)      # Initialize computational environment    
-        AMALGAMPar, Par_info, X, p_rm, PS, Z, output = AMALGAM_initialize(AMALGAMPar, Par_info, plugin)     # Initialize all variables
-        FX, YX = AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, plugin, printed_warnings)   # Compute objective functions initial population
-        RX, dX, FX_min = AMALGAM_rank(FX, options)                                                          # Rank initial population
-        Z[:AMALGAMPar['N'], :AMALGAMPar['d'] + AMALGAMPar['m']] = np.concatenate([X, FX], axis=1)           # Store initial population in archive
+        AMALGAMPar, func_handle, base_dir, CPU_info = AMALGAM_calc_setup(AMALGAMPar, Func_name, options, plugin, Par_info)  # Initialize computational environment [= pool]
+    elif options['restart'] == 'yes':                                                                       # Restart run [= continue where stopped]
+        AMALGAMPar, Par_info, func_handle, options, PS, X, Z, FX, iY, p_rm, output, FX_min, RX, \
+            dX, ct, base_dir, T_start, CPU_info = AMALGAM_restart(file_name, Func_name, Ftrue, plugin, options.get('backend'))
+
+    try:                                                                                                    # Resources of AMALGAM_calc_setup are released if run fails
+        if new_run:
+            AMALGAMPar, Par_info, X, p_rm, PS, Z, output = AMALGAM_initialize(AMALGAMPar, Par_info, plugin, options)   # Initialize all variables
+            FX, YX = AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, plugin, printed_warnings, CPU_info) # Compute objective functions initial population
+            if options['failure'] == 'resample':                                                            # Failed rows of initial population are drawn again
+                X, FX, YX, _ = AMALGAM_resample(AMALGAMPar, Par_info, options, None, None, None, None, None, None, X, FX, YX,
+                    np.zeros(AMALGAMPar['N'], dtype=int), func_handle, base_dir, plugin, printed_warnings, CPU_info)
+            RX, dX, FX_min = AMALGAM_rank(FX, options)                                                      # Rank initial population
+            output['idle'][0, :] = np.concatenate([[0], CPU_info['idle']])                                  # Wall time and idle time of workers
+            output['cache'][0, :] = np.concatenate([[0], CPU_info['hits']])                                 # Number of cache hits
+            output['failed'][0, :] = np.concatenate([[0], CPU_info['failed']])                              # Number of failed evaluations
+            CPU_info['failed'] = np.zeros(4)
+            Z[:AMALGAMPar['N'], :AMALGAMPar['d'] + AMALGAMPar['m']] = np.concatenate([X, FX], axis=1)       # Store initial population in archive
+            output['pareto'] = Update_archive(AMALGAMPar, Z, np.zeros(0, dtype=int), np.arange(AMALGAMPar['N'])) # Rows of Z that are rank 1 solutions
+            iY = sims_add(CPU_info['sims'], YX, AMALGAMPar['N'])                                            # Rows of simulations in memory-mapped store
+            if iY is not None:
+                output['Y_row'] = np.full(Z.shape[0], -1)                                                   # Row of store with simulation of each row of Z
+                output['Y_row'][:AMALGAMPar['N']] = iY
+            if not isinstance(options['epsilon'], str):                                                     # Epsilon archive of initial population
+                Z, _, id_new = Update_eps_archive(AMALGAMPar, options, Z[:0, :], Z)
+                output['pareto'] = np.arange(Z.shape[0])
+                if iY is not None:
+                    output['Y_row'] = iY[id_new]
         
-        if 'ps' in AMALGAMPar['rec_methods']:                                                               
-            PS = Update_PS(AMALGAMPar, Z[:AMALGAMPar['N'], :AMALGAMPar['d'] + AMALGAMPar['m']], PS, FX_min) # Update dictionary of Particle Swarm
+            if 'ps' in AMALGAMPar['rec_methods']:                                                               
+                PS = Update_PS(AMALGAMPar, np.concatenate([X, FX], axis=1), PS, FX_min)                     # Update dictionary of Particle Swarm
 
-        if len(Ftrue) > 0:  
-            output['IGD'][0, :] = np.concatenate([np.array([0]), np.array([IGD(Ftrue.T, FX.T)])])           # Compute hypervolume
+            if len(Ftrue) > 0:  
+                output['IGD'][0, :] = np.concatenate([np.array([0]), np.array([IGD(Ftrue.T, FX.T)])])       # Compute hypervolume
+            output['HV_ref'] = HV_reference(Ftrue if len(Ftrue) > 0 else FX)                                # Fixed reference point of hypervolume
+            output['HV'][0, :] = [0, HV_contributions(FX, output['HV_ref'])[0]]                             # Hypervolume of initial population
 
-        ct = 1                                                                                              # Counter for external archive of generations    
-    elif options['restart'] == 'yes':                                                                       # Restart run [= continue where stopped]
-        AMALGAMPar, Par_info, func_handle, options, PS, X, Z, FX, YX, p_rm, output, FX_min, RX, \
-            dX, ct, base_dir, T_start = AMALGAM_restart(file_name, Func_name, Ftrue)
+            ct = 1                                                                                          # Counter for external archive of generations    
 
-    t0 = time.time()
-    fg, ax0 = None, None  # for plotting purposes
+        t0 = time.time()
+        fg, ax0 = None, None  # for plotting purposes
  
-    # Dynamic Part
-    for t in range(T_start, AMALGAMPar['T'] + 1):                                                           # Iterating through generations
-        id, id_rm = AMALGAM_distribution(AMALGAMPar, p_rm)                                                  # Create distribution rec. methods
-        G, PS = AMALGAM_children(AMALGAMPar, Par_info, X, FX, RX, dX, PS, id_rm, plugin)                    # Create children with different recombination methods
-        FG, YG = AMALGAM_calc_FX(G, AMALGAMPar, options, func_handle, base_dir, plugin, printed_warnings)   # Compute objective functions of children
-        FXG_min = np.minimum(FX_min, np.min(FG, axis=0))                                                    # Minimum values of each objective function [= minimization]
-        X, FX, RX, dX, id_N, id = AMALGAM_population(AMALGAMPar, options, X, G, FX, FG, id)                 # New population 
-        p_rm = AMALGAM_load(AMALGAMPar, p_rm, id)                                                           # New selection probability rec. methods
-        
-        if options.get('modout', 'no') == 'yes':
-            simtot = np.vstack([YX, YG])
-            YX = simtot[id_N, :]
+        # Dynamic Part
+        for t in range(T_start, AMALGAMPar['T'] + 1):                                                       # Iterating through generations
+            if options['async'] == 'yes':                                                                   # Steady-state: N evaluations merged as workers return
+                X, FX, iY, RX, dX, FXG_min, p_rm, PS = AMALGAM_async(AMALGAMPar, Par_info, options, X, FX, iY, RX, dX,
+                    FX_min, p_rm, PS, t, plugin, printed_warnings, CPU_info)
+            else:
+                id, id_rm = AMALGAM_distribution(AMALGAMPar, p_rm)                                          # Create distribution rec. methods
+                G, PS = AMALGAM_children(AMALGAMPar, Par_info, X, FX, RX, dX, PS, id_rm, plugin)            # Create children with different recombination methods
+                if options['abort'] == 'yes':                                                               # Children dominated by rank 1 FX may stop early
+                    CPU_info['front'] = FX[RX == 1, :]
+                if options['surrogate'] != 'no':                                                            # Select most promising children with surrogate model
+                    G, id = AMALGAM_surrogate(AMALGAMPar, Par_info, options, X, FX, RX, dX, PS, p_rm,
+                        Z if not isinstance(options['epsilon'], str) else Z[:ct * AMALGAMPar['N'], :], G, id, plugin)
+                FG, YG = AMALGAM_calc_FX(G, AMALGAMPar, options, func_handle, base_dir, plugin, printed_warnings, CPU_info) # Compute objective functions of children
+                if options['failure'] == 'resample':                                                        # Replace children whose evaluation failed
+                    G, FG, YG, id = AMALGAM_resample(AMALGAMPar, Par_info, options, X, FX, RX, dX, PS, p_rm, G, FG, YG, id,
+                        func_handle, base_dir, plugin, printed_warnings, CPU_info)
+                FXG_min = np.minimum(FX_min, np.min(FG, axis=0))                                            # Minimum values of each objective function [= minimization]
+                X, FX, RX, dX, id_N, id = AMALGAM_population(AMALGAMPar, options, X, G, FX, FG, id,
+                    CPU_info['dominance'])                                                                  # New population 
+                p_rm = AMALGAM_load(AMALGAMPar, p_rm, id)                                                   # New selection probability rec. methods
+                if iY is not None:                                                                          # Selection tracks rows of simulations in store
+                    iY = np.concatenate([iY, sims_add(CPU_info['sims'], YG, AMALGAMPar['N'])])[id_N]
 
-        if t % AMALGAMPar['K'] == 0:                                                                        # Append to archive
-            Z[ct * AMALGAMPar['N']: (ct + 1) * AMALGAMPar['N'], :AMALGAMPar['d'] + AMALGAMPar['m']] \
-                = np.concatenate([X, FX], axis=1)
-            ct += 1
-            if 'ps' in AMALGAMPar['rec_methods']:                                                           # Update Particle Swarm dictionary
-                PS = Update_PS(AMALGAMPar, Z[:ct * AMALGAMPar['N'], :AMALGAMPar['d'] + AMALGAMPar['m']], PS, FXG_min)
-        output['p_rm'][t, 0:AMALGAMPar['q'] + 1] = np.concatenate([[t], p_rm]) 
+            if not isinstance(options['epsilon'], str):                                                     # Update epsilon archive each generation
+                Z, id_Z, id_new = Update_eps_archive(AMALGAMPar, options, Z, np.concatenate([X, FX], axis=1))
+                output['pareto'] = np.arange(Z.shape[0])                                                    # Rows of epsilon archive are nondominated
+                if iY is not None:
+                    output['Y_row'] = np.concatenate([output['Y_row'][id_Z], iY[id_new]])
+                if 'ps' in AMALGAMPar['rec_methods']:                                                       # Archive and population: at least N rows
+                    PS = Update_PS(AMALGAMPar, np.vstack([Z, np.concatenate([X, FX], axis=1)]), PS, FXG_min)
+            elif t % AMALGAMPar['K'] == 0:                                                                  # Append to archive
+                Z[ct * AMALGAMPar['N']: (ct + 1) * AMALGAMPar['N'], :AMALGAMPar['d'] + AMALGAMPar['m']] \
+                    = np.concatenate([X, FX], axis=1)
+                if iY is not None:
+                    output['Y_row'][ct * AMALGAMPar['N']: (ct + 1) * AMALGAMPar['N']] = iY
+                output['pareto'] = Update_archive(AMALGAMPar, Z, output['pareto'],
+                    np.arange(ct * AMALGAMPar['N'], (ct + 1) * AMALGAMPar['N']))                            # Update rank 1 rows of Z
+                ct += 1
+                if 'ps' in AMALGAMPar['rec_methods']:                                                       # Update Particle Swarm dictionary
+                    PS = Update_PS(AMALGAMPar, Z[:ct * AMALGAMPar['N'], :AMALGAMPar['d'] + AMALGAMPar['m']], PS, FXG_min)
+            output['p_rm'][t, 0:AMALGAMPar['q'] + 1] = np.concatenate([[t], p_rm]) 
+            output['idle'][t, :] = np.concatenate([[t], CPU_info['idle']])                                  # Wall time and idle time of workers
+            output['cache'][t, :] = np.concatenate([[t], CPU_info['hits']])                                 # Number of cache hits
+            output['failed'][t, :] = np.concatenate([[t], CPU_info['failed']])                              # Number of failed evaluations
+            CPU_info['failed'] = np.zeros(4)
         
-        if len(Ftrue) > 0:                                                                                  # Compute hypervolume
-            output['IGD'][t, :] = np.concatenate([np.array([t]), np.array([IGD(Ftrue.T, FX.T)])])  
+            if len(Ftrue) > 0:                                                                              # Compute hypervolume
+                output['IGD'][t, :] = np.concatenate([np.array([t]), np.array([IGD(Ftrue.T, FX.T)])])  
+            output['HV'][t, :] = [t, HV_contributions(FX, output['HV_ref'])[0]]                             # Hypervolume of population
         
-        if options['save'] == 'yes':                # Open a shelve file to store the data                  # Save output to file
-            np.save(file_name, {                    # with shelve.open(file_name, 'c') as file:
-                    'AMALGAMPar': AMALGAMPar,               # file['AMALGAMPar'] = AMALGAMPar
-                    'Par_info': Par_info,                   # file['Par_info'] = Par_info
-                    'options': options,                     # file['options'] = options
-                    'PS': PS,                               # file['PS'] = PS
-                    'output': output,                       # file['output'] = output
-                    'X': X,                                 # file['X'] = X
-                    'Z': Z,                                 # file['Z'] = Z
-                    'FX': FX,                               # file['FX'] = FX
-                    'YX': YX,                               # file['YX'] = YX
-                    'FX_min': FX_min,                       # file['FX_min'] = FX_min
-                    'RX': RX,                               # file['RX'] = RX
-                    'dX': dX,                               # file['dX'] = dX
-                    'p_rm': p_rm,                           # file['p_rm'] = p_rm
-                    't': t,                                 # file['t'] = t
-                    'ct': ct})                              # file['ct'] = ct
+            if options['save'] == 'yes':            # Open a shelve file to store the data                  # Save output to file
+                np.save(file_name, {                # with shelve.open(file_name, 'c') as file:
+                        'AMALGAMPar': AMALGAMPar,           # file['AMALGAMPar'] = AMALGAMPar
+                        'Par_info': Par_info,               # file['Par_info'] = Par_info
+                        'options': {**options, 'backend': options['backend'] if isinstance(options['backend'], str) else 'executor'},
+                        'PS': PS,                           # file['PS'] = PS
+                        'output': output,                   # file['output'] = output
+                        'X': X,                             # file['X'] = X
+                        'Z': Z,                             # file['Z'] = Z
+                        'FX': FX,                           # file['FX'] = FX
+                        'iY': iY,                           # file['iY'] = iY
+                        'sims': None if CPU_info['sims'] is None else {**CPU_info['sims'], 'Y': None},
+                        'FX_min': FX_min,                   # file['FX_min'] = FX_min
+                        'RX': RX,                           # file['RX'] = RX
+                        'dX': dX,                           # file['dX'] = dX
+                        'p_rm': p_rm,                       # file['p_rm'] = p_rm
+                        't': t,                             # file['t'] = t
+                        'ct': ct})                          # file['ct'] = ct
 
-        if options.get('screen', 'no') == 'yes':                                                            # Plot to screen [= animation]
-            fg, ax0 = plot_screen(fg, ax0, AMALGAMPar, FX, t, Ftrue, output)
+            if options.get('screen', 'no') == 'yes':                                                        # Plot to screen [= animation]
+                fg, ax0 = plot_screen(fg, ax0, AMALGAMPar, FX, t, Ftrue, output)
         
-        if t % (max(1,AMALGAMPar["T"] // 25) ) == 0:                                                        # Print progress
-            if t > 0:
-                print(f'AMALGAM calculating, {100*(t/AMALGAMPar["T"]):.2f}% done', end='\r')
+            if t % (max(1,AMALGAMPar["T"] // 25) ) == 0:                                                    # Print progress
+                if t > 0:
+                    print(f'AMALGAM calculating, {100*(t/AMALGAMPar["T"]):.2f}% done', end='\r')
 
-    print('\n')
-    output['RunTime'] = time.time() - t0                                                                    # Determine total run time
-    AMALGAM_end(AMALGAMPar, options, base_dir)                                                              # Close workers
-    Z = Z[:ct * AMALGAMPar['N'], :AMALGAMPar['d'] + AMALGAMPar['m']]                                        # Finalize external archive
+        print('\n')
+        output['RunTime'] = time.time() - t0                                                                # Determine total run time
+        YX = None
+        if iY is not None:                                                                                  # Simulations of population; store of all simulations
+            YX, output['Y'] = sims_load(CPU_info['sims'], iY, options['save'] == 'yes')
+            if isinstance(options['epsilon'], str):
+                output['Y_row'] = output['Y_row'][:ct * AMALGAMPar['N']]
+    finally:
+        AMALGAM_end(AMALGAMPar, options, base_dir, CPU_info)                                                # Close pool of workers
+    if isinstance(options['epsilon'], str):
+        Z = Z[:ct * AMALGAMPar['N'], :AMALGAMPar['d'] + AMALGAMPar['m']]                                    # Finalize external archive
 
     if options['print'] == 'yes':                                                                           # Print progress of postprocessing
         for t in range(2, 4):
@@ -0,0 +1,31 @@
+# Run time of AMALGAM_rank with options['ranking'] = 'matlab' [fast nondominated sorting
+# of Deb et al.] and 'fast' [ENS_rank] for 2N rows [= parents and children] close to a
+# linear front with m objectives: best of three runs
+#
+#   python benchmarks/bench_rank.py
+
+import os, sys, time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'miscellaneous'))
+from AMALGAM_functions import AMALGAM_rank, ENS_rank
+
+
+def best_time(func, *args, repeat = 3):
+    T = np.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(*args)
+        T = min(T, time.perf_counter() - t0)
+
+    return T
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    for N, m in [(100, 2), (1000, 2), (100, 3), (1000, 3), (1000, 5)]:
+        F = rng.random((2 * N, m))
+        F[:, -1] = 1 + 0.3 * rng.random(2 * N) - np.mean(F[:, :-1], axis=1)
+        T = {ranking: best_time(AMALGAM_rank, F, {'density': 'crowding', 'ranking': ranking}) for ranking in ['matlab', 'fast']}
+        T_ENS = best_time(ENS_rank, F, repeat=1)
+        print(f"N = {N:5d} m = {m}: AMALGAM_rank matlab {1e3 * T['matlab']:7.1f} ms, fast {1e3 * T['fast']:6.1f} ms [ENS_rank {1e3 * T_ENS:5.1f} ms]")
@@ -1,7 +1,7 @@
 import numpy as np
 
 ############### HMODEL ####################
-def AMALGAM_hmodel(par, plugin):
+def AMALGAM_hmodel(par, plugin, abort=None):
     """
     hmodel simulation of discharge according to Schoups et al. 2010
     Returns Root Mean Square Error (RMSE) of driven and non-driven part hydrograph.
@@ -9,6 +9,8 @@ def AMALGAM_hmodel(par, plugin):
     Parameters:
         par (array): Parameter values for the model.
         plugin (dict): Dictionary containing plugin information, including time vector, model options, observed data, etc.
+        abort (function, optional): Returns True if RMSE (so far) is dominated [options['abort'] = 'yes'];
+            the simulation then stops and F is inf.
     
     Returns:
         F (array): RMSE of driven and non-driven part hydrograph.
@@ -27,8 +29,22 @@ def AMALGAM_hmodel(par, plugin):
     id_nd = np.array(plugin['id_nd']).astype(int)       # vector of integers
     N_nd = int(plugin['N_nd'])                          # scalar
     
+    # Partial sum of squared errors of driven and non-driven part [= lower bound of RMSE]
+    check = None
+    if abort is not None:
+        driven = np.zeros(n - 730, dtype=bool)
+        driven[id_d] = True
+        SSE = np.zeros(2)
+        def check(s, y):
+            # Discharge of time step s - 1 after burn-in; every 100 days compare RMSE so far with rank 1 solutions
+            if s - 1 >= 730:
+                SSE[0 if driven[s - 731] else 1] += (y[4, s] - y[4, s - 1] - Y_obs[s - 731])**2
+            return s % 100 == 0 and abort(np.sqrt(SSE / np.array([N_d, N_nd])))
+
     # Simulate discharge using the hmodel function
-    y = hmodel(par, tout, data, hmodel_opt, y0)  # Assuming hmodel is defined elsewhere
+    y = hmodel(par, tout, data, hmodel_opt, y0, check)  # Assuming hmodel is defined elsewhere
+    if y is None:
+        return np.full(2, np.inf), np.full(n - 730, np.nan)
     
     # Compute discharge from state
     #Y = y[4, 1:n] - y[4, 0:n-1]
@@ -49,7 +65,7 @@ def AMALGAM_hmodel(par, plugin):
     return F, Y_sim
 
 
-def hmodel(x, tout, data, options, y0):
+def hmodel(x, tout, data, options, y0, check=None):
     """
     Runs the hmodel and returns the driven and non-driven part.
     
@@ -60,6 +76,7 @@ def hmodel(x, tout, data, options, y0):
     data   : model data, dictionary with required fields
     options: options for the model (e.g., tolerance, step size, etc.)
     y0     : initial conditions for the model
+    check  : optional function of time step and states: True stops integration [returns None]
     """
     
     # Update data dictionary with parameters from vector x
@@ -73,21 +90,21 @@ def hmodel(x, tout, data, options, y0):
     data['Ks'] = x[6]       # slow-flow response time (d)
     
     # Run model function (assumed to be implemented in Python or using C extension)
-    y = crr_model(tout, y0, data, options)
+    y = crr_model(tout, y0, data, options, check)
     
     return y
 
 
 # Example of how this might be used
-def crr_model(tout, y0, data, options):
+def crr_model(tout, y0, data, options, check=None):
     nvar = len(y0)  # Number of state variables
     nt = len(tout)  # Number of time steps
     
     # Call the Runge-Kutta solver
-    return runge_kutta(nvar, nt, tout, y0, data, options)
+    return runge_kutta(nvar, nt, tout, y0, data, options, check)
 
 
-def runge_kutta(nvar, nt, tout, y0, data, options):
+def runge_kutta(nvar, nt, tout, y0, data, options, check=None):
     hin = options['InitialStep']
     hmax_ = options['MaxStep']
     hmin_ = options['MinStep']
@@ -139,6 +156,10 @@ def runge_kutta(nvar, nt, tout, y0, data, options):
             h = h * max(0.2, min(5.0, 0.9 * wrms**(-1.0/order)))
             h = max(hmin_, min(h, hmax_))
             h = min(h, t2 - t)
+
+        # Early abort: stop integration
+        if check is not None and check(s, y):
+            return None
     
     return y
 
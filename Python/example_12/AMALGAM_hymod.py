@@ -1,7 +1,8 @@
 import numpy as np
 
 ############## HYMOD: Explicit Euler [= not recommended]
-def AMALGAM_hymod(par, plugin):
+def AMALGAM_hymod(par, plugin, abort=None):
+    # abort [options['abort'] = 'yes']: returns True if RMSE is dominated -> stop simulation
     # Unpack parameters
     cmax, bexp, alfa, Rs, Rq = par
     T_max, Y_obs, PET, R, idx_d, N_d, idx_nd, N_nd = plugin['T_max'], plugin['Y_obs'], plugin['PET'], plugin['R'], plugin['idx_d'], plugin['N_d'], plugin['idx_nd'], plugin['N_nd']
@@ -11,6 +12,11 @@ def AMALGAM_hymod(par, plugin):
     x_s = 0     # Initial state slow tank
     x_q = np.zeros(3)  # Initial states fast tanks
     output = np.full(T_max, np.nan)  # Simulated discharge
+    # Partial sum of squared errors of driven and non-driven part [= lower bound of RMSE]
+    if abort is not None:
+        driven = np.zeros(T_max - 64, dtype=bool)
+        driven[idx_d] = True
+        SSE = np.zeros(2)
     
     # Main loop for simulation
     for t in range(T_max):
@@ -30,6 +36,11 @@ def AMALGAM_hymod(par, plugin):
             q_in = q_out
         # Compute total flow for timestep (in mm/day)
         output[t] = QS + q_out
+        if abort is not None and t >= 64:
+            SSE[0 if driven[t - 64] else 1] += (output[t] - Y_obs[t - 64])**2
+            # Every 50 days: stop if RMSE so far is dominated by rank 1 solutions
+            if t % 50 == 0 and abort(np.sqrt(SSE / np.array([N_d, N_nd]))):
+                return np.full(2, np.inf), output[64:T_max]
     
     # Apply burn-in of 65 days
     Y_sim = output[64:T_max]
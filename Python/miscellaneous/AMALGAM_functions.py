@@ -114,7 +114,7 @@
 import numpy as np
 import pandas as pd
 import seaborn as sns
-import array, os, warnings, random, shutil, platform
+import array, os, warnings, random, shutil, platform, tempfile, time
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from datetime import datetime
@@ -124,7 +124,18 @@ from screeninfo import get_monitors
 from matplotlib.ticker import MaxNLocator
 from matplotlib.lines import Line2D
 import multiprocess as mp
+import multiprocess.connection
 import importlib
+import queue, threading, contextlib
+import concurrent.futures
+import asyncio, inspect, functools, bisect
+import sqlite3, hashlib, pickle, secrets
+import subprocess, signal, string
+from collections import OrderedDict
+try:
+    import numba                                        # Optional: compiled NSGA-II operators
+except ImportError:
+    numba = None
 
 def AMALGAM_check(Func_name, AMALGAMPar, Par_info, options, Ftrue):
     """
@@ -544,16 +555,19 @@ def AMALGAM_check(Func_name, AMALGAMPar, Par_info, options, Ftrue):
         # Validate 'density' field in options
         if 'density' in options:
             if options['density'] == '':
-                raise ValueError("AMALGAM ERROR: Field 'density' of structure options is empty -> Set options.density = 'crowding' or 'strength'")
+                raise ValueError("AMALGAM ERROR: Field 'density' of structure options is empty -> Set options.density = 'crowding', 'strength' or 'hypervolume'")
             elif not isinstance(options['density'], str):
-                raise ValueError("AMALGAM ERROR: Field 'density' of structure options should contain string enclosed between quotes -> Set options.density = 'crowding' or 'strength'")
-            elif options['density'] not in ['crowding', 'strength']:
-                raise ValueError("AMALGAM ERROR: Unknown density method -> Set options.density = 'crowding' or 'strength' (default 'crowding')")
+                raise ValueError("AMALGAM ERROR: Field 'density' of structure options should contain string enclosed between quotes -> Set options.density = 'crowding', 'strength' or 'hypervolume'")
+            elif options['density'] not in ['crowding', 'strength', 'hypervolume']:
+                raise ValueError("AMALGAM ERROR: Unknown density method -> Set options.density = 'crowding', 'strength' or 'hypervolume' (default 'crowding')")
         else:
             evalstr = ("AMALGAM WARNING: Field 'density' of structure options not defined -> resort to default setting, options.density = 'crowding'\n")
             # Print warning to screen and file
             print(evalstr)
             fid.write(evalstr)
+        # Validate 'ranking' field in options
+        if 'ranking' in options and options['ranking'] not in ['fast', 'matlab', 'incremental']:
+            raise ValueError("AMALGAM ERROR: Unknown ranking method -> Set options.ranking = 'fast', 'matlab' or 'incremental' (default 'fast')")
         # Validate 'print' field in options
         if 'print' not in options:
             evalstr = "AMALGAM WARNING: Field 'print' of structure options not defined as 'yes' or 'no' -> resort to default setting of options.print = 'yes'\n"
@@ -570,10 +584,73 @@ def AMALGAM_check(Func_name, AMALGAMPar, Par_info, options, Ftrue):
         # Validate 'screen' field in options
         if 'screen' not in options or options['screen'] == '' or not isinstance(options['screen'], str) or options['screen'] not in ['yes', 'no']:
             options['screen'] = 'no'
+        # Built-in runner of external executables: each worker needs its own directory
+        if Func_name == 'AMALGAM_exe' and options.get('parallel', 'no') in ['yes', 'broker'] and options.get('IO', 'no') != 'yes':
+            raise ValueError("AMALGAM ERROR: Func_name = 'AMALGAM_exe' with options['parallel'] = 'yes' requires options['IO'] = 'yes' (one directory for each worker)")
+        # Validate 'backend' field in options: executor of parallel evaluations
+        if 'backend' in options:
+            if not (options['backend'] in ['process', 'thread', 'serial'] or isinstance(options['backend'], concurrent.futures.Executor)):
+                raise ValueError("AMALGAM ERROR: Field 'backend' of structure options should be 'process', 'thread', 'serial' or a concurrent.futures.Executor")
+            if options['backend'] != 'process' and options.get('IO', 'no') == 'yes' and options.get('parallel', 'no') == 'yes':
+                raise ValueError("AMALGAM ERROR: options['IO'] = 'yes' requires options['backend'] = 'process' (one directory for each worker process)")
+        # Validate 'concurrency' field in options: evaluations of coroutine function at the same time
+        if 'concurrency' in options:
+            if not (isinstance(options['concurrency'], (int, np.integer)) and options['concurrency'] > 0):
+                raise ValueError("AMALGAM ERROR: Field 'concurrency' of structure options should be a positive integer (maximum number of concurrent evaluations of async function)")
+        # Validate 'surrogate' and 'oversample' fields in options: pre-screening of children
+        if 'surrogate' in options and options['surrogate'] not in ['no', 'knn', 'rbf']:
+            raise ValueError("AMALGAM ERROR: Unknown surrogate model -> Set options.surrogate = 'no', 'knn' or 'rbf' (default 'no')")
+        if 'oversample' in options:
+            if not (isinstance(options['oversample'], (int, np.integer)) and options['oversample'] > 1):
+                raise ValueError("AMALGAM ERROR: Field 'oversample' of structure options should be an integer larger than 1 (number of candidates per child of surrogate)")
+        # Validate 'epsilon' field in options: box size of each objective of epsilon-dominance archive
+        if 'epsilon' in options and not (isinstance(options['epsilon'], str) and options['epsilon'] == 'no'):
+            try:
+                eps = np.asarray(options['epsilon'], dtype=float)
+            except (TypeError, ValueError):
+                eps = np.zeros(0)
+            if eps.ndim > 1 or eps.size not in [1, AMALGAMPar['m']] or not np.all(np.isfinite(eps) & (eps > 0)):
+                raise ValueError("AMALGAM ERROR: Field 'epsilon' of structure options should be 'no' or positive number(s): box size of each of the AMALGAMPar.m objectives of the epsilon archive")
+        # Early abort: aborted children have objective function values of inf
+        if options.get('abort', 'no') == 'yes' and options.get('failure', 'error') == 'resample' and np.isinf(options.get('penalty', np.inf)):
+            raise ValueError("AMALGAM ERROR: options['abort'] = 'yes' with options['failure'] = 'resample' requires a finite options['penalty'] (otherwise aborted children are resampled)")
+        # Validate 'parallel' and 'address' fields in options
+        if 'parallel' in options and options['parallel'] not in ['yes', 'no', 'broker']:
+            raise ValueError("AMALGAM ERROR: Field 'parallel' of structure options should be set equal to 'yes', 'no' or 'broker'")
+        if 'address' in options:
+            if not (isinstance(options['address'], str) and options['address'].rpartition(':')[2].isdigit()):
+                raise ValueError("AMALGAM ERROR: Field 'address' of structure options should be a string 'host:port' (address of broker of remote workers)")
+            if options.get('parallel') == 'broker' and options['address'].rpartition(':')[0] not in broker_local and not os.environ.get('AMALGAM_AUTHKEY'):
+                raise ValueError("AMALGAM ERROR: Broker at non-local options['address'] requires a secret key in environment variable AMALGAM_AUTHKEY (shared with the remote workers)")
+        # Validate 'cache_size' field in options
+        if 'cache_size' in options:
+            if not (isinstance(options['cache_size'], (int, np.integer)) and options['cache_size'] > 0):
+                raise ValueError("AMALGAM ERROR: Field 'cache_size' of structure options should be a positive integer (maximum number of parameter vectors in cache)")
+        # Validate 'chunksize' field in options
+        if 'chunksize' in options:
+            if not (options['chunksize'] == 'auto' or (isinstance(options['chunksize'], (int, np.integer)) and options['chunksize'] > 0)):
+                raise ValueError("AMALGAM ERROR: Field 'chunksize' of structure options should be 'auto' or a positive integer (number of parameter vectors per task)")
+        # Validate 'timeout', 'retry', 'failure' and 'penalty' fields in options [= failure policy]
+        if 'timeout' in options:
+            if not (isinstance(options['timeout'], (int, float, np.integer, np.floating)) and options['timeout'] > 0):
+                raise ValueError("AMALGAM ERROR: Field 'timeout' of structure options should be a positive number (maximum run time of one evaluation in seconds) or np.inf")
+            # Threads [and evaluations running in an executor] cannot be stopped: hung evaluations would fill the executor
+            if np.isfinite(options['timeout']) and options.get('parallel', 'no') == 'yes' and (options.get('backend', 'process') == 'thread'
+                    or isinstance(options.get('backend'), concurrent.futures.Executor)):
+                raise ValueError("AMALGAM ERROR: A finite options['timeout'] requires options['backend'] = 'process' or 'serial' (evaluations of a thread or user-supplied executor cannot be stopped)")
+        if 'retry' in options:
+            if not (isinstance(options['retry'], (int, np.integer)) and options['retry'] >= 0):
+                raise ValueError("AMALGAM ERROR: Field 'retry' of structure options should be a nonnegative integer (number of retries of failed evaluation)")
+        if 'failure' in options:
+            if options['failure'] not in ['error', 'penalty', 'resample']:
+                raise ValueError("AMALGAM ERROR: Unknown failure policy -> Set options.failure = 'error', 'penalty' or 'resample' (default 'error')")
+        if 'penalty' in options:
+            if not isinstance(options['penalty'], (int, float, np.integer, np.floating)):
+                raise ValueError("AMALGAM ERROR: Field 'penalty' of structure options should be a number (objective function value of failed evaluation)")
         # Validate each field of structure options
         for field in options:
             F = options[field]
-            if field not in ['ranking', 'density']:
+            if field not in ['ranking', 'density', 'chunksize', 'cache_size', 'timeout', 'retry', 'failure', 'penalty', 'parallel', 'address', 'backend', 'concurrency', 'surrogate', 'oversample', 'epsilon']:
                 if F not in ['yes', 'no']:
                     raise ValueError(f"AMALGAM ERROR: Field '{field}' of structure options should be set equal to 'yes' or 'no'")
 
@@ -642,13 +719,18 @@ def AMALGAM_setup(AMALGAMPar, Par_info, options):
         AMALGAMPar['rec_methods'] = ['ga', 'ps', 'am', 'de']
 
     # Field names of options and their default values
-    f_names = ['parallel', 'IO', 'save', 'restart', 'modout', 'density', 'print']
-    value = ['no', 'no', 'no', 'no', 'no', 'crowding', 'yes']
+    f_names = ['parallel', 'IO', 'save', 'restart', 'modout', 'density', 'ranking', 'print', 'vectorized', 'async', 'chunksize', 'cache', 'cache_size', 'store',
+               'timeout', 'retry', 'failure', 'penalty', 'address', 'backend', 'concurrency', 'surrogate', 'oversample', 'abort', 'epsilon']
+    value = ['no', 'no', 'no', 'no', 'no', 'crowding', 'fast', 'yes', 'no', 'no', 'auto', 'no', 10000, 'no',
+             np.inf, 0, 'error', np.inf, 'localhost:0', 'process', 100, 'no', 4, 'no', 'no']
     
     # Set undefined fields to default values
     for i, fname in enumerate(f_names):
         if fname not in options:
             options[fname] = value[i]
+    # Epsilon archive: box size of each objective
+    if not isinstance(options['epsilon'], str):
+        options['epsilon'] = np.full(AMALGAMPar['m'], 1.0) * np.asarray(options['epsilon'], dtype=float)
 
     # Replicate Par_info.min and Par_info.max (assuming they are numpy arrays)
     # Par_info['min'] = np.tile(Par_info['min'], (AMALGAMPar['N'], 1)) 
@@ -725,7 +807,7 @@ def AMALGAM_setup(AMALGAMPar, Par_info, options):
 
         print("----------- Summary of the main settings used: options -------------------")
         for key, value in options.items():
-            if callable(value):
+            if callable(value) or isinstance(value, concurrent.futures.Executor):
                 print(f"{key:<11}: {value}")        
             elif isinstance(value, np.ndarray):  
                 flattened_values = value.flatten() 
@@ -760,32 +842,91 @@ def AMALGAM_setup(AMALGAMPar, Par_info, options):
     return AMALGAMPar, Par_info, options, T_start
 
 
-def AMALGAM_calc_setup(AMALGAMPar, fname, options, plugin):
+def AMALGAM_calc_setup(AMALGAMPar, fname, options, plugin, Par_info = None):
     # ####################################################################### #
     # Sets up sequential / parallel  computational environment                #
     #  SYNOPSIS                                                               #
-    #   [AMALGAMPar,f_handle] = AMALGAM_calc_setup(AMALGAMPar,fname, ...      #
-    #       options,plugin)                                                   #
+    #   [AMALGAMPar,f_handle,base_dir,CPU_info] = AMALGAM_calc_setup( ...     #
+    #       AMALGAMPar,fname,options,plugin,Par_info)                         #
+    #  where                                                                  #
+    #   CPU_info    [outpt] Dictionary with computational environment         #
+    #    .pool          Pool of workers used by all generations [or None]     #
+    #    .async         Children in progress if options.async = 'yes'         #
+    #    .plugin_dir    Directory with .npy files of plugin arrays [or None]  #
+    #    .idle          Wall time and idle time workers last generation [sec] #
+    #    .cache         LRU cache of FX and Y if options.cache = 'yes'        #
+    #    .store         Evaluation store [AMALGAM_store.db] if options.store  #
+    #    .hits          # vectors, # cache hits, # store hits last generation #
+    #    .failed        # failed evaluations, # retries, # pool restarts and  #
+    #                   # aborted evaluations [options.abort = 'yes']         #
+    #    .front         Rank 1 FX of population: threshold of early abort     #
+    #    .initargs      Arguments of worker_init to (re)open pool of workers  #
+    #    .buffers       Memory-mapped FX and Y rows written by workers        #
+    #    .broker        Listener and workers if options.parallel = 'broker'   #
+    #    .executor      concurrent.futures.Executor of options.backend        #
+    #    .sims          Store of Y [AMALGAM_Y.dat] if options.modout = 'yes'  #
+    #    .dominance     Dominance matrix of population [incremental ranking]  #
     # ####################################################################### #
     
     base_dir = None
+    CPU_info = {'pool': None, 'plugin_dir': None, 'idle': [np.nan, np.nan], 'cache': None, 'store': None, 'hits': [np.nan, np.nan, np.nan],
+                'failed': np.zeros(4), 'front': None, 'initargs': None, 'buffers': None, 'broker': None,
+                'executor': None, 'sims': None, 'dominance': None}
+
+    # Dominance matrix of population reused by the ranking of the next generation
+    if options['ranking'] == 'incremental':
+        CPU_info['dominance'] = {'F': None, 'D': None}
+
+    # Memory-mapped store of model simulations: file grows by N rows each generation
+    if options['modout'] == 'yes':
+        # File next to AMALGAM.npy: a restart appends to the store of the run it continues
+        CPU_info['sims'] = {'file': os.path.abspath('AMALGAM_Y.dat'), 'Y': None, 'rows': 0, 'n_Y': 0}
+
+    # Cache of evaluated parameter vectors: key is lattice index if Par_info['steps'] is used
+    if options['cache'] == 'yes':
+        CPU_info['cache'] = {'data': OrderedDict(), 'size': options['cache_size'], 'min': None, 'step_size': None}
+        if Par_info is not None and 'steps' in Par_info:
+            CPU_info['cache']['min'], CPU_info['cache']['step_size'] = Par_info['min'], Par_info['step_size']
+
+    # Store of evaluations shared by all runs: key is model, hash of plugin and parameter vector
+    if options['store'] == 'yes':
+        con = sqlite3.connect(os.path.abspath('AMALGAM_store.db'), timeout=60)     # Waits if other run is writing
+        con.execute('PRAGMA journal_mode=WAL')                                      # Readers do not block writers
+        con.execute('CREATE TABLE IF NOT EXISTS evaluations (model TEXT, plugin TEXT, x BLOB, fx BLOB, y BLOB, '
+                    'PRIMARY KEY (model, plugin, x))')
+        con.commit()
+        CPU_info['store'] = {'con': con, 'model': fname, 'plugin': plugin_hash(plugin), 'm': AMALGAMPar['m'], 'modout': options['modout']}
+
+    ## Function handle = dynamic function [not pickable, but ok with multiprocessing]
+    func_handle = get_function_handle(fname)
+    if inspect.iscoroutinefunction(func_handle) and options['parallel'] != 'no':
+        # Coroutine function: evaluations overlap on event loop of main process, no workers needed
+        with open('warning_file.txt', 'a+') as fid:
+            msg = (f"AMALGAM WARNING: Func_name is an async function -> options['parallel'] = 'no': up to options['concurrency'] evaluations run concurrently on event loop\n")
+            print(msg)
+            fid.write(msg)
+        options['parallel'] = 'no'
 
     # Set up parallel execution based on options
     if options['parallel'] == 'no':
         AMALGAMPar['CPU'] = 1  # Use 1 CPU (processor)
-    elif options['parallel'] == 'yes':
+    elif options['parallel'] in ['yes', 'broker']:
         # How many available workers? 
         workers = mp.cpu_count() 
         if workers > AMALGAMPar['N']:
             workers = AMALGAMPar['N']
+        if options['parallel'] == 'yes' and options['backend'] == 'serial':
+            workers = 1
         
         AMALGAMPar['CPU'] = workers
         
-        # Write parallelization status to file
-        with open('warning_file.txt', 'a+') as fid:
-            msg = (f'AMALGAM PARALLEL: Pool opened with {AMALGAMPar["CPU"]} workers for a population of {AMALGAMPar["N"]} individuals\n')
-            print(msg)
-            fid.write(msg)
+        # Write parallelization status to file [broker: once its port is known]
+        if options['parallel'] == 'yes':
+            with open('warning_file.txt', 'a+') as fid:
+                backend = options['backend'] if isinstance(options['backend'], str) else type(options['backend']).__name__
+                msg = (f'AMALGAM PARALLEL: Pool opened with {AMALGAMPar["CPU"]} workers for a population of {AMALGAMPar["N"]} individuals [backend: {backend}]\n')
+                print(msg)
+                fid.write(msg)
         
         # Handle I/O directories for parallel execution
         if options['IO'] == 'yes':
@@ -822,18 +963,62 @@ def AMALGAM_calc_setup(AMALGAMPar, fname, options, plugin):
                 if not os.path.exists(worker_dir):
                     copy_model_files(model_files_dir, worker_dir)
 
-    ## Function handle = dynamic function [not pickable, but ok with multiprocessing]
-    func_handle = get_function_handle(fname)
+    # Open pool of workers once: func_handle, plugin and base_dir are sent to each worker only at start
+    if AMALGAMPar['CPU'] > 1 and options['parallel'] == 'yes' and options['backend'] == 'process':
+        if isinstance(plugin, dict):                            # Convert to regular numpy array so that it can be shared with workers [= pickable]
+            plugin = convert_memoryview_to_array(plugin)
+        # Arrays of plugin are written once to disk, workers open read-only memory maps [= no copies]
+        CPU_info['plugin_dir'] = tempfile.mkdtemp(prefix='AMALGAM_plugin_')
+        CPU_info['initargs'] = (func_handle, share_plugin(plugin, CPU_info['plugin_dir']), base_dir)
+        CPU_info['pool'] = open_pool(AMALGAMPar['CPU'], CPU_info['initargs'])
+
+    # Threads share func_handle and plugin; a user-supplied executor receives them with each task
+    elif AMALGAMPar['CPU'] > 1 and options['parallel'] == 'yes':
+        if isinstance(plugin, dict):
+            plugin = convert_memoryview_to_array(plugin)
+        if options['backend'] == 'thread':
+            CPU_info['executor'] = concurrent.futures.ThreadPoolExecutor(max_workers=AMALGAMPar['CPU'])
+        else:
+            CPU_info['executor'] = options['backend']
+
+    # Broker: local and remote workers connect over TCP, func_handle and plugin are sent once to each worker
+    elif options['parallel'] == 'broker':
+        if isinstance(plugin, dict):
+            plugin = convert_memoryview_to_array(plugin)
+        CPU_info['broker'] = broker_open(options['address'], (func_handle, plugin), base_dir)
+        for worker_id in range(AMALGAMPar['CPU']):          # Local stand-ins of remote workers
+            broker_spawn(CPU_info['broker'], worker_id)
+        with open('warning_file.txt', 'a+') as fid:
+            msg = (f'AMALGAM PARALLEL: Broker at {CPU_info["broker"]["address"]} with {AMALGAMPar["CPU"]} local workers; remote workers connect with AMALGAM_worker\n')
+            print(msg)
+            fid.write(msg)
+
+    # Asynchronous steady-state mode: children (not yet) evaluated by the workers
+    if options['async'] == 'yes':
+        if CPU_info['pool'] is not None:
+            CPU_info['async'] = {'queue': queue.Queue(),                            # Results returned by the workers
+                                 'free': list(range(AMALGAMPar['CPU'])),            # Workers [directories] without a task
+                                 'G': np.empty((0, AMALGAMPar['d'])),               # Children not yet sent to a worker
+                                 'id': np.empty(0),                                 # Their recombination methods
+                                 'hits': 0,                                         # Children found in cache, not yet merged
+                                 'resample': [],                                    # Round of each failed child to be replaced
+                                 'busy': {}}                                        # Children of each busy worker
+        else:
+            with open('warning_file.txt', 'a+') as fid:
+                msg = (f"AMALGAM WARNING: options['async'] = 'yes' requires a pool of more than one worker -> synchronous generations are used\n")
+                print(msg)
+                fid.write(msg)
+            options['async'] = 'no'
 
-    return AMALGAMPar, func_handle, base_dir
+    return AMALGAMPar, func_handle, base_dir, CPU_info
 
 
-def AMALGAM_initialize(AMALGAMPar, Par_info, plugin):
+def AMALGAM_initialize(AMALGAMPar, Par_info, plugin, options = None):
     # ####################################################################### #
     #                                                                         #
     #  SYNOPSIS                                                               #
     #   [AMALGAMPar,Par_info,X,p_rm,PS,Z,output] = AMALGAM_initialize( ...    #
-    #       AMALGAMPar,Par_info )                                             #
+    #       AMALGAMPar,Par_info,plugin,options )                              #
     #  where                                                                  #
     #                                                                         #
     # ####################################################################### #
@@ -845,6 +1030,10 @@ def AMALGAM_initialize(AMALGAMPar, Par_info, plugin):
     output = PS = {}
     output['p_rm'] = np.full((AMALGAMPar['T']+1, AMALGAMPar['q'] + 1), np.nan)  # Initialize matrix for p_rm
     output['IGD'] = np.full((AMALGAMPar['T']+1, 2), np.nan)                     # Initialize matrix for inverse generational distance
+    output['HV'] = np.full((AMALGAMPar['T']+1, 2), np.nan)                      # Initialize matrix for hypervolume
+    output['idle'] = np.full((AMALGAMPar['T']+1, 3), np.nan)                    # Initialize matrix for wall time and idle time of workers
+    output['cache'] = np.full((AMALGAMPar['T']+1, 4), np.nan)                   # Initialize matrix for number of cache and store hits
+    output['failed'] = np.full((AMALGAMPar['T']+1, 5), np.nan)                  # Initialize matrix for number of failed evaluations
     output['p_rm'][0, :AMALGAMPar['q'] + 1] = np.concatenate(([0], p_rm))       # Store p_rm for recombination methods
     
     # Initialize Particle Swarm Optimization (PSO) if used
@@ -852,25 +1041,44 @@ def AMALGAM_initialize(AMALGAMPar, Par_info, plugin):
         PS['v'] = (1 / 5) * np.random.uniform(-1, 1, (AMALGAMPar['N'], AMALGAMPar['d'])) * (Par_info['max'] - Par_info['min'])
 
     # Initialize the population
-    X = np.full((AMALGAMPar['N'], AMALGAMPar['d']), np.nan)
-    
-    # Generate the initial population based on the specified method
-    if Par_info['initial'] == 'uniform':
-        X = Par_info['min'] + np.random.rand(AMALGAMPar['N'], AMALGAMPar['d']) * (Par_info['max'] - Par_info['min'])
-    elif Par_info['initial'] == 'latin':
-        X = LH_sampling(Par_info['min'], Par_info['max'], AMALGAMPar['N'])
-    elif Par_info['initial'] == 'normal':
-        X = np.tile(Par_info['mu'], (AMALGAMPar['N'], 1)) + np.random.randn(AMALGAMPar['N'], AMALGAMPar['d']) @ np.linalg.cholesky(Par_info['cov'])
-    elif Par_info['initial'] == 'prior':
+    X = AMALGAM_draw(AMALGAMPar, Par_info, plugin, AMALGAMPar['N'], Par_info['initial'])
+
+    # Initialize the result matrix Z [epsilon archive: initial population only]
+    if options is not None and not isinstance(options['epsilon'], str):
+        Z = np.full((AMALGAMPar['N'], AMALGAMPar['d'] + AMALGAMPar['m']), np.nan)
+    else:
+        Z = np.full(((1 + AMALGAMPar['T']) * AMALGAMPar['N'] // AMALGAMPar['K'], AMALGAMPar['d'] + AMALGAMPar['m']), np.nan)
+    
+    return AMALGAMPar, Par_info, X, p_rm, PS, Z, output
+
+
+def AMALGAM_draw(AMALGAMPar, Par_info, plugin, N, initial):
+    # ####################################################################### #
+    # Draws N parameter vectors with sampling method initial [= Par_info.     #
+    # initial] followed by boundary handling, unit simplex and discretization #
+    #  SYNOPSIS                                                               #
+    #   X = AMALGAM_draw(AMALGAMPar,Par_info,plugin,N,initial)                #
+    # ####################################################################### #
+
+    X = np.full((N, AMALGAMPar['d']), np.nan)
+
+    # Generate the parameter vectors based on the specified method
+    if initial == 'uniform':
+        X = Par_info['min'] + np.random.rand(N, AMALGAMPar['d']) * (Par_info['max'] - Par_info['min'])
+    elif initial == 'latin':
+        X = LH_sampling(Par_info['min'], Par_info['max'], N)
+    elif initial == 'normal':
+        X = np.tile(Par_info['mu'], (N, 1)) + np.random.randn(N, AMALGAMPar['d']) @ np.linalg.cholesky(Par_info['cov'])
+    elif initial == 'prior':
         if Par_info['u'] == 'yes':  # Univariate prior distribution
             for qq in range(AMALGAMPar['d']):
-                for zz in range(AMALGAMPar['N']):
+                for zz in range(N):
                     X
         else:  # Multivariate prior distribution
-            for zz in range(AMALGAMPar['N']):
+            for zz in range(N):
                 X
-    elif Par_info['initial'] == 'user':
-        for zz in range(AMALGAMPar['N']):
+    elif initial == 'user':
+        for zz in range(N):
             X[zz, :] = Par_info['x0'][zz, :]
     else:
         raise ValueError("AMALGAM_initialize:Unknown initial sampling method")
@@ -879,24 +1087,21 @@ def AMALGAM_initialize(AMALGAMPar, Par_info, plugin):
     if 'boundhandling' in Par_info:
         X, v = Boundary_handling(X, Par_info)
     else:
-        v = np.ones(AMALGAMPar['N'], dtype=bool)  # Initialize v for boundary checking (not used in the original)
+        v = np.ones(N, dtype=bool)  # Initialize v for boundary checking (not used in the original)
 
     # BMA model training if applicable
     if 'unit_simplex' in Par_info:
-        wght_sum = np.sum(X[:AMALGAMPar['N'], :int(plugin['BMA']['K'])], axis=1)
+        wght_sum = np.sum(X[:, :int(plugin['BMA']['K'])], axis=1)
         X[:, :int(plugin['BMA']['K'])] = X[:, :int(plugin['BMA']['K'])] / wght_sum[:, np.newaxis]  # Normalize weights in the unit simplex
 
     # Transform to discrete space if required
     if 'steps' in Par_info:
         X = Discrete_space(X, Par_info)
 
-    # Initialize the result matrix Z
-    Z = np.full(((1 + AMALGAMPar['T']) * AMALGAMPar['N'] // AMALGAMPar['K'], AMALGAMPar['d'] + AMALGAMPar['m']), np.nan)
-    
-    return AMALGAMPar, Par_info, X, p_rm, PS, Z, output
+    return X
 
 
-def AMALGAM_rank(FQ, options=None):
+def AMALGAM_rank(FQ, options=None, dominance=None):
     """
     Pareto ranking and crowding distance computation of solutions matrix FQ.
 
@@ -905,97 +1110,497 @@ def AMALGAM_rank(FQ, options=None):
                          where M is the number of solutions and m is the number of objectives.
     options (dict, optional): Algorithmic settings for density and ranking methods.
                               Default is None, in which case default settings will be used.
+                              options['ranking'] = 'fast' (default) sorts by ENS_rank,
+                              'matlab' uses the fast nondominated sorting of Deb et al.
+                              and 'incremental' the dominance matrix of dominance_rank.
+    dominance (dict, optional): Dominance matrix of parents ['incremental'], see dominance_rank.
 
     Returns:
     RQ (numpy.ndarray): 1D array with the rank of each solution in FQ.
     dQ (numpy.ndarray): 1D array with the crowding distance or strength Pareto values.
     """
     if options is None:
-#        options = {'density': 'crowding', 'ranking': 'matlab'}
-        options = {'density': 'crowding'}
+        options = {'density': 'crowding', 'ranking': 'fast'}
 
     M, m = FQ.shape  # Number of solutions and objective functions
     RQ = np.nan * np.ones(M)  # Initialize vector for ranks
     FQ_min = np.min(FQ, axis=0)  # Minimum objective function values
 
-    # Initialize Pareto fronts and dominance structures
-    Fr = [[]]  # Pareto-optimal fronts
-    Sp = [[] for _ in range(M)]  # Points a particular point dominates
-    nP = np.zeros(M, dtype=int)  # Number of points which dominate each point
-
-    # Loop over all elements to determine the dominance
-    for p in range(M):
-        # Boolean indexing: check which points p dominates (less than or equal in all objectives)
-        dominates = np.all(FQ[p, :] <= FQ, axis=1)  # Boolean array where p dominates other points
-        strictly_dominates = np.any(FQ[p, :] < FQ, axis=1)  # Strict domination condition
-        id = np.where(dominates & strictly_dominates)[0]  # Points dominated by p
-
-        if len(id) > 0:
-            Sp[p] = id
-        # Find which points dominate p (strict domination condition)
-        dominates_p = np.all(FQ <= FQ[p, :], axis=1)
-        strictly_dominates_p = np.any(FQ < FQ[p, :], axis=1)
-        id = np.where(dominates_p & strictly_dominates_p)[0]
-        nP[p] = len(id)   # original translation GPT
-        # nP[p] = nP[p] + len(id)
-        if nP[p] == 0:  # p is in the first front
-            Fr[0].append(p)
-
-    # Determine the Pareto rank
-    i = 0
-    while len(Fr[i]) > 0:
-        NextFr = []  # Next front
-        for p in Fr[i]:
-            q = Sp[p]
-            # Ensure that q is an array of indices and that nP[q] can be accessed properly
-            nP[q] -= 1  # Decrease the dominance count for each point in the front
-            # Fix the indexing to avoid the boolean mismatch
-            indices = np.where(nP[q] == 0)[0]  # Get the indices where nP[q] == 0
-            if len(indices) != 0:           # Added this line
-                NextFr.extend(q[indices])   # Add the new front members
-        i += 1
-        Fr.append(NextFr)
-
-    # Assign ranks based on the front structure
-    for j in range(i):
-        RQ[Fr[j]] = j + 1  # Assign ranks to solutions
+    if options.get('ranking', 'fast') == 'fast':
+        # Efficient non-dominated sorting: same ranks without M x M dominance sets
+        RQ = ENS_rank(FQ)
+    elif options['ranking'] == 'incremental':
+        # Dominance matrix: rows of parents are reused, only children are compared
+        RQ = dominance_rank(FQ, dominance)
+    else:
+        # Initialize Pareto fronts and dominance structures
+        Fr = [[]]  # Pareto-optimal fronts
+        Sp = [[] for _ in range(M)]  # Points a particular point dominates
+        nP = np.zeros(M, dtype=int)  # Number of points which dominate each point
+
+        # Loop over all elements to determine the dominance
+        for p in range(M):
+            # Boolean indexing: check which points p dominates (less than or equal in all objectives)
+            dominates = np.all(FQ[p, :] <= FQ, axis=1)  # Boolean array where p dominates other points
+            strictly_dominates = np.any(FQ[p, :] < FQ, axis=1)  # Strict domination condition
+            id = np.where(dominates & strictly_dominates)[0]  # Points dominated by p
+
+            if len(id) > 0:
+                Sp[p] = id
+            # Find which points dominate p (strict domination condition)
+            dominates_p = np.all(FQ <= FQ[p, :], axis=1)
+            strictly_dominates_p = np.any(FQ < FQ[p, :], axis=1)
+            id = np.where(dominates_p & strictly_dominates_p)[0]
+            nP[p] = len(id)   # original translation GPT
+            # nP[p] = nP[p] + len(id)
+            if nP[p] == 0:  # p is in the first front
+                Fr[0].append(p)
+
+        # Determine the Pareto rank
+        i = 0
+        while len(Fr[i]) > 0:
+            NextFr = []  # Next front
+            for p in Fr[i]:
+                q = Sp[p]
+                # Ensure that q is an array of indices and that nP[q] can be accessed properly
+                nP[q] -= 1  # Decrease the dominance count for each point in the front
+                # Fix the indexing to avoid the boolean mismatch
+                indices = np.where(nP[q] == 0)[0]  # Get the indices where nP[q] == 0
+                if len(indices) != 0:           # Added this line
+                    NextFr.extend(q[indices])   # Add the new front members
+            i += 1
+            Fr.append(NextFr)
+
+        # Assign ranks based on the front structure
+        for j in range(i):
+            RQ[Fr[j]] = j + 1  # Assign ranks to solutions
 
     # Calculate crowding distance or strength Pareto based on the density method
     if options['density'] == 'crowding':
-        dQ = np.nan * np.ones(M)
-        for j in range(int(np.max(RQ))):
-            id = np.where(RQ == j + 1)[0]
-            R_s = FQ[id, :]
-            N_s = len(id)
-            Cr_d = np.zeros(N_s)
-            for i in range(m):
-                sorted_indices = np.argsort(R_s[:, i])
-                Cr_d[sorted_indices[0]] = np.inf
-                Cr_d[sorted_indices[-1]] = np.inf
-                for z in range(1, N_s - 1):
-                    Cr_d[sorted_indices[z]] += (R_s[sorted_indices[z + 1], i] - R_s[sorted_indices[z - 1], i])
-            dQ[id] = Cr_d
+        dQ = crowding_distance(FQ, RQ)
     elif options['density'] == 'strength':
-        n_dom = np.zeros(M)
-        for j in range(M):
-            n_dom[j] = np.sum(np.all(FQ[j, :] < FQ, axis=1))
-        dQ = M / n_dom  # Strength Pareto
+        dQ = strength_density(FQ)  # Strength Pareto
+    elif options['density'] == 'hypervolume':
+        dQ = hv_density(FQ, RQ)  # Exclusive hypervolume contribution
     else:
         raise ValueError("Unknown density estimation method")
 
     return RQ, dQ, FQ_min
 
 
-def AMALGAM_restart(file_name, Func_name, Ftrue):
+def AMALGAM_select_rank(FQ, N, options=None, dominance=None):
+    """
+    Pareto rank and density of the rows of FQ needed to select N rows [AMALGAM_population].
+    Fronts are peeled until they hold N rows or more [peel_rank, or dominance_rank if
+    options['ranking'] = 'incremental'] and the density is computed for the rows of these
+    fronts only: the last front is truncated by density and the other fronts pass their
+    density to the tournaments of NSGA. Rows of later fronts have rank nan and density 0;
+    the peeled fronts have the same ranks and densities as in AMALGAM_rank.
+    """
+    if options is None:
+        options = {'density': 'crowding', 'ranking': 'fast'}
+
+    if options.get('ranking', 'fast') == 'incremental':
+        RQ = dominance_rank(FQ, dominance, N)
+    else:
+        RQ = peel_rank(FQ, N)
+    dQ = np.zeros(FQ.shape[0])
+    sel = ~np.isnan(RQ)                                 # Rows of peeled fronts
+    if options['density'] == 'crowding':
+        dQ[sel] = crowding_distance(FQ[sel, :], RQ[sel])
+    elif options['density'] == 'strength':
+        dQ = strength_density(FQ)                       # Raw fitness: strength of all rows
+    elif options['density'] == 'hypervolume':
+        dQ[sel] = hv_density(FQ[sel, :], RQ[sel])
+    else:
+        raise ValueError("Unknown density estimation method")
+
+    return RQ, dQ
+
+
+def peel_rank(FQ, n_max):
+    """
+    Pareto rank of the rows of FQ in the first fronts only: the nondominated rows of the
+    rows left are peeled off as the next front until the fronts hold n_max rows or more.
+    Rows of later fronts have rank nan. Unique rows are sorted lexicographically and can
+    only be dominated by nondominated rows before them: if m = 2 a row is nondominated if
+    its second objective is smaller than that of all rows before it [cumulative minimum],
+    otherwise blocks of rows are compared with the nondominated rows found so far and with
+    each other. Duplicate rows share their rank and rows with nan are rank 1 [ENS_rank].
+    """
+    M, m = FQ.shape
+    RQ = np.full(M, np.nan)
+    ok = ~np.any(np.isnan(FQ), axis=1)
+    RQ[~ok] = 1
+    if not np.any(ok):
+        return RQ
+    F_u, inv = np.unique(FQ[ok, :], axis=0, return_inverse=True)
+    inv = inv.reshape(-1)
+    n_u = np.bincount(inv, minlength=F_u.shape[0])     # Number of rows of FQ of each unique row
+    R_u = np.full(F_u.shape[0], np.nan)
+    left = np.arange(F_u.shape[0])
+    n_in, r = np.sum(~ok), 0
+    while left.size > 0 and (r == 0 or n_in < n_max):
+        r += 1
+        front = np.ones(left.size, dtype=bool)
+        if m == 2:
+            y = F_u[left, 1]
+            front[1:] = y[1:] < np.minimum.accumulate(y[:-1])
+        else:
+            F_l = F_u[left, :]
+            for start in range(0, left.size, 256):
+                F_b = F_l[start:start + 256, :]
+                dom = np.any(dominance_block(F_l[:start, :][front[:start], :], F_b)[0], axis=0)
+                front[start:start + 256] = ~(dom | np.any(dominance_block(F_b, F_b)[0], axis=0))
+        R_u[left[front]] = r
+        n_in += np.sum(n_u[left[front]])
+        left = left[~front]
+    RQ[ok] = R_u[inv]
+
+    return RQ
+
+
+def ENS_rank(FQ):
+    """
+    Pareto rank of each row of FQ by efficient non-dominated sorting with binary search
+    of the fronts [Zhang et al., 2015]. Rows are sorted lexicographically so that a row
+    can only be dominated by rows before it; if m = 2 the last member of a front has the
+    smallest second objective and decides alone whether the row is dominated [sweep].
+    Duplicate rows share their rank and rows with nan are rank 1: the same ranks as the
+    fast nondominated sorting of AMALGAM_rank with options['ranking'] = 'matlab'.
+    """
+    M, m = FQ.shape
+    RQ = np.ones(M)
+    ok = ~np.any(np.isnan(FQ), axis=1)                  # Rows with nan do not dominate and are not dominated
+    if not np.any(ok):
+        return RQ
+    F_u, inv = np.unique(FQ[ok, :], axis=0, return_inverse=True)
+    n = F_u.shape[0]
+    R_u = np.zeros(n)
+    if m == 2:
+        last = []                                       # Second objective of last member each front [nondecreasing]
+        for i in range(n):
+            k = bisect.bisect_right(last, F_u[i, 1])    # First front not dominating row i
+            if k == len(last):
+                last.append(F_u[i, 1])
+            else:
+                last[k] = F_u[i, 1]
+            R_u[i] = k + 1
+    else:
+        fronts, n_fr = [], []                           # Members of each front [rows doubled when full]
+        for i in range(n):
+            lo, hi = 0, len(fronts)
+            while lo < hi:                              # Row dominated by front k -> also by fronts < k
+                k = (lo + hi) // 2
+                if np.any(np.all(fronts[k][:n_fr[k], :] <= F_u[i, :], axis=1)):
+                    lo = k + 1
+                else:
+                    hi = k
+            if lo == len(fronts):
+                fronts.append(np.empty((16, m)))
+                n_fr.append(0)
+            elif n_fr[lo] == fronts[lo].shape[0]:
+                fronts[lo] = np.vstack([fronts[lo], np.empty_like(fronts[lo])])
+            fronts[lo][n_fr[lo], :] = F_u[i, :]
+            n_fr[lo] += 1
+            R_u[i] = lo + 1
+    RQ[ok] = R_u[inv.reshape(-1)]
+
+    return RQ
+
+
+def dominance_rank(FQ, dominance=None, n_max=None):
+    """
+    Pareto rank of each row of FQ from the dominance matrix DQ [DQ[p,q] is True if row p
+    dominates row q] by peeling of the fronts. If the first rows of FQ equal
+    dominance['F'] [= parents], their block of DQ is copied from dominance['D'] and only
+    the other rows [= children] are compared with all rows of FQ. DQ and FQ are stored
+    in dominance for AMALGAM_population, which keeps the block of the new population.
+    If n_max is given, peeling stops once the fronts hold n_max rows [others rank nan].
+    """
+    M, m = FQ.shape
+    n = 0
+    if dominance is not None and dominance.get('F') is not None:
+        F_p = dominance['F']
+        if F_p.shape[0] <= M and np.array_equal(F_p, FQ[:F_p.shape[0], :], equal_nan=True):
+            n = F_p.shape[0]
+    DQ = np.empty((M, M), dtype=bool)
+    DQ[:n, :n] = dominance['D'] if n > 0 else False
+    # Rows n to M are compared with all rows
+    DQ[n:, :], D_T = dominance_block(FQ[n:, :], FQ)
+    DQ[:, n:] = D_T.T
+    # Peel fronts: rows not dominated by remaining rows get next rank
+    RQ = np.full(M, np.nan)
+    n_dom = np.sum(DQ, axis=0)
+    left = np.ones(M, dtype=bool)
+    r = 0
+    while np.any(left) and (n_max is None or M - np.sum(left) < n_max):
+        r += 1
+        front = left & (n_dom == 0)
+        RQ[front] = r
+        left[front] = False
+        n_dom -= np.sum(DQ[front, :], axis=0)
+    if dominance is not None:
+        dominance['F'], dominance['D'] = FQ, DQ
+
+    return RQ
+
+
+def dominance_block(F_a, F_b):
+    """
+    Returns boolean matrices D_ab [row a of F_a dominates row b of F_b] and D_ba [row b
+    dominates row a]: a dominates b if a <= b for all objectives and not b <= a. Rows
+    with nan neither dominate nor are dominated.
+    """
+    le = np.ones((F_a.shape[0], F_b.shape[0]), dtype=bool)
+    ge = np.ones((F_a.shape[0], F_b.shape[0]), dtype=bool)
+    for k in range(F_a.shape[1]):
+        le &= F_a[:, None, k] <= F_b[None, :, k]
+        ge &= F_a[:, None, k] >= F_b[None, :, k]
+
+    return le & ~ge, ge & ~le
+
+
+def strength_density(FQ, k = None):
+    """
+    Fitness of SPEA2 [Zitzler et al., 2001] returned as density dQ = 1 / (R + D) so that
+    larger values are better, as for the crowding distance. Raw fitness R of a row is the
+    sum of the strengths [= number of rows dominated] of the rows that dominate it [R = 0
+    for rank 1]. Density D = 1 / (sigma_k + 2) with sigma_k the distance to the k-th
+    nearest neighbour [k = sqrt(M)] in objective space normalized by the range of each
+    objective; scipy's cKDTree is used if available, otherwise batched distances.
+    Rows with non-finite objective function values have sigma_k = 0.
+    """
+    M, m = FQ.shape
+    D = np.zeros((M, M), dtype=bool)
+    for start in range(0, M, 1024):                     # Row blocks of dominance matrix
+        D[start:start + 1024, :] = dominance_block(FQ[start:start + 1024, :], FQ)[0]
+    S = np.sum(D, axis=1)                               # Strength: number of rows dominated
+    R = S @ D                                           # Raw fitness: sum of strengths of dominators
+
+    k = int(np.sqrt(M)) if k is None else k
+    sigma = np.zeros(M)
+    ok = np.all(np.isfinite(FQ), axis=1)
+    n = np.sum(ok)
+    if n > 1:
+        F_ok = FQ[ok, :]
+        F_range = np.ptp(F_ok, axis=0)
+        F_ok = (F_ok - np.min(F_ok, axis=0)) / np.where(F_range > 0, F_range, 1)
+        k_n = min(max(k, 1), n - 1)                     # k-th neighbour, row itself excluded
+        try:
+            from scipy.spatial import cKDTree
+            dist = cKDTree(F_ok).query(F_ok, k=k_n + 1)[0]
+            sigma[ok] = dist[:, k_n]
+        except ImportError:
+            sigma_ok = np.empty(n)
+            for start in range(0, n, 1024):
+                dist = np.sqrt(np.sum((F_ok[start:start + 1024, None, :] - F_ok[None, :, :])**2, axis=2))
+                sigma_ok[start:start + 1024] = np.partition(dist, k_n, axis=1)[:, k_n]
+            sigma[ok] = sigma_ok
+
+    return 1 / (R + 1 / (sigma + 2))
+
+
+def hv_density(FQ, RQ):
+    """
+    Exclusive hypervolume contribution of each row of FQ within its front [rank RQ] as
+    density dQ: larger values are better, as for the crowding distance. Objectives of
+    each front are normalized by HV_normalize.
+    """
+    dQ = np.zeros(FQ.shape[0])
+    for r in np.unique(RQ[~np.isnan(RQ)]):
+        id_r = np.where(RQ == r)[0]
+        dQ[id_r] = HV_contributions(*HV_normalize(FQ[id_r, :]), front=True)[1]
+
+    return dQ
+
+
+def HV_normalize(F):
+    """
+    Objectives of F normalized by the range of their finite values and reference point
+    1.1 [= 10% beyond the nadir point] so that the extremes of a front contribute too.
+    """
+    ok = np.all(np.isfinite(F), axis=1)
+    if not np.any(ok):
+        return np.full(F.shape, np.nan), np.full(F.shape[1], 1.1)
+    F_min, F_range = np.min(F[ok, :], axis=0), np.ptp(F[ok, :], axis=0)
+    with np.errstate(invalid='ignore'):
+        Fn = (F - F_min) / np.where(F_range > 0, F_range, 1)
+
+    return Fn, np.full(F.shape[1], 1.1)
+
+
+def HV_reference(F):
+    # Reference point of hypervolume of output: nadir point of F plus 10% of range [finite rows]
+    ok = np.all(np.isfinite(F), axis=1)
+    if not np.any(ok):
+        return np.full(F.shape[1], np.nan)
+    F_range = np.ptp(F[ok, :], axis=0)
+
+    return np.max(F[ok, :], axis=0) + 0.1 * np.where(F_range > 0, F_range, 1)
+
+
+def HV_contributions(F, ref, n_MC = 10000, front = False):
+    """
+    Hypervolume HV dominated by the rows of F and bounded by reference point ref, and the
+    exclusive contribution c of each row [= loss of HV if the row is removed] if F is one
+    front [= mutually nondominated rows]. Exact for m <= 3: a sweep along the first
+    objective if m = 2 and the box decomposition of HV_3D if m = 3; otherwise a Monte-
+    Carlo estimate with n_MC uniform samples of a local generator [seed 0] so that the
+    random numbers of AMALGAM are not used. Rows that are duplicated or not smaller than
+    ref in all objectives have c = 0. If front is True, the dominance check is skipped.
+    """
+    M, m = F.shape
+    c = np.zeros(M)
+    with np.errstate(invalid='ignore'):
+        ok = np.all(F < ref, axis=1)                    # Rows with nan are not below ref
+    if not np.any(ok):
+        return 0.0, c
+    F_u, inv, n_u = np.unique(F[ok, :], axis=0, return_inverse=True, return_counts=True)
+    nd = np.ones(F_u.shape[0], dtype=bool) if front else ENS_rank(F_u) == 1  # Nondominated unique rows
+    F_nd = F_u[nd, :]
+    if m == 1:
+        HV = ref[0] - F_nd[0, 0]
+        c_nd = np.array([HV])
+    elif m == 2:
+        # Unique nondominated rows sorted by first objective: second objective decreases
+        x_next = np.append(F_nd[1:, 0], ref[0])
+        y_prev = np.insert(F_nd[:-1, 1], 0, ref[1])
+        HV = np.sum((x_next - F_nd[:, 0]) * (ref[1] - F_nd[:, 1]))
+        c_nd = (x_next - F_nd[:, 0]) * (y_prev - F_nd[:, 1])
+    elif m == 3:
+        HV, c_nd = HV_3D(F_nd, ref)
+    else:
+        F_lo = np.min(F_nd, axis=0)
+        V = np.prod(ref - F_lo)                         # Volume of sampled box
+        B = MC_dominance(F_nd, F_lo + np.random.default_rng(0).random((n_MC, m)) * (ref - F_lo))
+        n_dom = np.sum(B, axis=0)                       # Number of rows dominating each sample
+        HV = V * np.mean(n_dom > 0)
+        c_nd = V * np.sum(B[:, n_dom == 1], axis=1) / n_MC
+    c_u = np.zeros(F_u.shape[0])
+    c_u[nd] = c_nd
+    c_u[n_u > 1] = 0                                    # Duplicates: removal of one copy loses nothing
+    c[ok] = c_u[inv.ravel()]
+
+    return HV, c
+
+
+def HV_3D(F, ref):
+    """
+    Hypervolume and exclusive contributions of the unique, mutually nondominated rows of
+    F [m = 3, all below ref] in O(n log n) by a sweep along the third objective [Emmerich
+    and Fonseca, 2011]. The staircase of the first two objectives of the rows swept so far
+    is sorted by first objective. The region of the staircase dominated by row i only is
+    a list of boxes [x_lo, x_hi, y_hi, z_start] above y_i; a box is closed [volume added
+    to c_i] when a new row covers part of it: the new row removes the staircase rows it
+    dominates, truncates the boxes of its left neighbour in x and of its right neighbour
+    in y, and creates boxes for the part of its quadrant not covered yet.
+    """
+    n = F.shape[0]
+    c = [0.0] * n
+    xs, ys, ids = [], [], []                            # Staircase: x increases, y decreases
+    boxes = [[] for _ in range(n)]
+    HV, A, z_old = 0.0, 0.0, 0.0                        # A: area of staircase region
+
+    P = F.tolist()
+
+    def close(i, b, z):
+        c[i] += (b[1] - b[0]) * (b[2] - P[i][1]) * (z - b[3])
+
+    for i in np.argsort(F[:, 2], kind='stable').tolist():
+        x, y, z = P[i]
+        HV += A * (z - z_old)
+        z_old = z
+        lo = bisect.bisect_left(xs, x)
+        hi = lo
+        while hi < len(xs) and ys[hi] >= y:             # Staircase rows dominated by row i
+            hi += 1
+        # Boxes of row i: one column between consecutive dominated rows
+        x_lo, y_hi = x, ys[lo - 1] if lo > 0 else ref[1]
+        for k in range(lo, hi):
+            for b in boxes[ids[k]]:
+                close(ids[k], b, z)
+            boxes[ids[k]] = []
+            boxes[i].append([x_lo, xs[k], y_hi, z])
+            x_lo, y_hi = xs[k], ys[k]
+        boxes[i].append([x_lo, xs[hi] if hi < len(xs) else ref[0], y_hi, z])
+        A += sum((b[1] - b[0]) * (b[2] - y) for b in boxes[i])
+        if lo > 0:                                      # Left neighbour: x beyond x of row i is covered
+            j, kept = ids[lo - 1], []
+            for b in boxes[ids[lo - 1]]:
+                if b[1] > x:
+                    close(j, b, z)
+                    if b[0] < x:
+                        kept.append([b[0], x, b[2], z])
+                else:
+                    kept.append(b)
+            boxes[j] = kept
+        if hi < len(xs):                                # Right neighbour: y beyond y of row i is covered
+            j, capped = ids[hi], [b for b in boxes[ids[hi]] if b[2] > y]
+            if capped:
+                for b in capped:
+                    close(j, b, z)
+                boxes[j] = [[capped[0][0], capped[-1][1], y, z]] + boxes[j][len(capped):]
+        xs[lo:hi], ys[lo:hi], ids[lo:hi] = [x], [y], [i]
+
+    HV += A * (ref[2] - z_old)
+    for i in ids:
+        for b in boxes[i]:
+            close(i, b, ref[2])
+
+    return HV, np.array(c)
+
+
+def MC_dominance(F, S):
+    # Boolean matrix: row i of F weakly dominates sample j of S
+    B = np.ones((F.shape[0], S.shape[0]), dtype=bool)
+    for k in range(F.shape[1]):
+        B &= F[:, k, None] <= S[None, :, k]
+
+    return B
+
+
+def HV_truncate(F, n_keep, n_MC = 10000):
+    """
+    Indices of the n_keep rows of F [one front] that remain if the row with the smallest
+    exclusive hypervolume contribution is removed, one at a time [SMS-EMOA: Beume et al.,
+    2007]. Contributions are computed in the objective space of HV_normalize and updated
+    after each removal; if m > 3 the same Monte-Carlo samples [local generator, seed 0]
+    are used for all removals.
+    """
+    Fn, ref = HV_normalize(F)
+    keep = np.arange(F.shape[0])
+    if F.shape[1] > 3:
+        F_lo = np.nanmin(np.where(np.isfinite(Fn), Fn, np.nan), axis=0)
+        F_lo = np.where(np.isnan(F_lo), 0, F_lo)
+        B = MC_dominance(Fn, F_lo + np.random.default_rng(0).random((n_MC, F.shape[1])) * (ref - F_lo))
+        n_dom = np.sum(B, axis=0)
+        while keep.size > n_keep:
+            i = np.argmin(np.sum(B[keep][:, n_dom == 1], axis=1))
+            n_dom -= B[keep[i]]
+            keep = np.delete(keep, i)
+    else:
+        while keep.size > n_keep:
+            keep = np.delete(keep, np.argmin(HV_contributions(Fn[keep, :], ref, front=True)[1]))
+
+    return keep
+
+
+def AMALGAM_restart(file_name, Func_name, Ftrue, plugin, backend = None):
     """
     Restart function to complete the desired number of generations.
 
     Parameters:
     fname : str
         The file name containing the saved AMALGAM data to restart from.
+    plugin : dict or object
+        Second argument of Func_name, needed to reopen the pool of workers.
+    backend : concurrent.futures.Executor, optional
+        options['backend'] of the restart: a user-supplied executor is not saved
+        and must be passed in again, otherwise the run continues with 'process'.
 
     Returns:
-    tuple : (AMALGAMPar, Par_info, options, PS, X, Z, FX, YX, output, FX_min, RX, dX, T_start)
+    tuple : (AMALGAMPar, Par_info, options, PS, X, Z, FX, iY, output, FX_min, RX, dX, T_start, CPU_info)
         The updated AMALGAM structure, function handle, data arrays, and other variables.
     """
     # Try-except block to handle loading failure
@@ -1011,7 +1616,8 @@ def AMALGAM_restart(file_name, Func_name, Ftrue):
         X = loaded_data['X']                                            #   X = file['X']
         Z = loaded_data['Z']                                            #   Z = file['Z']
         FX = loaded_data['FX']                                          #   FX = file['FX']
-        YX = loaded_data['YX']                                          #   YX = file['YX']
+        iY = loaded_data['iY']                                          #   iY = file['iY']
+        sims = loaded_data['sims']                                      #   sims = file['sims']
         FX_min = loaded_data['FX_min']                                  #   FX_min = file['FX_min']
         RX = loaded_data['RX']                                          #   RX = file['RX']
         dX = loaded_data['dX']                                          #   dX = file['dX']
@@ -1025,7 +1631,7 @@ def AMALGAM_restart(file_name, Func_name, Ftrue):
 
     except FileNotFoundError:
         # Handle the case when the file does not exist
-        error_message = f"AMALGAM_PACKAGE ERROR: Cannot restart --> File {fname} does not exist. Next run, to avoid this problem, set field 'save' of structure options to 'yes'"
+        error_message = f"AMALGAM_PACKAGE ERROR: Cannot restart --> File {file_name} does not exist. Next run, to avoid this problem, set field 'save' of structure options to 'yes'"
         raise FileNotFoundError(error_message)
 
     # Open warning file
@@ -1066,21 +1672,43 @@ def AMALGAM_restart(file_name, Func_name, Ftrue):
                 fid.write(final_message)
 
             # Add T_new * AMALGAMPar['N'] rows to Z with nan values for T_new additional generations
-            Z = np.pad(Z, ((0, T_new * AMALGAMPar['N']), (0, 0)), mode='constant', constant_values=np.nan)
+            if isinstance(options['epsilon'], str):     # Epsilon archive: Z does not grow
+                Z = np.pad(Z, ((0, T_new * AMALGAMPar['N']), (0, 0)), mode='constant', constant_values=np.nan)
+            if 'Y_row' in output and isinstance(options['epsilon'], str):
+                # Add T_new * AMALGAMPar['N'] rows to Y_row with -1 [= no simulation]
+                output['Y_row'] = np.pad(output['Y_row'], (0, T_new * AMALGAMPar['N']), mode='constant', constant_values=-1)
             # Add T_new lines to p_rm
             output['p_rm'] = np.pad(output['p_rm'], ((0, T_new), (0, 0)), mode='constant', constant_values=np.nan)
             if len(Ftrue) > 0:
                 # Add T_new lines to IGD
                 output['IGD'] = np.pad(output['IGD'], ((0, T_new), (0, 0)), mode='constant', constant_values=np.nan)
+            for key in ['HV', 'idle', 'cache', 'failed']:
+                if key in output:
+                    # Add T_new lines to HV, idle, cache and failed
+                    output[key] = np.pad(output[key], ((0, T_new), (0, 0)), mode='constant', constant_values=np.nan)
             AMALGAMPar['T'] += T_new
 
+    # User-supplied executor of options['backend'] is not saved [= 'executor']
+    if options['backend'] == 'executor':
+        if isinstance(backend, concurrent.futures.Executor):
+            options['backend'] = backend
+        else:
+            options['backend'] = 'process'
+            with open('warning_file.txt', 'a+') as fid:
+                warning_message = "AMALGAM RESTART: Executor of options['backend'] is not saved and was not passed in again with options['backend'] --> Continue with options['backend'] = 'process'\n"
+                print(warning_message)
+                fid.write(warning_message)
+
     # Define starting value of T
     T_start = t + 1
 
-    # Setup parallel computing framework or not (this part would need further context to fully translate)
-    AMALGAMPar, func_handle, base_dir = AMALGAM_calc_setup(AMALGAMPar, Func_name, options, plugin)
+    # Setup parallel computing framework or not: reopens the pool of workers
+    AMALGAMPar, func_handle, base_dir, CPU_info = AMALGAM_calc_setup(AMALGAMPar, Func_name, options, plugin, Par_info)
+    if sims is not None:
+        # Simulations of next generations are appended to the existing store
+        CPU_info['sims'] = sims
 
-    return AMALGAMPar, Par_info, func_handle, options, PS, X, Z, FX, YX, p_rm, output, FX_min, RX, dX, ct, base_dir, T_start
+    return AMALGAMPar, Par_info, func_handle, options, PS, X, Z, FX, iY, p_rm, output, FX_min, RX, dX, ct, base_dir, T_start, CPU_info
 
 
 def AMALGAM_distribution(AMALGAMPar, p_rm):
@@ -1113,7 +1741,7 @@ def AMALGAM_distribution(AMALGAMPar, p_rm):
     return id, id_rm
 
 
-def AMALGAM_population(AMALGAMPar, options, X, G, FX, FG, id):
+def AMALGAM_population(AMALGAMPar, options, X, G, FX, FG, id, dominance = None):
     """
     Selects the new population based on current offspring and parents.
     
@@ -1135,6 +1763,8 @@ def AMALGAM_population(AMALGAMPar, options, X, G, FX, FG, id):
         The objective function values of the offspring population.
     id : numpy array
         An array of recombination method indices.
+    dominance : dict, optional
+        Dominance matrix of X if options['ranking'] = 'incremental' [updated to Xn].
         
     Returns:
     Xn : numpy array
@@ -1156,13 +1786,13 @@ def AMALGAM_population(AMALGAMPar, options, X, G, FX, FG, id):
     FQ = np.vstack([FX, FG])
     
     # Rank and calculate crowding distances
-    RQ, dQ, _ = AMALGAM_rank(FQ, options)  # AMALGAM_rank needs to be defined elsewhere
+    RQ, dQ = AMALGAM_select_rank(FQ, AMALGAMPar['N'], options, dominance)  # Rank only fronts needed to select N points
     
     # Indices of recombination methods
     I_alg = np.hstack([np.zeros(AMALGAMPar['N']), id])
     
     # Selection based on rank
-    RQ_max = int(np.max(RQ))  # Maximum rank of Q
+    RQ_max = int(np.nanmax(RQ))  # Maximum rank of Q [fronts peeled]
     n_rnk = np.full((RQ_max, 1), np.nan)
 
     for r in range(1, RQ_max + 1):
@@ -1178,15 +1808,22 @@ def AMALGAM_population(AMALGAMPar, options, X, G, FX, FG, id):
         #n_lft = AMALGAMPar['N'] - tot_rnk[r_max - 1]  # Remaining spots to fill
         n_lft = int(AMALGAMPar['N'] - tot_rnk[r_max])  # Remaining spots to fill
         id_lft = np.where(RQ == r_max + 2)[0]  # Points with the next rank
-        # Sort based on crowding distance (descending)
-        sorted_lft = np.argsort(-dQ[id_lft])
-        id_C = id_lft[sorted_lft[:n_lft]]  # Select points with the largest crowding distances
+        if options['density'] == 'hypervolume':
+            # Remove points with smallest hypervolume contribution one at a time
+            id_C = id_lft[HV_truncate(FQ[id_lft, :], n_lft)]
+        else:
+            # Sort based on crowding distance (descending)
+            sorted_lft = np.argsort(-dQ[id_lft])
+            id_C = id_lft[sorted_lft[:n_lft]]  # Select points with the largest crowding distances
         # Combine the selected points
         id_N = np.hstack([id_R, id_C])
     else:
         id_R = np.where(RQ == 1)[0]  # Select only points with rank 1
-        sorted_R = np.argsort(-dQ[id_R])  # Sort based on crowding distance (descending)
-        id_N = id_R[sorted_R[:AMALGAMPar['N']]]  # Select the top N points based on crowding distance
+        if options['density'] == 'hypervolume':
+            id_N = id_R[HV_truncate(FQ[id_R, :], AMALGAMPar['N'])]  # Keep N points of largest hypervolume
+        else:
+            sorted_R = np.argsort(-dQ[id_R])  # Sort based on crowding distance (descending)
+            id_N = id_R[sorted_R[:AMALGAMPar['N']]]  # Select the top N points based on crowding distance
     
     # Extract the new population
     Xn = Q[id_N, :AMALGAMPar['d']]  # New population
@@ -1194,6 +1831,9 @@ def AMALGAM_population(AMALGAMPar, options, X, G, FX, FG, id):
     RXn = RQ[id_N]  # Ranks of the new population
     dXn = dQ[id_N]  # Crowding distances of the new population
     id = I_alg[id_N]  # Indices of the recombination methods for the new population
+    if dominance is not None and dominance.get('D') is not None:
+        # Keep dominance matrix of new population for next generation
+        dominance['F'], dominance['D'] = FXn, dominance['D'][np.ix_(id_N, id_N)]
     
     return Xn, FXn, RXn, dXn, id_N, id
 
@@ -1222,6 +1862,9 @@ def AMALGAM_load(AMALGAMPar, p_rm, id):
 
     # Calculate the total number of points made it to the new population (id > 0)
     T = np.sum(id > 0)  # Number of points that made it to the new population
+    if T == 0:
+        # No child selected [e.g. all aborted as dominated]: keep selection probabilities
+        return p_rm
     
     # For each recombination method, calculate the proportion of points from that method
     for j in range(1, AMALGAMPar['q']+1):
@@ -1315,7 +1958,284 @@ def AMALGAM_children(AMALGAMPar, Par_info, X, FX, RX, dX, PS, id_rm, plugin):
     return G, PS
 
 
-def AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, plugin, printed_warnings, verbose = 0):
+def AMALGAM_async(AMALGAMPar, Par_info, options, X, FX, iY, RX, dX, FX_min, p_rm, PS, t, plugin, printed_warnings, CPU_info):
+    # ####################################################################### #
+    # Asynchronous steady-state generation: children are created, evaluated   #
+    # and merged with the population as soon as a worker of the pool is free  #
+    #  SYNOPSIS                                                               #
+    #   [X,FX,iY,RX,dX,FXG_min,p_rm,PS] = AMALGAM_async(AMALGAMPar, ...       #
+    #       Par_info,options,X,FX,iY,RX,dX,FX_min,p_rm,PS,t,plugin, ...       #
+    #       printed_warnings,CPU_info)                                        #
+    #  where                                                                  #
+    #   iY          [input] Rows of population in store CPU_info.sims         #
+    #   t           [input] Generation number: equals N merged evaluations    #
+    #   CPU_info    [input] Pool of workers and state of children (.async)    #
+    #   FXG_min     [outpt] Minimum of each objective this generation         #
+    #                                                                         #
+    #  Children of the current population are sent to a free worker one at    #
+    #  a time and the results that have returned are merged with X by         #
+    #  AMALGAM_population. Workers are never idle waiting for the slowest     #
+    #  model run. The selection probabilities p_rm are updated with           #
+    #  AMALGAM_load after N evaluations, that is, once per generation. A      #
+    #  failed child is not merged if options.failure = 'resample': a new      #
+    #  child takes its place, at most options.retry + 1 times, after which    #
+    #  the failed child is merged with options.penalty                        #
+    # ####################################################################### #
+
+    N, m = AMALGAMPar['N'], AMALGAMPar['m']
+    state = CPU_info['async']
+    T_wall, T_busy = time.time(), 0             # Start of generation and busy time of workers
+    FXG_min = FX_min                            # Minimum values of each objective function
+    id_X = np.zeros(N)                          # Recombination method of children in X [0 = parent]
+    n_eval, n_hit, n_store = 0, 0, 0            # Number of evaluations, cache and store hits merged in this generation
+    cache, store = CPU_info['cache'], CPU_info['store']
+    t_max = 2 * (options['retry'] + 1) * options['timeout']   # Watchdog: no child returned within t_max seconds
+    t_max = t_max if np.isfinite(t_max) else None
+    abort = None                                # Dominance check of early abort [= rank 1 FX of current population]
+
+    while n_eval < N:
+        # Send children to free workers; in the last generation no more than N evaluations
+        while state['free'] and n_eval + state['hits'] + (0 if t < AMALGAMPar['T'] else AMALGAMPar['CPU'] - len(state['free'])) < N:
+            if len(state['id']) == 0:           # Create children from current population
+                id, id_rm = AMALGAM_distribution(AMALGAMPar, p_rm)
+                state['G'], PS = AMALGAM_children(AMALGAMPar, Par_info, X, FX, RX, dX, PS, id_rm, plugin)
+                state['id'] = id
+            g, j = state['G'][:1, :], state['id'][0]
+            state['G'], state['id'] = state['G'][1:, :], state['id'][1:]
+            r = state['resample'].pop() if state['resample'] else 0    # Resample round of child
+            if cache is not None and cache_keys(g, cache)[0] in cache['data']:
+                # Child in cache: no worker needed
+                fx, y, _ = cache_FX(cache, cache_keys(g, cache), [], np.empty((0, m)), None, [])
+                state['queue'].put((None, g, j, (fx, y)))
+                state['hits'] += 1
+                continue
+            if store is not None:
+                fx, y, found = store_FX(store, g)
+                if found[0]:
+                    # Child in store: no worker needed
+                    state['queue'].put(('store', g, j, (fx, y)))
+                    state['hits'] += 1
+                    continue
+            worker_id = state['free'].pop()
+            state['busy'][worker_id] = (g, j, r)
+            if options['abort'] == 'yes':
+                abort = functools.partial(dominated, FX[RX == 1, :])
+            CPU_info['pool'].apply_async(worker_chunk, ((worker_id, g, options['vectorized'], options['timeout'], options['retry'],
+                                                         open_buffers(CPU_info, AMALGAMPar['CPU'], m), abort),),
+                callback = lambda res, w = worker_id, g = g, j = j: state['queue'].put((w, g, j, res)),
+                error_callback = lambda err, w = worker_id, g = g, j = j: state['queue'].put((w, g, j, err)))
+
+        # Wait for the first child to return, then collect all others that have returned
+        try:
+            returned = [state['queue'].get(timeout=t_max)]
+        except queue.Empty:
+            # Terminate workers and open new pool: children not returned have failed
+            CPU_info['pool'].terminate()
+            CPU_info['pool'] = open_pool(AMALGAMPar['CPU'], CPU_info['initargs'])
+            CPU_info['failed'][2] += 1
+            # Results that arrived before the pool was terminated are kept
+            returned = []
+            while not state['queue'].empty():
+                returned.append(state['queue'].get_nowait())
+            for worker_id, (g, j, _) in state['busy'].items():
+                if worker_id not in [res[0] for res in returned]:
+                    err = TimeoutError(f"AMALGAM_async: worker did not return result within {t_max} seconds")
+                    returned.append((worker_id, g, j, (0, 1, 0, 0, err if options['vectorized'] == 'yes' else [err])))
+            for res in returned:
+                state['queue'].put(res)
+            continue
+        while len(returned) < N - n_eval and not state['queue'].empty():
+            returned.append(state['queue'].get_nowait())
+
+        G, FG, id_G, YG = [], [], [], []
+        for worker_id, g, j, res in returned:
+            if worker_id is None:               # Found in cache
+                fx, y = res
+                state['hits'] -= 1
+                n_hit += 1
+            elif worker_id == 'store':          # Found in store
+                fx, y = res
+                state['hits'] -= 1
+                n_store += 1
+                if cache is not None:
+                    fx, y, _ = cache_FX(cache, cache_keys(g, cache), cache_keys(g, cache), fx, y, [0])
+            elif worker_id not in state['busy']:  # Result of terminated pool that was already handled
+                continue
+            else:
+                state['free'].append(worker_id)
+                r = state['busy'].pop(worker_id)[2]
+                if isinstance(res, Exception):
+                    raise res
+                _, _, t_busy, n_retry, res = res
+                T_busy += t_busy
+                CPU_info['failed'][1] += n_retry
+                if options['vectorized'] == 'no':
+                    res = res[0]                # worker_task returns list with result of each row
+                if isinstance(res, Exception):  # Failed evaluation
+                    if options['failure'] == 'error':
+                        raise res
+                    CPU_info['failed'][0] += 1
+                    if options['failure'] == 'resample' and r < options['retry'] + 1:
+                        state['resample'].append(r + 1)     # New child takes its place
+                        continue
+                    fx, y = np.full((1, m), options['penalty']), None
+                else:
+                    if res is None:             # Row worker_id of shared buffers
+                        fx, y = read_buffers(CPU_info['buffers'], worker_id, 1)
+                    else:
+                        fx, y = unpack_FX_block(res, 1, m, options, printed_warnings)
+                        if CPU_info['buffers'] is None:
+                            CPU_info['buffers'] = {'m': m, 'n_Y': y.shape[1] if y is not None else 0, 'rows': 0}
+                    status = [0]                # Status of child: 0 evaluated, 2 stopped early
+                    if options['abort'] == 'yes' and np.all(np.isposinf(fx)):
+                        status = [2]
+                        CPU_info['failed'][3] += 1
+                    if store is not None:
+                        store_add(store, g, fx, y, status)
+                    if cache is not None:
+                        fx, y, _ = cache_FX(cache, cache_keys(g, cache), cache_keys(g, cache), fx, y, status)
+            G.append(g), FG.append(fx), id_G.append(j), YG.append(y)
+
+        if len(G) == 0:                         # All returned children have failed
+            continue
+        n_G = len(G)
+        G, FG, id_G = np.vstack(G), np.vstack(FG), np.array(id_G)
+        if any(y is not None for y in YG):      # Simulations, nan for failed children
+            n_Y = next(y for y in YG if y is not None).shape[1]
+            YG = np.vstack([y if y is not None else np.full((1, n_Y), np.nan) for y in YG])
+        else:
+            YG = None
+
+        # Merge returned children with population
+        FXG_min = np.minimum(FXG_min, np.min(FG, axis=0))
+        X, FX, RX, dX, id_N, _ = AMALGAM_population(AMALGAMPar, options, X, G, FX, FG, id_G, CPU_info['dominance'])
+        id_X = np.hstack([id_X, id_G])[id_N]
+        if iY is not None:
+            iY = np.concatenate([iY, sims_add(CPU_info['sims'], YG, n_G)])[id_N]
+        n_eval += n_G
+
+    if np.any(id_X > 0):                        # New selection probability rec. methods
+        p_rm = AMALGAM_load(AMALGAMPar, p_rm, id_X)
+
+    T_wall = time.time() - T_wall
+    CPU_info['idle'] = [T_wall, AMALGAMPar['CPU'] * T_wall - T_busy]
+    CPU_info['hits'] = [n_eval, n_hit if cache is not None else np.nan, n_store if store is not None else np.nan]
+
+    return X, FX, iY, RX, dX, FXG_min, p_rm, PS
+
+
+def AMALGAM_surrogate(AMALGAMPar, Par_info, options, X, FX, RX, dX, PS, p_rm, Z, G, id, plugin):
+    # ####################################################################### #
+    # Surrogate-assisted pre-screening: oversample candidates, predict their  #
+    # objective functions with model fitted to archive and select N children  #
+    #  SYNOPSIS                                                               #
+    #   [G,id] = AMALGAM_surrogate(AMALGAMPar,Par_info,options,X,FX,RX, ...   #
+    #       dX,PS,p_rm,Z,G,id,plugin)                                         #
+    #  where                                                                  #
+    #   Z           [input] Archive [= training data], rows with d+m columns  #
+    #   G           [input] Nxd matrix children of AMALGAM_children           #
+    #   G           [outpt] Nxd matrix most promising of options.oversample*N #
+    #                       candidates [= children evaluated by func_handle]  #
+    #                                                                         #
+    #  The candidates and the current population are ranked together on      #
+    #  predicted objective function values: children with lowest rank and     #
+    #  largest density [crowding distance] are selected                       #
+    # ####################################################################### #
+
+    d, m, N = AMALGAMPar['d'], AMALGAMPar['m'], AMALGAMPar['N']
+    # Training data: archive and current population with finite objective function values
+    D = np.vstack([Z[:, :d + m], np.concatenate([X, FX], axis=1)])
+    D = D[np.all(np.isfinite(D), axis=1)]
+    D = np.unique(D, axis=0)
+    if D.shape[0] < 2:
+        return G, id
+
+    # Oversample: more children of current population, copy of PS keeps velocities of swarm
+    G_all, id_all = [G], [id]
+    for _ in range(options['oversample'] - 1):
+        id_c, id_rm = AMALGAM_distribution(AMALGAMPar, p_rm)
+        G_c, _ = AMALGAM_children(AMALGAMPar, Par_info, X, FX, RX, dX, dict(PS), id_rm, plugin)
+        G_all.append(G_c), id_all.append(id_c)
+    G_all, id_all = np.vstack(G_all), np.concatenate(id_all)
+
+    # Predicted objective function values of candidates
+    scale = np.where(Par_info['max'] > Par_info['min'], Par_info['max'] - Par_info['min'], 1)
+    F_pred = surrogate_predict(D[:, :d] / scale, D[:, d:d + m], G_all / scale, options['surrogate'])
+
+    # Rank candidates with current population: N candidates with lowest rank and largest density
+    RQ, dQ, _ = AMALGAM_rank(np.vstack([FX, F_pred]), options)
+    RQ, dQ = RQ[FX.shape[0]:], dQ[FX.shape[0]:]
+    id_sel = np.lexsort((-dQ, RQ))[:N]
+
+    return G_all[id_sel, :], id_all[id_sel]
+
+
+def surrogate_predict(X_train, F_train, X_new, method = 'knn', k = 5):
+    """
+    Predict objective function values of X_new from training data (X_train, F_train).
+    'knn': inverse-distance weighted mean of the k nearest neighbors.
+    'rbf': thin-plate spline radial basis function [scipy] of 50 nearest neighbors.
+    """
+    n, d = X_train.shape
+    if method == 'rbf' and n > d + 1:
+        try:
+            from scipy.interpolate import RBFInterpolator
+        except ImportError:
+            raise ImportError("AMALGAM ERROR: options['surrogate'] = 'rbf' requires scipy -> install scipy or use options['surrogate'] = 'knn'")
+        return RBFInterpolator(X_train, F_train, neighbors=min(50, n), kernel='thin_plate_spline', smoothing=1e-8)(X_new)
+
+    # Squared Euclidean distances between new points and training points
+    D2 = np.sum(X_new**2, axis=1)[:, None] + np.sum(X_train**2, axis=1)[None, :] - 2 * X_new @ X_train.T
+    D2 = np.maximum(D2, 0)
+    k = min(k, n)
+    id_k = np.argpartition(D2, k - 1, axis=1)[:, :k]
+    w = 1 / (np.sqrt(np.take_along_axis(D2, id_k, axis=1)) + 1e-12)
+
+    return np.einsum('ij,ijk->ik', w, F_train[id_k]) / np.sum(w, axis=1, keepdims=True)
+
+
+def AMALGAM_resample(AMALGAMPar, Par_info, options, X, FX, RX, dX, PS, p_rm, G, FG, YG, id, func_handle, base_dir, plugin, printed_warnings, CPU_info):
+    # ####################################################################### #
+    # Replaces children whose evaluation failed (CPU_info.status = 1) by new  #
+    # children of the current population: at most options.retry + 1 rounds   #
+    # If X is None, G is the initial population and failed rows are drawn     #
+    # again with Par_info.initial [uniform if initial = 'user' or 'prior']    #
+    #  SYNOPSIS                                                               #
+    #   [G,FG,YG,id] = AMALGAM_resample(AMALGAMPar,Par_info,options,X,FX, ... #
+    #       RX,dX,PS,p_rm,G,FG,YG,id,func_handle,base_dir,plugin, ...         #
+    #       printed_warnings,CPU_info)                                        #
+    # ####################################################################### #
+
+    status = CPU_info['status']             # Status of children: 1 = failed [not stopped early by options.abort]
+    hits, idle = np.array(CPU_info['hits'], dtype=float), np.array(CPU_info['idle'], dtype=float)
+    for _ in range(options['retry'] + 1):
+        failed = np.where(status == 1)[0]
+        if len(failed) == 0:
+            break
+        if X is None:
+            # Initial population: new draws of the failed rows
+            initial = Par_info['initial'] if Par_info['initial'] in ['uniform', 'latin', 'normal'] else 'uniform'
+            G[failed, :] = AMALGAM_draw(AMALGAMPar, Par_info, plugin, len(failed), initial)
+        else:
+            # New children: copy of PS so that velocities of swarm are not changed
+            id_new, id_rm = AMALGAM_distribution(AMALGAMPar, p_rm)
+            G_new, _ = AMALGAM_children(AMALGAMPar, Par_info, X, FX, RX, dX, dict(PS), id_rm, plugin)
+            G[failed, :], id[failed] = G_new[failed, :], id_new[failed]
+        FG[failed, :], Y_new = AMALGAM_calc_FX(G[failed, :], AMALGAMPar, options, func_handle, base_dir, plugin, printed_warnings, CPU_info)
+        status[failed] = CPU_info['status']
+        # Cache hits and wall/idle time of this round add to those of the first evaluation of the children
+        hits = np.where(np.isnan(hits), CPU_info['hits'], hits + np.nan_to_num(CPU_info['hits']))
+        idle = np.where(np.isnan(idle), CPU_info['idle'], idle + np.nan_to_num(CPU_info['idle']))
+        if Y_new is not None:
+            if YG is None:
+                YG = np.full((G.shape[0], Y_new.shape[1]), np.nan)
+            YG[failed, :] = Y_new
+    CPU_info['hits'], CPU_info['idle'], CPU_info['status'] = list(hits), list(idle), status
+
+    return G, FG, YG, id
+
+
+def AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, plugin, printed_warnings, CPU_info = None, verbose = 0):
     """
     Evaluate user-supplied function and return objective function values or model simulations if so desired.
 
@@ -1325,7 +2245,21 @@ def AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, plugin, print
     AMALGAMPar : dict
         Dictionary containing algorithm parameters such as 'm' (number of objectives), 'CPU', etc.
     options : dict
-        A dictionary containing options such as 'modout' and 'IO'.
+        A dictionary containing options such as 'modout', 'IO', 'vectorized' and 'abort'. If
+        options['vectorized'] == 'yes' then func_handle receives the N x d matrix X (or
+        the rows of X of a worker) and returns an N x m matrix of objective function
+        values and, optionally, an N x n matrix of model simulations. An evaluation that
+        raises an exception or exceeds options['timeout'] seconds is tried again at most
+        options['retry'] times; options['failure'] then stops the run ('error') or sets
+        its objective function values to options['penalty'] ('penalty', 'resample').
+        If options['abort'] == 'yes', func_handle receives keyword argument abort: a
+        function that returns True if (a lower bound of) the objective function values
+        is dominated by rank 1 CPU_info['front']. The model may then stop and return inf.
+    CPU_info : dict, optional
+        Computational environment of AMALGAM_calc_setup with the pool of workers. If
+        CPU_info['cache'] is set, only parameter vectors not in the cache are evaluated.
+        CPU_info['status'] returns the status of each row of X: 0 evaluated, 1 failed
+        [FX = options['penalty']] and 2 stopped early [options['abort']].
     verbose : int, optional
         If set to 1, prints progress.
 
@@ -1335,140 +2269,425 @@ def AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, plugin, print
     Y : np.ndarray
         Model simulations (if 'modout' is 'yes'), otherwise an empty array.
     """
+    cache = CPU_info['cache'] if CPU_info is not None else None
+    store = CPU_info['store'] if CPU_info is not None else None
+    if CPU_info is not None:
+        CPU_info['hits'], CPU_info['idle'] = [X.shape[0], np.nan, np.nan], [np.nan, np.nan]
+    if cache is not None:
+        # Evaluate only (unique) parameter vectors that are not in cache
+        keys = cache_keys(X, cache)
+        id_new = {}
+        for ii, key in enumerate(keys):
+            if key not in cache['data'] and key not in id_new:
+                id_new[key] = ii
+        CPU_info['hits'][1] = X.shape[0] - len(id_new)
+        X = X[list(id_new.values()), :]
+    if store is not None:
+        # Parameter vectors evaluated in this or previous runs are read from the store
+        FX_store, Y_store, found = store_FX(store, X)
+        CPU_info['hits'][2] = np.sum(found)
+        X = X[~found, :]
+
     N, d = X.shape                  # Number of parameter vectors and dimensions
     m = AMALGAMPar['m']             # Number of objective functions
     FX = np.full((N, m), np.nan)    # Preallocate objective function values
     Y = None                        # Preallocate model simulation output
+    status = np.zeros(N, dtype=int) # 0: evaluated, 1: failed, 2: stopped early
 
-    # Sequential evaluation - CORRECT in Python
-    if AMALGAMPar['CPU'] == 1:
-        for ii in range(N):
-            # If function returns more than 1 output, then it will go to *rest, but be careful
-            if plugin is None:
-                results = func_handle(X[ii, :])
-            else:
-                results = func_handle(X[ii, :], plugin)
-            # results can consists or more than one array depending on # return arguments Func_name
-            if isinstance(results, (tuple, list)):
-                FX[ii, :] = results[0]
-                # Now check whether we have to store model output
-                if options['modout'] == 'yes':
-                    if ii == 0:                                     # Initialize Y on first iteration
-                        # Z = np.array([x[1] for x in results])     # Extract 2nd element
-                        Z = results[1]                              # Extract 2nd element
-                        Y = np.full((N, len(Z)), np.nan)            # Initialize Y 
-                        Y[0, :] = Z                                 # Populate first row of Y
-                    else:
-                        Y[ii, :] = results[1]                       # Subsequent iterations
-                else:
-                    Y = None                                        # Y is returned but modout is 'no'
-            else:
-                FX[ii,] = results
-                Y = None
-            if verbose:
-                # Print progress if verbose flag is set
-                prt_progress(AMALGAMPar, N)        
+    chunks = []                     # Evaluated chunks: start index, number of rows, number of retries, results
+    abort = None                    # Dominance check of early abort [= picklable, sent with each task]
+    if options.get('abort', 'no') == 'yes' and CPU_info is not None and CPU_info['front'] is not None:
+        abort = functools.partial(dominated, CPU_info['front'])
+
+    # All parameter vectors are in cache
+    if N == 0:
+        pass
 
-    # Parallel evaluation - CORRECT in Python if IO = Yes and IO = No
+    # Coroutine function - all rows of X evaluated concurrently on event loop [at most options['concurrency']]
+    elif inspect.iscoroutinefunction(func_handle):
+        evaluated = run_coroutine(evaluate_async(func_handle, X, plugin, options['vectorized'], options['timeout'], options['retry'], options['concurrency'], abort))
+        if options['vectorized'] == 'yes':
+            chunks.append((0, N, evaluated[0][1], evaluated[0][0]))
+        else:
+            chunks.extend((ii, 1, n_retry, [results]) for ii, (results, n_retry) in enumerate(evaluated))
+        if verbose:
+            prt_progress(AMALGAMPar, N)
+
+    # Executor of options['backend'] - same chunks, order and failures as pool of workers
+    elif CPU_info is not None and CPU_info['executor'] is not None:
+        task_ranges = distribute_tasks(N, AMALGAMPar['CPU'], options['chunksize'])
+        t_max = 2 * (options['retry'] + 1) * options['timeout'] * max(end_idx - start_idx for start_idx, end_idx in task_ranges)
+        t_max = t_max if np.isfinite(t_max) else None
+        T_wall, T_busy = time.time(), 0
+        pending = {CPU_info['executor'].submit(executor_chunk, func_handle, plugin, (start_idx, X[start_idx:end_idx, :], options['vectorized'],
+                   options['timeout'], options['retry'], abort)): (start_idx, end_idx) for start_idx, end_idx in task_ranges}
+        while pending:
+            done, _ = concurrent.futures.wait(pending, timeout=t_max, return_when=concurrent.futures.FIRST_COMPLETED)
+            if not done:
+                # No chunk returned within t_max seconds: rows of chunks not returned have failed
+                CPU_info['failed'][2] += 1
+                for future, (start_idx, end_idx) in pending.items():
+                    future.cancel()
+                    err = TimeoutError(f"AMALGAM_calc_FX: executor did not return result within {t_max} seconds")
+                    chunks.append((start_idx, end_idx - start_idx, 0, err if options['vectorized'] == 'yes' else [err] * (end_idx - start_idx)))
+                break
+            for future in done:
+                del pending[future]
+                start_idx, n, t_busy, n_retry, results = future.result()
+                T_busy += t_busy
+                chunks.append((start_idx, n, n_retry, results))
+        T_wall = time.time() - T_wall
+        CPU_info['idle'] = [T_wall, AMALGAMPar['CPU'] * T_wall - T_busy]
+
+    # Broker - chunks of rows of X are pulled by local and remote workers
+    elif CPU_info is not None and CPU_info['broker'] is not None:
+        task_ranges = distribute_tasks(N, max(len(CPU_info['broker']['workers']), AMALGAMPar['CPU'], 1), options['chunksize'])
+        t_max = 2 * (options['retry'] + 1) * options['timeout'] * max(end_idx - start_idx for start_idx, end_idx in task_ranges)
+        T_wall = time.time()
+        done = broker_evaluate(CPU_info['broker'], {start_idx: (start_idx, X[start_idx:end_idx, :], options['vectorized'], options['timeout'],
+                               options['retry'], None, abort) for start_idx, end_idx in task_ranges}, t_max)
+        T_busy = 0
+        for start_idx, end_idx in task_ranges:
+            if isinstance(done[start_idx], TimeoutError):
+                # Worker did not return chunk within t_max seconds: its rows have failed
+                err = done[start_idx]
+                CPU_info['failed'][2] += 1
+                chunks.append((start_idx, end_idx - start_idx, 0, err if options['vectorized'] == 'yes' else [err] * (end_idx - start_idx)))
+                continue
+            start_idx, n, t_busy, n_retry, results = done[start_idx]
+            T_busy += t_busy
+            chunks.append((start_idx, n, n_retry, results))
+        T_wall = time.time() - T_wall
+        CPU_info['idle'] = [T_wall, len(CPU_info['broker']['workers']) * T_wall - T_busy]
+
+    # Sequential evaluation - all rows of X in one call if function is vectorized
+    elif AMALGAMPar['CPU'] == 1:
+        if options['vectorized'] == 'yes':
+            results, n_retry = evaluate_rows(func_handle, X, plugin, 'yes', options['timeout'], options['retry'], abort)
+            chunks.append((0, N, n_retry, results))
+            if verbose:
+                prt_progress(AMALGAMPar, N)
+        else:
+            for ii in range(N):
+                results, n_retry = evaluate_rows(func_handle, X[ii:ii + 1, :], plugin, 'no', options['timeout'], options['retry'], abort)
+                chunks.append((ii, 1, n_retry, results))
+                if verbose:
+                    # Print progress if verbose flag is set
+                    prt_progress(AMALGAMPar, N)
+
+    # Parallel evaluation - chunks of rows of X are handed out to workers on demand
     elif AMALGAMPar['CPU'] > 1:
-        task_ranges = distribute_tasks(N, AMALGAMPar['CPU'])      # Task distribution for each worker (divide work)
-        # task_ranges = [(i * (N // DREAMPar['CPU']), (i + 1) * (N // DREAMPar['CPU'])) for i in range(DREAMPar['CPU'])]
-        if isinstance(plugin, dict):                            # Convert to regular numpy array so that it can be shared with workers [= pickable]
-            plugin = convert_memoryview_to_array(plugin)
-            
-        with mp.Pool(processes=AMALGAMPar['CPU']) as pool:
-            results = pool.starmap(worker_task, [(worker_id, start_idx, end_idx, X, func_handle, plugin, base_dir)
-                                                    for worker_id, (start_idx, end_idx) in enumerate(task_ranges)])
-
-        if isinstance(results, (tuple, list)):      
-            # Unpack the results from the workers
-            ct = 0
-            i = 0
-            for worker_result in results:
-                # Determine how many variables [objects] were received from function handle
-                nvar = sum(isinstance(item, np.ndarray) for sublist in worker_result for item in sublist)
-                if N > AMALGAMPar['CPU']:     ## must divide by number of X's evaluated by each worker
-                    nvar = nvar/(task_ranges[i][1] - task_ranges[i][0])
-                i = i + 1
-                if isinstance(worker_result, list):         ## This is when N > DREAMPar['CPU']
-                    if nvar == 2:    ## 2 outputs, FX and Y    
-                        for fx, y in worker_result:
-                            FX[ct, :] = fx.flatten() 
-                            if options['modout'] == 'no':
-                                warning_msg = f"AMALGAM_calc_FX WARNING: Did not expect two output arguments from the function. Setting Y to None as options['modout'] == 'no'."
-                                if warning_msg not in printed_warnings:
-                                    print(warning_msg)
-                                    printed_warnings.add(warning_msg)
-                            else:
-                                if ct == 0:
-                                    Y = np.full((N,len(y)),np.nan)
-                                Y[ct, :] = y.flatten()
-                            # update counter                                
-                            ct = ct + 1
-    
-                    elif nvar == 1:  ## 1 output, FX
-                        for fx in worker_result:
-                            FX[ct, :] = fx.flatten()
-                            ct = ct + 1
-                            if options['modout'] == 'yes':
-                                warning_msg = f"AMALGAM_calc_FX WARNING: Did not expect one output argument from the function as options['modout'] == 'yes'. Setting Y to None"
-                                if warning_msg not in printed_warnings:
-                                    print(warning_msg)
-                                    printed_warnings.add(warning_msg)
-    
-                    else:           ## 0 or more than 2 outputs
-                        warning_msg = f"AMALGAM_calc_FX ERROR: No output arguments from the function. Setting FX and Y to None."
-                        if warning_msg not in printed_warnings:
-                            print(warning_msg)
-                            printed_warnings.add(warning_msg)
- 
-                elif isinstance(worker_result, tuple):      ## This is when N = DREAMPar['CPU']
-                    if nvar == 2:    ## 2 outputs, FX and Y
-                        fx, y = worker_result
-                        if options['modout'] == 'no':
-                            warning_msg = f"AMALGAM_calc_FX WARNING: Did not expect two output arguments from the function. Setting Y to None as options['modout'] == 'no'."
-                            y = []
-                            if warning_msg not in printed_warnings:
-                                print(warning_msg)
-                                printed_warnings.add(warning_msg)
- 
-                    elif nvar == 1:  ## 1 output, FX
-                        fx = worker_result
-                        y = []
-                        if options['modout'] == 'yes':
-                            warning_msg = f"AMALGAM_calc_FX WARNING: Did not expect one output argument from the function as options['modout'] == 'yes'. Setting Y to None"
-                            if warning_msg not in printed_warnings:
-                                print(warning_msg)
-                                printed_warnings.add(warning_msg)
-
-                    else:           ## 0 or more than 2 outputs
-                        warning_msg = f"AMALGAM_calc_FX ERROR: No output arguments from the function. Setting FX and Y to None."
-                        if warning_msg not in printed_warnings:
-                            print(warning_msg)
-                            printed_warnings.add(warning_msg)
-
-                    if options['modout'] == 'yes':
-                        FX[ct, :] = fx.flatten()
-                        if ct == 0:
-                            Y = np.full((N,len(y)),np.nan)
-                        Y[ct, :] = y.flatten()
-                    else:
-                        FX[ct, :] = fx.flatten()
-                    # update counter        
-                    ct = ct + 1  
+        task_ranges = distribute_tasks(N, AMALGAMPar['CPU'], options['chunksize'])
+        pending = dict(task_ranges)         # Chunks not yet returned
+        # Watchdog: no chunk returned within t_max seconds means that workers hang
+        t_max = 2 * (options['retry'] + 1) * options['timeout'] * max(end_idx - start_idx for start_idx, end_idx in task_ranges)
+        t_max = t_max if np.isfinite(t_max) else None
+        T_wall, T_busy = time.time(), 0
+        # Workers write FX and Y rows in shared buffers if output signature of function is known
+        files = open_buffers(CPU_info, N, m)
+        results_it = CPU_info['pool'].imap_unordered(worker_chunk, [(start_idx, X[start_idx:end_idx, :], options['vectorized'],
+                                                     options['timeout'], options['retry'], files, abort) for start_idx, end_idx in task_ranges])
+        # Chunks return in order of completion: start_idx puts their rows back in order of X
+        for _ in task_ranges:
+            try:
+                start_idx, n, t_busy, n_retry, results = results_it.next(timeout=t_max)
+            except mp.TimeoutError:
+                # Terminate workers and open new pool: rows of chunks not returned have failed
+                CPU_info['pool'].terminate()
+                CPU_info['pool'] = open_pool(AMALGAMPar['CPU'], CPU_info['initargs'])
+                CPU_info['failed'][2] += 1
+                for start_idx, end_idx in pending.items():
+                    err = TimeoutError(f"AMALGAM_calc_FX: workers did not return result within {t_max} seconds")
+                    chunks.append((start_idx, end_idx - start_idx, 0, err if options['vectorized'] == 'yes' else [err] * (end_idx - start_idx)))
+                break
+            T_busy += t_busy
+            del pending[start_idx]
+            chunks.append((start_idx, n, n_retry, results))
+        # Idle time of workers = available time minus time spent evaluating chunks
+        T_wall = time.time() - T_wall
+        CPU_info['idle'] = [T_wall, AMALGAMPar['CPU'] * T_wall - T_busy]
+
+    # Unpack results of each chunk: failed evaluations are returned as exception, rows
+    # written to the shared buffers as None
+    for start_idx, n, n_retry, results in chunks:
+        if options['vectorized'] == 'yes':
+            blocks = [(start_idx, n, results)]                      # One block of n rows
+        else:
+            blocks = [(start_idx + ii, 1, result) for ii, result in enumerate(results)]
+        for idx, n_block, block in blocks:
+            if isinstance(block, Exception):
+                if options['failure'] == 'error':
+                    raise block
+                FX[idx:idx + n_block, :] = options['penalty']       # Penalty [= resampled by AMALGAM_resample]
+                status[idx:idx + n_block] = 1
+                if CPU_info is not None:
+                    CPU_info['failed'][0] += n_block
+                continue
+            if block is None:
+                fx, y = read_buffers(CPU_info['buffers'], idx, n_block)
+            else:
+                fx, y = unpack_FX_block(block, n_block, m, options, printed_warnings)
+                if CPU_info is not None and CPU_info['pool'] is not None and CPU_info['buffers'] is None:
+                    # Output signature of function detected once: allocate shared buffers
+                    CPU_info['buffers'] = {'m': m, 'n_Y': y.shape[1] if y is not None else 0, 'rows': 0}
+            FX[idx:idx + n_block, :] = fx
+            if abort is not None:                                   # Stopped early: dominated by rank 1 front
+                stopped = np.all(np.isposinf(fx), axis=1)
+                status[idx:idx + n_block][stopped] = 2
+                CPU_info['failed'][3] += np.sum(stopped)
+            if y is not None:
+                if Y is None:
+                    Y = np.full((N, y.shape[1]), np.nan)
+                Y[idx:idx + n_block, :] = y
+        if CPU_info is not None:
+            CPU_info['failed'][1] += n_retry
 
-        # If there is only one return value, unpack it directly
-        elif not isinstance(results, (tuple, list)):
-            FX = results
-            Y = None
-    
     if verbose:
         print("\nModel simulation ... done")
 
+    if store is not None:
+        # Add new evaluations to store and combine with rows found in store
+        store_add(store, X, FX, Y, status)
+        FX, Y = merge_FX(found, FX_store, Y_store, FX, Y)
+        status_new, status = status, np.zeros(len(found), dtype=int)
+        status[~found] = status_new
+
+    if cache is not None:
+        # Add new parameter vectors to cache and return FX, Y and status of all rows
+        FX, Y, status = cache_FX(cache, keys, list(id_new), FX, Y, status)
+
+    if CPU_info is not None:
+        CPU_info['status'] = status
+
+    return FX, Y
+
+
+def cache_keys(X, cache):
+    """
+    Key of each row of X in the cache: the bytes of the integer lattice index if
+    Par_info['steps'] is used, otherwise the bytes of the exact parameter vector.
+    """
+    if cache['step_size'] is not None:
+        X = np.round((X - cache['min']) / cache['step_size']).astype(np.int64)
+    else:
+        X = np.ascontiguousarray(X, dtype=float)
+
+    return [x.tobytes() for x in X]
+
+
+def cache_FX(cache, keys, keys_new, FX_new, Y_new, status_new):
+    """
+    Store FX_new and Y_new of the new keys in the (LRU) cache and return the objective
+    function values, simulations and status of all keys. Failed and stopped rows
+    [status_new > 0] are returned but not cached so that they are evaluated again.
+    The least recently used entries are removed if the cache holds more than
+    cache['size'] parameter vectors.
+    """
+    new = {}
+    for ii, key in enumerate(keys_new):
+        new[key] = (FX_new[ii, :], None if Y_new is None else Y_new[ii, :], status_new[ii])
+        if status_new[ii] == 0:
+            cache['data'][key] = new[key][:2]
+
+    N = len(keys)
+    FX = np.full((N, FX_new.shape[1]), np.nan)
+    Y = None
+    status = np.zeros(N, dtype=int)
+    for ii, key in enumerate(keys):
+        if key in new:
+            fx, y, status[ii] = new[key]
+        else:
+            fx, y = cache['data'][key]
+        if key in cache['data']:
+            cache['data'].move_to_end(key)      # Most recently used
+        FX[ii, :] = fx
+        if y is not None:
+            if Y is None:
+                Y = np.full((N, len(y)), np.nan)
+            Y[ii, :] = y
+
+    while len(cache['data']) > cache['size']:
+        cache['data'].popitem(last=False)       # Remove least recently used
+
+    return FX, Y, status
+
+
+def plugin_hash(obj, h = None):
+    """
+    SHA-1 hash of the content of plugin (NumPy arrays, dicts, lists, tuples and
+    scalars): runs with the same data share the evaluations in the store.
+    """
+    root = h is None
+    if root:
+        h = hashlib.sha1()
+    if isinstance(obj, np.ndarray) and obj.dtype != object:
+        h.update(f"ndarray{obj.dtype.str}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"dict")
+        for key in sorted(obj, key=str):
+            h.update(str(key).encode())
+            plugin_hash(obj[key], h)
+    elif isinstance(obj, (list, tuple)):
+        h.update(type(obj).__name__.encode())
+        for item in obj:
+            plugin_hash(item, h)
+    elif obj is None or isinstance(obj, (str, bytes, int, float, bool, np.generic)):
+        h.update(repr(obj).encode())
+    else:
+        h.update(pickle.dumps(obj))
+
+    return h.hexdigest() if root else None
+
+
+def store_FX(store, X):
+    """
+    Look up the rows of X in the evaluation store. Returns FX (nan if not found), Y
+    (None if options['modout'] == 'no') and boolean vector found of rows in the store.
+    """
+    N = X.shape[0]
+    FX = np.full((N, store['m']), np.nan)
+    Y = None
+    found = np.zeros(N, dtype=bool)
+    for ii in range(N):
+        row = store['con'].execute('SELECT fx, y FROM evaluations WHERE model = ? AND plugin = ? AND x = ?',
+                                   (store['model'], store['plugin'], np.ascontiguousarray(X[ii, :], dtype=float).tobytes())).fetchone()
+        if row is None or (store['modout'] == 'yes' and row[1] is None):
+            continue
+        FX[ii, :] = np.frombuffer(row[0], dtype=float)
+        if store['modout'] == 'yes':
+            y = np.frombuffer(row[1], dtype=float)
+            if Y is None:
+                Y = np.full((N, len(y)), np.nan)
+            Y[ii, :] = y
+        found[ii] = True
+
+    return FX, Y, found
+
+
+def store_add(store, X, FX, Y, status):
+    """
+    Append evaluations to the store in one transaction. Existing keys are never
+    overwritten. Failed and stopped rows [status > 0] and rows with non-finite
+    objective function values are not stored.
+    """
+    rows = [(store['model'], store['plugin'], np.ascontiguousarray(X[ii, :], dtype=float).tobytes(), FX[ii, :].astype(float).tobytes(),
+             None if Y is None else np.asarray(Y[ii, :], dtype=float).tobytes()) for ii in range(X.shape[0])
+            if status[ii] == 0 and np.all(np.isfinite(FX[ii, :]))]
+    if rows:
+        with store['con']:
+            store['con'].executemany('INSERT OR IGNORE INTO evaluations VALUES (?, ?, ?, ?, ?)', rows)
+
+
+def merge_FX(found, FX, Y, FX_new, Y_new):
+    """
+    Put FX_new and Y_new of the rows that were not found in the rows ~found of FX and Y.
+    """
+    FX[~found, :] = FX_new
+    if Y_new is not None:
+        if Y is None:
+            Y = np.full((len(found), Y_new.shape[1]), np.nan)
+        Y[~found, :] = Y_new
+
     return FX, Y
 
 
-def AMALGAM_end(AMALGAMPar, options, base_dir):
+def sims_add(sims, Y, N):
+    """
+    Append model simulations Y (N x n_Y) to the memory-mapped store and return their
+    rows in the store. The file grows by N rows so that memory use does not depend on
+    the number of generations. Failed evaluations [Y is None] are stored as nan rows,
+    or get row -1 if the length of the simulation is not known yet.
+    """
+    if sims is None:
+        return None
+    if Y is None:
+        if sims['n_Y'] == 0:
+            return np.full(N, -1)
+        Y = np.full((N, sims['n_Y']), np.nan)
+    rows, sims['n_Y'] = sims['rows'], Y.shape[1]
+    sims['Y'] = None                                # Unmap before the file is resized
+    if rows == 0:
+        Y_map = np.memmap(sims['file'], dtype=np.float64, mode='w+', shape=(N, sims['n_Y']))
+    else:
+        with open(sims['file'], 'r+b') as f:
+            f.truncate((rows + N) * sims['n_Y'] * np.dtype(np.float64).itemsize)
+        Y_map = np.memmap(sims['file'], dtype=np.float64, mode='r+', shape=(rows + N, sims['n_Y']))
+    Y_map[rows:rows + N, :] = Y
+    Y_map.flush()
+    sims['Y'], sims['rows'] = Y_map, rows + N
+
+    return np.arange(rows, rows + N)
+
+
+def sims_load(sims, iY, keep = True):
+    """
+    Returns the simulations of rows iY of the store (nan for row -1) and all rows of
+    the store [= output['Y']]: a read-only memory map if keep, otherwise a copy in
+    memory as the file is removed by AMALGAM_end.
+    """
+    if sims['rows'] == 0:
+        return None, None
+    Y = np.memmap(sims['file'], dtype=np.float64, mode='r', shape=(sims['rows'], sims['n_Y']))
+    YX = np.where(iY[:, None] >= 0, Y[np.maximum(iY, 0), :], np.nan)
+
+    return YX, Y if keep else np.array(Y)
+
+
+def unpack_FX_block(results, n, m, options, printed_warnings):
+    """
+    Unpack the return argument(s) of a vectorized function for a block of n parameter vectors.
+
+    Parameters:
+    results : np.ndarray, tuple or list
+        Output of func_handle: FX (n x m) or (FX, Y) with Y (n x n_Y) the model simulations.
+    n : int
+        Number of parameter vectors (rows) evaluated by func_handle.
+    m : int
+        Number of objective functions.
+    options : dict
+        Dictionary with options; 'modout' determines whether Y is returned.
+    printed_warnings : set
+        Warnings already printed to screen.
+
+    Returns:
+    FX : np.ndarray
+        Objective function values (n x m).
+    Y : np.ndarray or None
+        Model simulations (n x n_Y) if options['modout'] == 'yes', otherwise None.
+    """
+    if isinstance(results, (tuple, list)):
+        fx = results[0]
+        y = results[1] if len(results) > 1 else None
+    else:
+        fx, y = results, None
+
+    fx = np.asarray(fx, dtype=float)
+    if fx.size != n * m:
+        raise ValueError(f"AMALGAM ERROR: Vectorized function returned {fx.size} objective function values: expected a {n} x {m} matrix")
+    FX = fx.reshape(n, m)
+
+    if options['modout'] == 'yes':
+        if y is None:
+            warning_msg = f"AMALGAM_calc_FX WARNING: Did not expect one output argument from the function as options['modout'] == 'yes'. Setting Y to None"
+            if warning_msg not in printed_warnings:
+                print(warning_msg)
+                printed_warnings.add(warning_msg)
+            return FX, None
+        y = np.asarray(y, dtype=float)
+        if y.ndim == 1 or y.shape[0] != n:
+            y = y.reshape(n, -1)        # One row of simulations for each parameter vector
+        return FX, y
+    elif y is not None:
+        warning_msg = f"AMALGAM_calc_FX WARNING: Did not expect two output arguments from the function. Setting Y to None as options['modout'] == 'no'."
+        if warning_msg not in printed_warnings:
+            print(warning_msg)
+            printed_warnings.add(warning_msg)
+
+    return FX, None
+
+
+def AMALGAM_end(AMALGAMPar, options, base_dir, CPU_info):
     """
     Finalizes the AMALGAM process, closes workers, deletes worker directories, 
     and writes the final warning message to a file.
@@ -1478,15 +2697,47 @@ def AMALGAM_end(AMALGAMPar, options, base_dir):
         Contains the parameters, specifically the CPU count.
     options : dict
         Contains options such as IO operations.
+    CPU_info : dict
+        Computational environment with the pool of workers to close.
     """
     # Close workers if there are multiple CPUs
     if AMALGAMPar['CPU'] > 1:
-        # Close parallel pool: check in Python
-        pass
-
-        if options['IO'] == 'yes':  # If IO writing is enabled, remove directories
-            # Step 3: Clean up (delete) the worker directories after all generations are done
-            cleanup_worker_directories(base_dir, AMALGAMPar['CPU'])
+        # Close parallel pool: workers finish and exit
+        if CPU_info['pool'] is not None:
+            CPU_info['pool'].close()
+            CPU_info['pool'].join()
+            CPU_info['pool'] = None
+        # Remove memory-mapped plugin arrays and result buffers of the workers
+        CPU_info['buffers'] = None
+        if CPU_info['plugin_dir'] is not None:
+            shutil.rmtree(CPU_info['plugin_dir'], ignore_errors=True)
+            CPU_info['plugin_dir'] = None
+
+    # Shut down thread pool of options['backend'] = 'thread'; a user-supplied executor is left open
+    if CPU_info['executor'] is not None:
+        if options['backend'] == 'thread':
+            CPU_info['executor'].shutdown(wait=False, cancel_futures=True)
+        CPU_info['executor'] = None
+
+    # Stop workers of broker and close its listener
+    if CPU_info['broker'] is not None:
+        broker_close(CPU_info['broker'])
+        CPU_info['broker'] = None
+
+    if options['IO'] == 'yes' and base_dir is not None:  # If IO writing is enabled, remove directories
+        # Step 3: Clean up (delete) the worker directories after all generations are done
+        cleanup_worker_directories(base_dir, AMALGAMPar['CPU'])
+
+    # Close evaluation store
+    if CPU_info['store'] is not None:
+        CPU_info['store']['con'].close()
+        CPU_info['store'] = None
+
+    # Unmap store of model simulations: file is kept for a restart if options.save = 'yes'
+    if CPU_info['sims'] is not None:
+        CPU_info['sims']['Y'] = None
+        if options['save'] != 'yes' and os.path.exists(CPU_info['sims']['file']):
+            os.remove(CPU_info['sims']['file'])
 
     # Open the warning_file.txt file in append mode
     with open('warning_file.txt', 'a+') as fid:
@@ -1827,6 +3078,20 @@ def AMALGAM_postproc(AMALGAMPar, Par_info, options, X, FX, output, Fpareto=None,
             pdf.savefig()        
             plt.show()
 
+        ### Plot convergence to Pareto distribution: hypervolume
+        if 'HV' in output and np.any(np.isfinite(output['HV'][:, 1])):
+            plt.figure(figsize=(15, 6))
+            plt.plot(output['HV'][:, 0], output['HV'][:, 1], 'r')
+            plt.xlabel('Number of generations', fontsize=fontsize_xylabel)
+            plt.ylabel('Hypervolume, HV', fontsize=fontsize_xylabel)
+            plt.title('AMALGAM: Evolution of hypervolume of population', fontsize=fontsize_title)
+            plt.xlim(0, AMALGAMPar['T'])             
+            plt.gca().xaxis.set_major_locator(MaxNLocator(integer=True))
+            plt.grid(True)
+            plt.tight_layout()
+            pdf.savefig()        
+            plt.show()
+
         ### Plot the normalized Pareto parameter solutions
         fig, ax = plt.subplots(figsize=(15, 8))
         Nrank = X1.shape[0]  # Number of rank 1 solutions
@@ -1918,7 +3183,10 @@ def AMALGAM_postproc(AMALGAMPar, Par_info, options, X, FX, output, Fpareto=None,
             plt.show()
 
         # Plot the distribution of each parameter
-        id = rank_Z(Z, AMALGAMPar, options)
+        if 'pareto' in output:                  # Online archive of rank 1 rows of Z
+            id = output['pareto']
+        else:
+            id = rank_Z(Z, AMALGAMPar, options)
         XZ1 = Z[id, :AMALGAMPar['d']]
 
         ### Marginal distributions of Pareto parameter (rank 1) solutions [includes past generations]
@@ -2041,35 +3309,108 @@ def convert_memoryview_to_array(plugin):
 
 def distance(FQ, RQ, options):
     # ####################################################################### #
-    # Computes distance (crowding distance or strength Pareto) for points     #
+    # Computes distance (crowding, strength Pareto or hypervolume) for points #
     # ####################################################################### #
 
     M, m = FQ.shape
     if options['density'] == 'crowding':
-        dQ = np.full(M, np.nan)
-        for j in range(1, np.max(RQ) + 1):
-            id_rank_j = (RQ == j)
-            FQ_rank_j = FQ[id_rank_j]
-            N_s = np.sum(id_rank_j)
-            Cr_d = np.zeros(N_s)
-            for i in range(m):
-                sorted_values = np.sort(FQ_rank_j[:, i])
-                sorted_idx = np.argsort(FQ_rank_j[:, i])
-                Cr_d[sorted_idx[[0, N_s - 1]]] = np.inf
-                for z in range(1, N_s - 1):
-                    Cr_d[sorted_idx[z]] += sorted_values[z + 1] - sorted_values[z - 1]
-            dQ[id_rank_j] = Cr_d
+        dQ = crowding_distance(FQ, RQ)
     elif options['density'] == 'strength':
-        n_dom = np.zeros(M)
-        for j in range(M):
-            n_dom[j] = np.sum(np.all(FQ[j] < FQ, axis=1))
-        dQ = M / n_dom  # Higher n_dom means lower strength (more crowded)
+        dQ = strength_density(FQ)
+    elif options['density'] == 'hypervolume':
+        dQ = hv_density(FQ, RQ)
     else:
         raise ValueError("Distance: Unknown density estimation method")
 
     return dQ
 
 
+def crowding_distance(FQ, RQ):
+    """
+    Crowding distance of NSGA-II of all fronts at once: for each objective the rows are
+    sorted by rank and objective function value, the first and last row of each front
+    get an infinite distance and the others the distance between their neighbours,
+    normalized by the range of the objective in the front. Zero ranges and distances
+    of infinite objective function values [= failed or aborted] contribute zero.
+    """
+    M, m = FQ.shape
+    Cr_d = np.zeros(M)
+    edge = np.zeros(M, dtype=bool)
+    for i in range(m):
+        order = np.lexsort((FQ[:, i], RQ))              # Sort by rank, then objective i
+        R_s, F_s = RQ[order], FQ[order, i]
+        first = np.r_[True, R_s[1:] != R_s[:-1]]        # First and last row of each front
+        last = np.r_[R_s[1:] != R_s[:-1], True]
+        mid = ~(first | last)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            F_range = (F_s[last] - F_s[first])[np.cumsum(first) - 1]
+            d = (F_s[2:] - F_s[:-2])[mid[1:-1]] / F_range[mid]
+        Cr_d[order[mid]] += np.where(np.isfinite(d), d, 0)
+        edge[order[first | last]] = True
+    Cr_d[edge] = np.inf
+
+    return Cr_d
+
+
+def Update_archive(AMALGAMPar, Z, id_Z1, id_new):
+    """
+    Online archive of the non-dominated [rank 1] rows of Z [= output['pareto']]. The
+    rows id_new just added to Z are compared with each other and with the unique
+    objective function values of the archive rows id_Z1; archive rows dominated by a
+    new row are removed. Returns the sorted indices of the rows of Z that are not
+    dominated by any other row of Z, the same rows as rank_Z without re-ranking Z.
+    """
+    d, m = AMALGAMPar['d'], AMALGAMPar['m']
+    F_new = Z[id_new, d:d + m]
+    F_u, inv = np.unique(Z[id_Z1, d:d + m], axis=0, return_inverse=True)   # Survivors of past populations repeat
+    D_uN, D_Nu = dominance_block(F_u, F_new)
+    keep_new = ~np.any(dominance_block(F_new, F_new)[0], axis=0) & ~np.any(D_uN, axis=0)
+    keep_Z1 = ~np.any(D_Nu, axis=1)[inv.reshape(-1)]
+
+    return np.concatenate([id_Z1[keep_Z1], id_new[keep_new]])
+
+
+def Update_eps_archive(AMALGAMPar, options, Z, XF):
+    """
+    Epsilon-dominance archive [Laumanns et al., 2002] of the rows of Z and the new rows XF
+    [d+m columns]. Objective space is divided in boxes of size options['epsilon'] and the
+    archive keeps at most one row per box, in boxes not dominated by another box: a new
+    row is rejected if its box is dominated, replaces the row in its own box if it
+    dominates it or is closer to the lower corner of the box, and removes the rows of
+    the boxes it dominates. The archive is bounded and each new row costs O(archive).
+    Rows with non-finite objective function values are not archived. Returns the archive
+    and the indices of the rows of Z and of XF that it contains.
+    """
+    d, m = AMALGAMPar['d'], AMALGAMPar['m']
+    n_Z = Z.shape[0]
+    F = np.vstack([Z[:, d:d + m], XF[:, d:d + m]])
+    alive = np.zeros(F.shape[0], dtype=bool)
+    alive[:n_Z] = True
+    with np.errstate(invalid='ignore'):
+        B = np.floor(F / options['epsilon'])            # Box of each row
+        dist = np.sum(((F - B * options['epsilon']) / options['epsilon'])**2, axis=1)  # Distance to lower corner
+    for i in range(n_Z, F.shape[0]):
+        if not np.all(np.isfinite(F[i])):
+            continue
+        id_A = np.where(alive)[0]
+        B_le, B_ge = np.all(B[id_A] <= B[i], axis=1), np.all(B[id_A] >= B[i], axis=1)
+        same = B_le & B_ge
+        if np.any(B_le & ~same):                        # Box of row i is dominated
+            continue
+        if np.any(same):                                # Row in same box
+            j = id_A[same][0]
+            i_dom = np.all(F[i] <= F[j]) and np.any(F[i] < F[j])
+            j_dom = np.all(F[j] <= F[i]) and np.any(F[j] < F[i])
+            if i_dom or (not j_dom and dist[i] < dist[j]):
+                alive[j], alive[i] = False, True
+            continue
+        alive[id_A[B_ge]] = False                       # Rows of boxes dominated by row i
+        alive[i] = True
+    id_Z, id_new = np.where(alive[:n_Z])[0], np.where(alive[n_Z:])[0]
+
+    return np.vstack([Z[id_Z, :d + m], XF[id_new, :d + m]]), id_Z, id_new
+
+
 def Update_PS(AMALGAMPar, Z, PS, FZ_min):
     # ####################################################################### #
     # Updates dictionary of Particle Swarm                                    #
@@ -2130,209 +3471,199 @@ def NSGA(AMALGAMPar, Par_info, X, FX, id, dX):
 
 
 def NSGA_crossover(AMALGAMPar, Par_info, X, FX, dX):
-    # Perform genetic selection and crossover
-    
-    div = AMALGAMPar['N'] // 2                              # Divide population size by 2
-    res = np.ceil(div - np.floor(div))                      # Handle uneven population size
+    # Perform genetic selection and crossover [compiled kernel if numba is installed]
     
+    n_pair = 2 * int(np.ceil(AMALGAMPar['N'] / 4))          # Two pairs of parents per four children
     a1 = np.random.permutation(AMALGAMPar['N'])             # Random permutation for parents
     a2 = np.random.permutation(AMALGAMPar['N'])
     
-    # Adjust indices if population size is odd
-    a1 = np.concatenate([a1, a1[:int(res)]])
-    a2 = np.concatenate([a2, a2[:int(res)]])
-    
-    G = []                                                  # List to store offspring
-    ct = 0
+    # Pair p: tournaments a[p] vs a[p+1] and a[p+2] vs a[p+3] with a = a1 (p even) or a2 (p odd)
+    p = np.arange(n_pair)[:, None]
+    idx = np.where(p % 2 == 0, np.take(a1, p + np.arange(4), mode='wrap'), np.take(a2, p + np.arange(4), mode='wrap'))
     
-    # Perform tournament selection and crossover
-    while len(G) < AMALGAMPar['N']:
-        for j in range(2):
-            if j == 0:
-                a_1, a_2, a_3, a_4 = a1[ct], a1[ct + 1], a1[ct + 2], a1[ct + 3]
-            else:
-                a_1, a_2, a_3, a_4 = a2[ct], a2[ct + 1], a2[ct + 2], a2[ct + 3]
-            
-            parent1 = Tournament(AMALGAMPar, X[a_1], X[a_2], FX[a_1], FX[a_2], dX[a_1], dX[a_2])
-            parent2 = Tournament(AMALGAMPar, X[a_3], X[a_4], FX[a_3], FX[a_4], dX[a_3], dX[a_4])
-            
-            # Perform crossover between parents
-            child1, child2 = crossover(AMALGAMPar, Par_info, parent1, parent2)
-            
-            # Add children to offspring
-            G.extend([child1, child2])
-            ct += 1
+    # Random numbers of tournaments and crossover of all pairs: kernels return the same children
+    R_T = np.random.rand(n_pair, 2)                         # Tournament: ties of dominance and density
+    R_C = np.random.rand(n_pair, 3 * AMALGAMPar['d'] + 1)   # Crossover: p_CR, variables, spread, swap
+    G = SBX_kernel(np.ascontiguousarray(X[:, :AMALGAMPar['d']], dtype=float), np.ascontiguousarray(FX, dtype=float),
+                   np.ascontiguousarray(dX, dtype=float), idx, R_T, R_C, np.asarray(Par_info['min'][0, :AMALGAMPar['d']], dtype=float),
+                   np.asarray(Par_info['max'][0, :AMALGAMPar['d']], dtype=float), float(AMALGAMPar['p_CR']), float(AMALGAMPar['eta_C']))
     
     # Select first N individuals
-    G = np.array(G)[:AMALGAMPar['N'], :AMALGAMPar['d']]
+    G = G[:AMALGAMPar['N'], :AMALGAMPar['d']]
 
     return G
 
 
-def Tournament(AMALGAMPar, a, b, Fa, Fb, da, db):
-    # Perform tournament selection
-    
-    rnd = np.random.rand()
-    done = False
-    
-    flagout = Check_dominance(AMALGAMPar, Fa, Fb)
-    
-    if flagout == 1:
-        parent = a
-        done = True
-    elif flagout == -1:
-        parent = b
-        done = True
-    
-    if not done:
-        if da > db:
-            parent = a
-            done = True
-        elif da < db:
-            parent = b
-            done = True
-    
-    if not done:
-        if rnd <= 0.5:
-            parent = a
-        else:
-            parent = b
-    
-    return parent
+def SBX_offspring(X, FX, dX, idx, R_T, R_C, yl, yu, p_CR, eta_C):
+    """
+    Binary tournaments of parents idx[:, 0:2] and idx[:, 2:4] [dominance, then density
+    dX, then R_T] and simulated binary crossover of the winners with random numbers R_C.
+    NumPy version of SBX_loop: returns children 2p and 2p+1 of each pair p of parents.
+    """
+    n_pair, d = idx.shape[0], X.shape[1]
+    winners = []
+    for t in range(2):
+        a, b = idx[:, 2 * t], idx[:, 2 * t + 1]
+        f_a, f_b = np.any(FX[a] < FX[b], axis=1), np.any(FX[a] > FX[b], axis=1)
+        tie = (f_a == f_b) & ~(dX[a] > dX[b]) & ~(dX[a] < dX[b])
+        win_a = (f_a & ~f_b) | ((f_a == f_b) & (dX[a] > dX[b])) | (tie & (R_T[:, t] <= 0.5))
+        winners.append(np.where(win_a, a, b))
+    x1, x2 = X[winners[0]], X[winners[1]]
+    u_idx, u, u_swap = R_C[:, 1:d + 1], R_C[:, d + 1:2 * d + 1], R_C[:, 2 * d + 1:3 * d + 1]
+    y1, y2 = np.minimum(x1, x2), np.maximum(x1, x2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        alpha = 2.0 - np.power(1.0 + (2.0 * (y1 - yl) / ((y2 - y1) + 1e-10)), -(eta_C + 1.0))
+        lower, upper = u <= (1.0 / alpha), u > (1.0 / alpha)
+        betaq = np.where(lower, np.power(u * alpha, 1.0 / (eta_C + 1.0)), np.where(upper, np.power(1.0 / (2.0 - u * alpha), 1.0 / (eta_C + 1.0)), 1e-10))
+        g1 = 0.5 * ((y1 + y2) - betaq * (y2 - y1))
+        alpha = 2.0 - np.power(1.0 + (2.0 * (yu - y2) / ((y2 - y1) + 1e-10)), -(eta_C + 1.0))
+        betaq = np.where(lower, np.power(u * alpha, 1.0 / (eta_C + 1.0)), np.where(upper, np.power(1.0 / (2.0 - u * alpha), 1.0 / (eta_C + 1.0)), betaq))
+        g2 = 0.5 * ((y1 + y2) + betaq * (y2 - y1))
+    g1 = np.minimum(np.maximum(g1, yl), yu)                 # Bound children
+    g2 = np.minimum(np.maximum(g2, yl), yu)
+    g1 = np.where(u_swap <= 0.5, g2, g1)
+    keep = (np.abs(x1 - x2) <= np.finfo(float).eps) | (u_idx > 0.5)
+    g1, g2 = np.where(keep, x1, g1), np.where(keep, x2, g2)
+    no_CR = (R_C[:, 0] >= p_CR)[:, None]                    # No crossover: children are parents
+    G = np.empty((2 * n_pair, d))
+    G[0::2], G[1::2] = np.where(no_CR, x1, g1), np.where(no_CR, x2, g2)
 
+    return G
 
-def Check_dominance(AMALGAMPar, Fa, Fb):
-    # Check for dominance in multi-objective sense
-    
-    flag1, flag2 = 0, 0
-    
-    for qq in range(AMALGAMPar['m']):
-        if Fa[qq] < Fb[qq]:
-            flag1 = 1
-        elif Fa[qq] > Fb[qq]:
-            flag2 = 1
-    
-    delta = flag1 - flag2
-    flagout = -1
-    
-    if delta == 0:
-        flagout = 0
-    elif delta == 1:
-        flagout = 1
-    
-    return flagout
 
+def SBX_loop(X, FX, dX, idx, R_T, R_C, yl, yu, p_CR, eta_C):
+    # Loop version of SBX_offspring for numba: same children for same random numbers
+    n_pair, d, m = idx.shape[0], X.shape[1], FX.shape[1]
+    eps = np.finfo(np.float64).eps
+    G = np.empty((2 * n_pair, d))
+    parent = np.empty(2, dtype=np.int64)
+    for p in range(n_pair):
+        for t in range(2):
+            a, b = idx[p, 2 * t], idx[p, 2 * t + 1]
+            f_a, f_b = False, False
+            for k in range(m):
+                if FX[a, k] < FX[b, k]:
+                    f_a = True
+                elif FX[a, k] > FX[b, k]:
+                    f_b = True
+            if f_a and not f_b:
+                parent[t] = a
+            elif f_b and not f_a:
+                parent[t] = b
+            elif dX[a] > dX[b]:
+                parent[t] = a
+            elif dX[a] < dX[b]:
+                parent[t] = b
+            elif R_T[p, t] <= 0.5:
+                parent[t] = a
+            else:
+                parent[t] = b
+        for j in range(d):
+            x1, x2 = X[parent[0], j], X[parent[1], j]
+            g1, g2 = x1, x2
+            if R_C[p, 0] < p_CR and not (abs(x1 - x2) <= eps or R_C[p, 1 + j] > 0.5):
+                y1, y2 = min(x1, x2), max(x1, x2)
+                u = R_C[p, d + 1 + j]
+                alpha = 2.0 - (1.0 + (2.0 * (y1 - yl[j]) / ((y2 - y1) + 1e-10))) ** -(eta_C + 1.0)
+                lower, upper = u <= 1.0 / alpha, u > 1.0 / alpha
+                betaq = 1e-10
+                if lower:
+                    betaq = (u * alpha) ** (1.0 / (eta_C + 1.0))
+                elif upper:
+                    betaq = (1.0 / (2.0 - u * alpha)) ** (1.0 / (eta_C + 1.0))
+                g1 = 0.5 * ((y1 + y2) - betaq * (y2 - y1))
+                alpha = 2.0 - (1.0 + (2.0 * (yu[j] - y2) / ((y2 - y1) + 1e-10))) ** -(eta_C + 1.0)
+                if lower:
+                    betaq = (u * alpha) ** (1.0 / (eta_C + 1.0))
+                elif upper:
+                    betaq = (1.0 / (2.0 - u * alpha)) ** (1.0 / (eta_C + 1.0))
+                g2 = 0.5 * ((y1 + y2) + betaq * (y2 - y1))
+                if g1 < yl[j]:
+                    g1 = yl[j]
+                if g1 > yu[j]:
+                    g1 = yu[j]
+                if g2 < yl[j]:
+                    g2 = yl[j]
+                if g2 > yu[j]:
+                    g2 = yu[j]
+                if R_C[p, 2 * d + 1 + j] <= 0.5:
+                    g1 = g2
+            G[2 * p, j], G[2 * p + 1, j] = g1, g2
 
-def crossover(AMALGAMPar, Par_info, x1, x2):
-    # Perform crossover between two individuals
-    
-    if np.random.rand() < AMALGAMPar['p_CR']:
-        yl = Par_info['min'][0, :AMALGAMPar['d']]
-        yu = Par_info['max'][0, :AMALGAMPar['d']]
-        
-        rnd = np.random.rand(AMALGAMPar['d'])
-        idx = np.where(rnd > 0.5)[0]
-        idx_par = np.where(np.abs(x1 - x2) <= np.finfo(float).eps)[0]
-        
-        y1 = np.minimum(x1, x2)
-        y2 = np.maximum(x1, x2)
- 
-         # adjusted by JAV to avoid dividing by zero
-        # beta = 1.0 + (2.0 * (y1 - yl) / (y2 - y1))
-        beta = 1.0 + (2.0 * (y1 - yl) / ((y2 - y1) + 1e-10) )
+    return G
 
-        alpha = 2.0 - np.power(beta, -(AMALGAMPar['eta_C'] + 1.0))
-        
-        rnd = np.random.rand(AMALGAMPar['d'])
-        ii1 = np.where(rnd <= (1.0 / alpha))[0]
-        ii2 = np.where(rnd > (1.0 / alpha))[0]
-        
-        betaq = np.ones(AMALGAMPar['d']) * 1e-10
-        betaq[ii1] = np.power(rnd[ii1] * alpha[ii1], 1.0 / (AMALGAMPar['eta_C'] + 1.0))
-        betaq[ii2] = np.power(1.0 / (2.0 - rnd[ii2] * alpha[ii2]), 1.0 / (AMALGAMPar['eta_C'] + 1.0))
-        
-        g1 = 0.5 * ((y1 + y2) - betaq * (y2 - y1))
-        
-        # adjusted by JAV to avoid dividing by zero
-#        beta = 1.0 + (2.0 * (yu - y2) / (y2 - y1))
-        beta = 1.0 + (2.0 * (yu - y2) / ((y2 - y1) + 1e-10) )
-        alpha = 2.0 - np.power(beta, -(AMALGAMPar['eta_C'] + 1.0))
-        
-        betaq[ii1] = np.power(rnd[ii1] * alpha[ii1], 1.0 / (AMALGAMPar['eta_C'] + 1.0))
-        betaq[ii2] = np.power(1.0 / (2.0 - rnd[ii2] * alpha[ii2]), 1.0 / (AMALGAMPar['eta_C'] + 1.0))
-        
-        g2 = 0.5 * ((y1 + y2) + betaq * (y2 - y1))
-        
-        # Bound children
-        g1 = np.maximum(g1, yl)
-        g1 = np.minimum(g1, yu)
-        g2 = np.maximum(g2, yl)
-        g2 = np.minimum(g2, yu)
-        
-        rnd = np.random.rand(AMALGAMPar['d'])
-        
-        ii1 = np.where(rnd <= 0.5)[0]
-        ii2 = np.where(rnd > 0.5)[0]
-        
-        g1[ii1] = g2[ii1]
-        g2[ii1] = g1[ii1]
-        
-#        g1[ii2] = g1[ii2]
-#        g2[ii2] = g2[ii2]
-        
-        g1[idx_par] = x1[idx_par]
-        g2[idx_par] = x2[idx_par]
-        
-        g1[idx] = x1[idx]
-        g2[idx] = x2[idx]
 
-    else:
-        g1 = x1
-        g2 = x2
+def NSGA_mutate(AMALGAMPar, Par_info, G):
+    # Perform polynomial mutation [compiled kernel if numba is installed]
     
-    return g1, g2
+    R_1 = np.random.rand(AMALGAMPar['N'], AMALGAMPar['d'])     # Mutation of each variable
+    R_2 = np.random.rand(AMALGAMPar['N'], AMALGAMPar['d'])     # Variables that mutate: R_2 <= p_M
+    G = PM_kernel(np.ascontiguousarray(G, dtype=float), np.asarray(Par_info['min'][0, :AMALGAMPar['d']], dtype=float),
+                  np.asarray(Par_info['max'][0, :AMALGAMPar['d']], dtype=float), R_1, R_2, float(AMALGAMPar['eta_M']), float(AMALGAMPar['p_M']))
+    
+    return G
 
 
-def NSGA_mutate(AMALGAMPar, Par_info, G):
-    # Perform polynomial mutation
-    
-    delta1 = (G - Par_info['min']) / (Par_info['max'] - Par_info['min'])
-    delta2 = (Par_info['max'] - G) / (Par_info['max'] - Par_info['min'])
+def PM_offspring(G, lo, hi, R_1, R_2, eta_M, p_M):
+    # Polynomial mutation of G with random numbers R_1 and R_2 [NumPy version of PM_loop]
     
-    rnd = np.random.rand(AMALGAMPar['N'], AMALGAMPar['d'])
-    mut_pow = 1 / (AMALGAMPar['eta_M'] + 1)
+    delta1 = (G - lo) / (hi - lo)
+    delta2 = (hi - G) / (hi - lo)
+    mut_pow = 1 / (eta_M + 1)
 
     # Added by JAV
     xy = np.zeros(G.shape)
     val = np.zeros(G.shape)
     deltaq = np.zeros(G.shape)
 
-    idx = np.where(rnd <= 0.5)
-#    xy = 1 - delta1[idx]
+    idx = np.where(R_1 <= 0.5)
     xy[idx] = 1 - delta1[idx]
-#    val = 2 * rnd[idx] + (1 - 2 * rnd[idx]) * (xy ** (AMALGAMPar['eta_M'] + 1))
-    val[idx] = 2 * rnd[idx] + (1 - 2 * rnd[idx]) * (xy[idx] ** (AMALGAMPar['eta_M'] + 1))
-#    deltaq = val ** mut_pow - 1
+    val[idx] = 2 * R_1[idx] + (1 - 2 * R_1[idx]) * (xy[idx] ** (eta_M + 1))
     deltaq[idx] = val[idx] ** mut_pow - 1
     
-    idx = np.where(rnd > 0.5)
-#    xy = 1 - delta2[idx]
+    idx = np.where(R_1 > 0.5)
     xy[idx] = 1 - delta2[idx]
-#    val = 2 * (1 - rnd[idx]) + 2 * (rnd[idx] - 0.5) * (xy ** (AMALGAMPar['eta_M'] + 1))
-    val[idx] = 2 * (1 - rnd[idx]) + 2 * (rnd[idx] - 0.5) * (xy[idx] ** (AMALGAMPar['eta_M'] + 1))
-#    deltaq = 1 - val ** mut_pow
+    val[idx] = 2 * (1 - R_1[idx]) + 2 * (R_1[idx] - 0.5) * (xy[idx] ** (eta_M + 1))
     deltaq[idx] = 1 - val[idx] ** mut_pow
     
-    z = G + deltaq.reshape(AMALGAMPar['N'], AMALGAMPar['d']) * (Par_info['max'] - Par_info['min'])
-    
-    rnd = np.random.rand(AMALGAMPar['N'], AMALGAMPar['d'])
-    idx = np.where(rnd <= AMALGAMPar['p_M'])
+    z = G + deltaq * (hi - lo)
     
+    idx = np.where(R_2 <= p_M)
+    G = G.copy()
     G[idx] = z[idx]
     
     return G
 
 
+def PM_loop(G, lo, hi, R_1, R_2, eta_M, p_M):
+    # Loop version of PM_offspring for numba: same children for same random numbers
+    N, d = G.shape
+    mut_pow = 1 / (eta_M + 1)
+    Gn = G.copy()
+    for i in range(N):
+        for j in range(d):
+            if R_2[i, j] <= p_M:
+                r = R_1[i, j]
+                deltaq = 0.0
+                if r <= 0.5:
+                    xy = 1 - (G[i, j] - lo[j]) / (hi[j] - lo[j])
+                    deltaq = (2 * r + (1 - 2 * r) * xy ** (eta_M + 1)) ** mut_pow - 1
+                elif r > 0.5:
+                    xy = 1 - (hi[j] - G[i, j]) / (hi[j] - lo[j])
+                    deltaq = 1 - (2 * (1 - r) + 2 * (r - 0.5) * xy ** (eta_M + 1)) ** mut_pow
+                Gn[i, j] = G[i, j] + deltaq * (hi[j] - lo[j])
+
+    return Gn
+
+
+# Compiled NSGA-II operators if numba is installed [cached on disk], otherwise NumPy
+if numba is not None:
+    SBX_kernel = numba.njit(cache=True)(SBX_loop)
+    PM_kernel = numba.njit(cache=True)(PM_loop)
+else:
+    SBX_kernel, PM_kernel = SBX_offspring, PM_offspring
+
+
 def AM(AMALGAMPar, X, R, n, id):
     """
     Generate offspring using the adaptive Metropolis algorithm.
@@ -2812,7 +4143,7 @@ def rank_Z(Z, AMALGAMPar, options):
 
     if N <= Nrank:
         # Rank Z at once
-        R = AMALGAM_rank(Z, options)
+        R, _, _ = AMALGAM_rank(Z[:, d:d + m], options)
         id = np.where(R == 1)[0]
     else:
         # Take segments of Z
@@ -2904,11 +4235,23 @@ def Compute_FX_true(AMALGAMPar, Func_name, problem, M=500, plugin=None):
 
     options = {'restart': 'no',
                 'parallel': 'no',
-                'modout': 'no'}
+                'modout': 'no',
+                'vectorized': 'no',
+                'async': 'no',
+                'cache': 'no',
+                'store': 'no',
+                'timeout': np.inf,
+                'retry': 0,
+                'failure': 'error',
+                'penalty': np.inf,
+                'backend': 'process',
+                'concurrency': 100,
+                'abort': 'no',
+                'ranking': 'fast'}
     
     M = int(M)
     AMALGAMPar['d'] = int(AMALGAMPar['d'])
-    AMALGAMPar, func_handle, base_dir = AMALGAM_calc_setup(AMALGAMPar, Func_name, options, plugin)
+    AMALGAMPar, func_handle, base_dir, CPU_info = AMALGAM_calc_setup(AMALGAMPar, Func_name, options, plugin)
     AMALGAMPar['N'] = int(AMALGAMPar['N'])
     AMALGAMPar['m'] = int(AMALGAMPar['m']) 
     AMALGAMPar['T'] = int(AMALGAMPar['T'])
@@ -2939,7 +4282,7 @@ def Compute_FX_true(AMALGAMPar, Func_name, problem, M=500, plugin=None):
  
     printed_warnings = set()
     # Compute objective values (you need to define AMALGAM_calc_FX)
-    FX = AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, plugin, printed_warnings)[0]
+    FX = AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, plugin, printed_warnings, CPU_info)[0]
 
     # Get true Pareto front approximation (you need to define getF_true)
     FX_true = getF_true(FX, AMALGAMPar, 1, M)
@@ -3012,17 +4355,17 @@ def getF_true(FX, AMALGAMPar, N_f, M):
     return FX_true
 
 
-def distribute_tasks(N, CPU):
+def distribute_tasks(N, CPU, chunk_size = 'auto'):
     # ####################################################################### #
-    # Split the task ranges evenly across workers                             #
+    # Split the N rows in chunks that are handed out to workers on demand     #
+    # chunk_size = 'auto': about four chunks per worker                       #
     # ####################################################################### #
 
-    chunk_size = N // CPU
+    if chunk_size == 'auto':
+        chunk_size = max(1, int(np.ceil(N / (4 * CPU))))
     task_ranges = []
-    for i in range(CPU):
-        start_idx = i * chunk_size
-        # Ensure the last worker gets the remaining tasks
-        end_idx = N if i == CPU - 1 else (i + 1) * chunk_size
+    for start_idx in range(0, N, chunk_size):
+        end_idx = min(start_idx + chunk_size, N)
         task_ranges.append((start_idx, end_idx))
     return task_ranges
 
@@ -3062,6 +4405,348 @@ def get_function_handle(Func_name):
     return Func
 
 
+exe_readers = {}                # Readers of output files of AMALGAM_exe: name -> reader(file_name, x, plugin)
+exe_templates = {}              # Templates of AMALGAM_exe read by this process: file name -> string.Template
+
+
+def register_reader(name, reader = None):
+    """
+    Register reader(file_name, x, plugin) under name so that plugin['exe']['reader'] = name
+    parses the output file of the executable. The reader returns FX or (FX, Y). Can be
+    used as decorator: @register_reader('my_reader'). Register readers at import time
+    of the module of the user so that workers of the pool know them as well.
+    """
+    if reader is None:
+        return lambda reader: register_reader(name, reader)
+    exe_readers[name] = reader
+
+    return reader
+
+
+@register_reader('loadtxt')
+def read_loadtxt(file_name, x, plugin):
+    # Output file of model lists the objective function values (whitespace separated)
+    return np.loadtxt(file_name, ndmin=1).flatten()
+
+
+def AMALGAM_exe(x, plugin):
+    """
+    Built-in runner of an external model executable: use Func_name = 'AMALGAM_exe'.
+    The run takes place in the current directory, that is, the directory of the worker
+    if options['IO'] = 'yes'. This directory is reused by all generations.
+
+    Parameters:
+    x : np.ndarray
+        Parameter vector (size d).
+    plugin : dict
+        plugin['exe'] is a dictionary with fields
+        - 'command': list with executable and its arguments, e.g. ['./model', 'param.txt']
+        - 'template': dict {template file: parameter file}; string.Template placeholders
+          ${x1}, ..., ${xd} and, if 'names' is given, ${name} of each parameter
+        - 'names': (optional) list with d parameter names
+        - 'format': (optional) format of parameter values, default '.10g'
+        - 'output': output file of the executable, removed before each run
+        - 'reader': name of registered reader (default 'loadtxt') or callable reader(file_name, x, plugin)
+        - 'timeout': (optional) maximum run time of one evaluation in seconds
+
+    Returns:
+    FX : np.ndarray
+        Objective function values (size m).
+    Y : np.ndarray
+        Model simulations, only if returned by the reader.
+
+    Raises a RuntimeError if the executable cannot be started, fails (non-zero exit
+    code or no output file) or its output cannot be read, and a TimeoutError if it
+    does not finish within the timeout: options['retry'] and options['failure'] of
+    AMALGAM then decide what happens with the parameter vector.
+    """
+    exe = plugin['exe']
+
+    # Render parameter files from templates
+    fmt = exe.get('format', '.10g')
+    values = {f"x{ii + 1}": format(x[ii], fmt) for ii in range(len(x))}
+    if exe.get('names') is not None:
+        values.update({name: format(x[ii], fmt) for ii, name in enumerate(exe['names'])})
+    for tpl_file, par_file in exe.get('template', {}).items():
+        tpl_file = os.path.abspath(tpl_file)
+        if tpl_file not in exe_templates:
+            with open(tpl_file, 'r') as fid:
+                exe_templates[tpl_file] = string.Template(fid.read())
+        with open(par_file, 'w') as fid:
+            fid.write(exe_templates[tpl_file].substitute(values))
+
+    # Output of a previous run must not be read if this run fails
+    if os.path.exists(exe['output']):
+        os.remove(exe['output'])
+
+    # Run executable: own process group so that a hung model and its children are killed
+    try:
+        proc = subprocess.Popen(exe['command'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                start_new_session=(os.name == 'posix'))
+    except OSError as err:
+        raise RuntimeError(f"AMALGAM_exe: executable {exe['command']} could not be started: {err}") from err
+    try:
+        proc.wait(timeout=exe.get('timeout'))
+    except (subprocess.TimeoutExpired, TimeoutError) as err:
+        if os.name == 'posix':
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+        proc.wait()
+        if isinstance(err, TimeoutError):   # options['timeout'] of AMALGAM_calc_FX
+            raise
+        raise TimeoutError(f"AMALGAM_exe: executable did not finish within {exe['timeout']} seconds") from err
+    if proc.returncode != 0:
+        raise RuntimeError(f"AMALGAM_exe: executable returned exit code {proc.returncode}")
+    if not os.path.exists(exe['output']):
+        raise RuntimeError(f"AMALGAM_exe: executable did not write output file {exe['output']}")
+
+    # Parse output file
+    reader = exe.get('reader', 'loadtxt')
+    if not callable(reader):
+        reader = exe_readers[reader]
+    try:
+        return reader(exe['output'], x, plugin)
+    except Exception as err:
+        raise RuntimeError(f"AMALGAM_exe: output file {exe['output']} could not be read: {err}") from err
+
+
+worker_env = {}                 # Function handle, plugin and base directory of each worker of the pool
+
+
+def worker_init(func_handle, plugin, base_dir, id_queue):
+    """
+    Initializer of each worker of the pool: stores func_handle, plugin and base_dir
+    once so that these are not pickled and sent again with every task. The number
+    taken from id_queue is the directory worker_{id} used by this worker if base_dir is set.
+    """
+    worker_env['worker_id'] = id_queue.get()
+    worker_env['func_handle'] = func_handle
+    worker_env['plugin'] = attach_plugin(plugin)
+    worker_env['base_dir'] = base_dir
+
+
+def share_plugin(obj, plugin_dir):
+    """
+    Write each NumPy array of plugin (also in nested dicts, lists and tuples) to a
+    .npy file in plugin_dir and replace it by a reference to this file. The pool
+    then pickles only the file names; attach_plugin restores the arrays in the workers.
+    """
+    if isinstance(obj, np.ndarray) and obj.dtype != object and obj.size > 0:
+        file_name = os.path.join(plugin_dir, f"array_{len(os.listdir(plugin_dir))}.npy")
+        np.save(file_name, obj)
+        return {'__AMALGAM_memmap__': file_name}
+    elif isinstance(obj, dict):
+        return {key: share_plugin(value, plugin_dir) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [share_plugin(item, plugin_dir) for item in obj]
+    elif isinstance(obj, tuple):
+        return tuple(share_plugin(item, plugin_dir) for item in obj)
+    else:
+        return obj
+
+
+def attach_plugin(obj):
+    """
+    Replace the file references of share_plugin by read-only memory-mapped arrays:
+    all workers read the same pages of the file and no array is copied.
+    """
+    if isinstance(obj, dict):
+        if '__AMALGAM_memmap__' in obj:
+            return np.asarray(np.load(obj['__AMALGAM_memmap__'], mmap_mode='r'))
+        return {key: attach_plugin(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [attach_plugin(item) for item in obj]
+    elif isinstance(obj, tuple):
+        return tuple(attach_plugin(item) for item in obj)
+    else:
+        return obj
+
+
+broker_heartbeat = 2.0          # Seconds between heartbeats of workers of broker; silent for 3 periods = dead
+broker_wait = 60.0              # Seconds broker waits without any connected worker before it gives up
+broker_local = ['', 'localhost', '127.0.0.1', '::1']    # Hosts of broker that only accept local workers
+
+
+def broker_open(address, setup, base_dir = None):
+    """
+    Open listener of the broker at address 'host:port' (port 0 = any free port;
+    no host = localhost). Workers that connect are authenticated with the key of
+    environment variable AMALGAM_AUTHKEY and receive setup = (func_handle, plugin)
+    once. Messages are pickled, so a broker at a non-local host requires this key;
+    otherwise a random key is used that is handed to the local workers only.
+    broker['address'] is the address workers connect to [with the port bound].
+    """
+    host, _, port = address.rpartition(':')
+    if os.environ.get('AMALGAM_AUTHKEY'):
+        authkey = os.environ['AMALGAM_AUTHKEY'].encode()
+    elif host in broker_local:
+        authkey = secrets.token_bytes(32)
+    else:
+        raise ValueError(f"AMALGAM ERROR: Broker at non-local address {address} requires a secret key in environment variable AMALGAM_AUTHKEY")
+    listener = mp.connection.Listener((host or 'localhost', int(port)), authkey=authkey)
+    broker = {'listener': listener, 'new': queue.Queue(), 'workers': {}, 'procs': [], 'setup': setup, 'authkey': authkey, 'base_dir': base_dir,
+              'address': f"{'localhost' if host in ['', '0.0.0.0'] else host}:{listener.address[1]}"}
+
+    def accept():
+        # Accept workers until listener is closed
+        while True:
+            try:
+                broker['new'].put(listener.accept())
+            except mp.AuthenticationError:
+                continue
+            except OSError:
+                return
+
+    threading.Thread(target=accept, daemon=True).start()
+
+    return broker
+
+
+def broker_spawn(broker, worker_id):
+    # Start local stand-in worker_id of remote workers [or replace the one that hung]
+    proc = mp.Process(target=AMALGAM_worker, args=(broker['address'], broker['authkey'], broker['base_dir'], worker_id), daemon=True)
+    proc.start()
+    if worker_id < len(broker['procs']):
+        broker['procs'][worker_id] = proc
+    else:
+        broker['procs'].append(proc)
+
+
+def broker_evaluate(broker, tasks, t_max = np.inf):
+    """
+    Hand out tasks {task_id: task of worker_chunk} to the workers of the broker and
+    return {task_id: result of worker_chunk}. The task of a worker that disconnects
+    or misses heartbeats is reassigned; a task not returned within t_max seconds is
+    a TimeoutError and its worker is dropped: a local stand-in is killed and started
+    again. Raises a RuntimeError if no worker is connected for broker_wait seconds.
+    """
+    workers, pending, done = broker['workers'], list(tasks), {}
+    T_alone = time.time()                   # Time since which no worker is connected
+
+    def drop(conn):
+        task_id = workers.pop(conn)['task']
+        if task_id is not None and task_id not in done:
+            pending.insert(0, task_id)
+        conn.close()
+
+    while len(done) < len(tasks):
+        # Register new workers: send func_handle and plugin once
+        while not broker['new'].empty():
+            conn = broker['new'].get_nowait()
+            try:
+                conn.send(('setup',) + broker['setup'])
+            except OSError:
+                conn.close()
+                continue
+            workers[conn] = {'task': None, 'seen': time.time(), 'start': None, 'pid': None}
+        # All workers have died or none have connected
+        if workers:
+            T_alone = time.time()
+        elif time.time() - T_alone > broker_wait:
+            raise RuntimeError(f"AMALGAM_calc_FX: no worker connected to broker at {broker['address']} for {broker_wait} seconds")
+        # Send pending tasks to idle workers
+        for conn, worker in list(workers.items()):
+            if worker['task'] is None and pending:
+                worker['task'], worker['start'] = pending.pop(0), time.time()
+                try:
+                    conn.send(('task', worker['task'], tasks[worker['task']]))
+                except OSError:
+                    drop(conn)
+        # Collect results and heartbeats
+        for conn in mp.connection.wait(list(workers), timeout=broker_heartbeat):
+            try:
+                msg = conn.recv()
+            except (EOFError, OSError):
+                drop(conn)
+                continue
+            workers[conn]['seen'] = time.time()
+            if msg[0] == 'result':
+                done.setdefault(msg[1], msg[2])
+                workers[conn]['task'] = None
+            elif msg[0] == 'hello':             # Host and process id of worker
+                workers[conn]['pid'] = msg[1:]
+        # Drop workers without heartbeat and workers whose task exceeds t_max
+        for conn, worker in list(workers.items()):
+            if worker['task'] is not None and time.time() - worker['start'] > t_max:
+                done[worker['task']] = TimeoutError(f"AMALGAM_calc_FX: worker did not return result within {t_max} seconds")
+                drop(conn)
+                for worker_id, proc in enumerate(broker['procs']):
+                    if (platform.node(), proc.pid) == worker['pid']:    # Local stand-in: kill and start a new one
+                        proc.kill()
+                        proc.join()
+                        broker_spawn(broker, worker_id)
+            elif time.time() - worker['seen'] > 3 * broker_heartbeat:
+                drop(conn)
+
+    return done
+
+
+def broker_close(broker):
+    # Stop workers, close listener and wait for local workers
+    for conn in list(broker['workers']):
+        try:
+            conn.send(('stop',))
+        except OSError:
+            pass
+        conn.close()
+    broker['listener'].close()
+    for proc in broker['procs']:
+        proc.join(timeout=5)
+        if proc.is_alive():                 # Also ends a stopped or hung worker
+            proc.kill()
+            proc.join()
+
+
+def AMALGAM_worker(address, authkey = None, base_dir = None, worker_id = 0):
+    """
+    Worker of the broker of options['parallel'] = 'broker': connects to address
+    'host:port', receives func_handle and plugin once and evaluates chunks of
+    rows of X until the broker stops. Start on each remote node with e.g.
+
+        python -c "from AMALGAM_functions import AMALGAM_worker; AMALGAM_worker('host:6000')"
+
+    with the same environment variable AMALGAM_AUTHKEY as the broker and the
+    module of Func_name on the Python path.
+    """
+    host, _, port = address.rpartition(':')
+    if authkey is None:
+        if not os.environ.get('AMALGAM_AUTHKEY'):
+            raise ValueError("AMALGAM ERROR: AMALGAM_worker requires the secret key of the broker in environment variable AMALGAM_AUTHKEY")
+        authkey = os.environ['AMALGAM_AUTHKEY'].encode()
+    conn = mp.connection.Client((host, int(port)), authkey=authkey)
+    conn.send(('hello', platform.node(), os.getpid()))
+    lock, stop = threading.Lock(), threading.Event()
+
+    def heartbeat():
+        # Tell broker this worker is alive, also during long model runs
+        while not stop.wait(broker_heartbeat):
+            try:
+                with lock:
+                    conn.send(('heartbeat',))
+            except OSError:
+                return
+
+    threading.Thread(target=heartbeat, daemon=True).start()
+    worker_env.update({'worker_id': worker_id, 'base_dir': base_dir, 'func_handle': None, 'plugin': None})
+    try:
+        while True:
+            msg = conn.recv()
+            if msg[0] == 'setup':
+                worker_env['func_handle'], worker_env['plugin'] = msg[1], msg[2]
+            elif msg[0] == 'task':
+                result = worker_chunk(msg[2])
+                with lock:
+                    conn.send(('result', msg[1], result))
+            elif msg[0] == 'stop':
+                break
+    except (EOFError, OSError):
+        pass
+    finally:
+        stop.set()
+        conn.close()
+
+
 def worker(ii, func_handle, X, plugin=None):
 
     if plugin is not None:
@@ -3111,26 +4796,214 @@ def copy_model_files(source_dir, target_dir):
             shutil.copytree(source_file, target_file)  # Copy directory recursively
 
 
-def worker_task(worker_id, start_idx, end_idx, X, func_handle, plugin, base_dir):
-    
+def open_pool(CPU, initargs):
+    """
+    Open a pool of CPU workers with initializer worker_init. Each worker takes a number
+    from id_queue: its own directory worker_{id} if options['IO'] = 'yes'.
+    """
+    id_queue = mp.Queue()
+    for worker_id in range(CPU):
+        id_queue.put(worker_id)
+
+    return mp.Pool(processes=CPU, initializer=worker_init, initargs=(*initargs, id_queue))
+
+
+@contextlib.contextmanager
+def time_limit(timeout):
+    """
+    Raise TimeoutError if the body of the with statement takes more than timeout seconds.
+    Uses SIGALRM, thus only in the main thread on POSIX systems; elsewhere the watchdog
+    of AMALGAM_calc_FX ends evaluations that hang.
+    """
+    if not np.isfinite(timeout):
+        yield
+        return
+    if not hasattr(signal, 'SIGALRM') or threading.current_thread() is not threading.main_thread():
+        warnings.warn(f"AMALGAM WARNING: timeout of {timeout} seconds not enforced: SIGALRM is not available in this thread", RuntimeWarning)
+        yield
+        return
+
+    def handler(signum, frame):
+        raise TimeoutError(f"Evaluation did not finish within {timeout} seconds")
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def evaluate_rows(func_handle, X, plugin, vectorized = 'no', timeout = np.inf, retry = 0, abort = None):
+    """
+    Evaluate each row of X (or X in one call if vectorized) with at most retry + 1 attempts.
+    An evaluation that raises an exception or exceeds timeout seconds returns the exception
+    instead of its result. Returns the results and the number of retries. The dominance
+    check abort (if not None) is passed to func_handle as keyword argument.
+    """
+    args = (plugin,) if plugin is not None else ()
+    kwargs = {'abort': abort} if abort is not None else {}
+    blocks = [X] if vectorized == 'yes' else [X[idx, :] for idx in range(X.shape[0])]
+    results, n_retry = [], 0
+    for x in blocks:
+        for attempt in range(retry + 1):
+            try:
+                with time_limit(timeout):
+                    result = func_handle(x, *args, **kwargs)
+                break
+            except Exception as err:
+                result = err
+                if attempt < retry:
+                    n_retry += 1
+        results.append(result)
+
+    return (results[0] if vectorized == 'yes' else results), n_retry
+
+
+def worker_chunk(task):
+    # Evaluate one chunk of rows of X [= task of pool] and return its busy time
+    start_idx, X, vectorized, timeout, retry, files, abort = task
+    t_busy = time.time()
+    results, n_retry = worker_task(X, vectorized, timeout, retry, abort)
+    if files is not None:
+        # Write FX and Y in rows start_idx, ... of shared buffers: only exceptions are returned
+        results = write_buffers(results, start_idx, X.shape[0], vectorized, files)
+
+    return start_idx, X.shape[0], time.time() - t_busy, n_retry, results
+
+
+def dominated(F_front, F):
+    """
+    Early abort check passed to func_handle [functools.partial with F_front = rank 1 FX].
+    Returns True if objective function values F (1 x m, or a lower bound computed from
+    part of the simulation) are dominated by a member of F_front; one value per row if
+    F is a matrix [vectorized function].
+    """
+    F2 = np.atleast_2d(F)
+    weak = np.all(F_front[:, None, :] <= F2[None, :, :], axis=2)
+    strict = np.any(F_front[:, None, :] < F2[None, :, :], axis=2)
+    is_dom = np.any(weak & strict, axis=0)
+
+    return is_dom if np.ndim(F) == 2 else bool(is_dom[0])
+
+
+async def evaluate_async(func_handle, X, plugin, vectorized = 'no', timeout = np.inf, retry = 0, concurrency = 100, abort = None):
+    """
+    Coroutine counterpart of evaluate_rows: await func_handle for each row of X (or X
+    at once if vectorized) with at most concurrency evaluations at the same time.
+    Returns a list with (result or exception, number of retries) of each evaluation.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    args = (plugin,) if plugin is not None else ()
+    kwargs = {'abort': abort} if abort is not None else {}
+
+    async def evaluate(x):
+        n_retry = 0
+        async with semaphore:
+            for attempt in range(retry + 1):
+                try:
+                    return await asyncio.wait_for(func_handle(x, *args, **kwargs), timeout if np.isfinite(timeout) else None), n_retry
+                except Exception as err:
+                    result = err
+                    if attempt < retry:
+                        n_retry += 1
+        return result, n_retry
+
+    blocks = [X] if vectorized == 'yes' else [X[idx, :] for idx in range(X.shape[0])]
+    return await asyncio.gather(*(evaluate(x) for x in blocks))
+
+
+def run_coroutine(coro):
+    # Run coro on a new event loop; in a thread if this thread already runs a loop [e.g. Jupyter]
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def executor_chunk(func_handle, plugin, task):
+    # Task of executor of options['backend']: evaluate one chunk of rows of X and return its busy time
+    start_idx, X, vectorized, timeout, retry, abort = task
+    t_busy = time.time()
+    results, n_retry = evaluate_rows(func_handle, X, plugin, vectorized, timeout, retry, abort)
+
+    return start_idx, X.shape[0], time.time() - t_busy, n_retry, results
+
+
+def open_buffers(CPU_info, n, m):
+    """
+    Return the files of the memory-mapped buffers in which workers write the objective
+    function values (n x m) and model simulations (n x n_Y) of their rows. The buffers
+    are allocated in CPU_info['plugin_dir'] once the output signature of the function
+    is known (first evaluation) and grow if a call has more than n rows.
+    Returns None if the signature is not yet known: workers then return their results.
+    """
+    buffers = CPU_info['buffers']
+    if buffers is None:
+        return None
+    if n > buffers['rows']:
+        buffers['rows'] = n
+        buffers['files'] = {'FX': os.path.join(CPU_info['plugin_dir'], f"FX_{n}.npy"),
+                            'Y': os.path.join(CPU_info['plugin_dir'], f"Y_{n}.npy") if buffers['n_Y'] > 0 else None}
+        buffers['FX'] = np.lib.format.open_memmap(buffers['files']['FX'], mode='w+', shape=(n, buffers['m']))
+        buffers['Y'] = None
+        if buffers['files']['Y'] is not None:
+            buffers['Y'] = np.lib.format.open_memmap(buffers['files']['Y'], mode='w+', shape=(n, buffers['n_Y']))
+
+    return buffers['files']
+
+
+def read_buffers(buffers, idx, n):
+    # Copy of FX and Y of rows idx, ..., idx + n - 1 written by the workers
+    FX = np.array(buffers['FX'][idx:idx + n, :])
+    Y = np.array(buffers['Y'][idx:idx + n, :]) if buffers['Y'] is not None else None
+
+    return FX, Y
+
+
+def write_buffers(results, start_idx, n, vectorized, files):
+    """
+    Worker side of open_buffers: write FX (and Y) of each result in the shared buffers
+    and replace the result by None. Exceptions and results that do not match the
+    buffers are returned unchanged and unpacked by AMALGAM_calc_FX.
+    """
+    if worker_env.get('files') != files:
+        worker_env['files'] = files
+        worker_env['buffers'] = {key: np.load(file, mmap_mode='r+') if file is not None else None for key, file in files.items()}
+    FX_buf, Y_buf = worker_env['buffers']['FX'], worker_env['buffers']['Y']
+
+    blocks = [(start_idx, n, results)] if vectorized == 'yes' else [(start_idx + ii, 1, result) for ii, result in enumerate(results)]
+    written = []
+    for idx, n_block, block in blocks:
+        try:
+            if isinstance(block, Exception):
+                raise block
+            fx = block[0] if isinstance(block, (tuple, list)) else block
+            FX_buf[idx:idx + n_block, :] = np.asarray(fx, dtype=float).reshape(n_block, FX_buf.shape[1])
+            if Y_buf is not None:
+                Y_buf[idx:idx + n_block, :] = np.asarray(block[1], dtype=float).reshape(n_block, Y_buf.shape[1])
+            written.append(None)
+        except Exception:
+            written.append(block)
+
+    return written[0] if vectorized == 'yes' else written
+
+
+def worker_task(X, vectorized = 'no', timeout = np.inf, retry = 0, abort = None):
+    # X stores only the rows of the population this worker must evaluate
+    func_handle, plugin, base_dir = worker_env['func_handle'], worker_env['plugin'], worker_env['base_dir']
+
     if base_dir is not None:
         # Create a worker-specific directory
-        worker_dir = os.path.join(base_dir, f"worker_{worker_id}")   
+        worker_dir = os.path.join(base_dir, f"worker_{worker_env['worker_id']}")   
         # Change to the worker's specific directory
         os.chdir(worker_dir)
 
-    # Execute model
-    results = []
-    for idx in range(start_idx, end_idx):
-        if plugin is not None:
-            result = func_handle(X[idx, :], plugin)
-        else:
-            result = func_handle(X[idx, :])
-
-        results.append(result)
-
-    # Return the results for this worker
-    return results
+    # Execute model: all rows in one call if function is vectorized
+    return evaluate_rows(func_handle, X, plugin, vectorized, timeout, retry, abort)
 
 
 def cleanup_worker_directories(base_dir, N):
@@ -0,0 +1,101 @@
+import numpy as np
+import asyncio, signal, time
+
+def AMALGAM_toy(x):
+    """
+    AMALGAM_toy: bivariate test function whose evaluation fails if x[0] > 0.75.
+
+    Parameters:
+    - x (numpy array): 1xd parameter vector
+
+    Returns:
+    - Fx (numpy array): Pair of objective function values
+    """
+    if x[0] > 0.75:
+        raise ValueError(f"AMALGAM_toy: evaluation failed for x[0] = {x[0]}")
+    Fx = np.array([x[0], 1 - x[0] + np.sum(x[1:]**2)])
+
+    return Fx
+
+
+def AMALGAM_toy_sim(x):
+    """
+    AMALGAM_toy with model simulations y = cumulative sum of x [options['modout'] = 'yes'].
+    """
+    return AMALGAM_toy(x), np.cumsum(x)
+
+
+def AMALGAM_toy_vec(X):
+    """
+    AMALGAM_toy of all rows of X in one call [options['vectorized'] = 'yes'] with model
+    simulations Y = cumulative sum of each row. The call fails if x[0] > 0.75 for a row.
+    """
+    if np.any(X[:, 0] > 0.75):
+        raise ValueError("AMALGAM_toy_vec: evaluation failed")
+    FX = np.column_stack([X[:, 0], 1 - X[:, 0] + np.sum(X[:, 1:]**2, axis=1)])
+
+    return FX, np.cumsum(X, axis=1)
+
+
+def AMALGAM_toy_plugin(x, plugin):
+    """
+    AMALGAM_toy_plugin: objective function values x[0] and plugin['w'] @ x. Returns the
+    second value negative if plugin['w'] can be written to [= not a read-only memory map
+    of the pool of workers].
+    """
+    Fx = np.array([x[0], plugin['w'] @ x])
+    if plugin['w'].flags.writeable:
+        Fx[1] = -Fx[1]
+
+    return Fx
+
+
+def AMALGAM_toy_abort(x, abort = None):
+    """
+    AMALGAM_toy that stops [objective function values of inf] if abort, the dominance
+    check of options['abort'] = 'yes', returns True for a lower bound x[0], 0.
+    """
+    if abort is not None and abort(np.array([x[0], 0])):
+        return np.full(2, np.inf)
+
+    return AMALGAM_toy(x)
+
+
+async def AMALGAM_toy_async(x):
+    """
+    AMALGAM_toy as coroutine that waits 0.1 seconds [= request to a service]. Keeps the
+    number of running evaluations and its maximum in AMALGAM_toy_async.running.
+    """
+    running = AMALGAM_toy_async.running
+    running[0] += 1
+    running[1] = max(running)
+    try:
+        await asyncio.sleep(0.1)
+    finally:
+        running[0] -= 1
+
+    return AMALGAM_toy(x)
+
+AMALGAM_toy_async.running = [0, 0]
+
+
+def AMALGAM_toy_slow(x):
+    """
+    AMALGAM_toy_slow: AMALGAM_toy that takes 30 seconds if x[0] > 0.75.
+    """
+    if x[0] > 0.75:
+        time.sleep(30)
+
+    return AMALGAM_toy(x)
+
+
+def AMALGAM_toy_hang(x):
+    """
+    AMALGAM_toy_hang: AMALGAM_toy whose evaluation hangs if x[0] > 0.75, also past
+    the alarm signal of options['timeout'] [POSIX only].
+    """
+    if x[0] > 0.75:
+        signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGALRM])
+        time.sleep(100)
+
+    return AMALGAM_toy(x)
@@ -0,0 +1,52 @@
+# Fixtures of the tests: working directory of a run, computational environment of
+# AMALGAM_calc_setup [closed by AMALGAM_end after the test] and evaluation of the rows
+# of X with the toy function AMALGAM_toy [evaluation fails if x[0] > 0.75]
+
+import os, sys
+import numpy as np
+import pytest
+
+test_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(test_dir)
+sys.path.append(os.path.join(test_dir, '..', 'miscellaneous'))
+import AMALGAM_functions as AF
+
+
+@pytest.fixture
+def workers(tmp_path, monkeypatch):
+    # Warning file of a run in temporary directory; three workers on any machine
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(AF.mp, 'cpu_count', lambda: 3)
+
+
+@pytest.fixture
+def setup(workers):
+    # setup(d, N, ...) returns AMALGAMPar, Par_info, options, func_handle, base_dir and CPU_info;
+    # bounds of parameters are 1 x d as of AMALGAM_check
+    opened = []
+
+    def setup(d = 3, N = 20, Func_name = 'AMALGAM_toy.AMALGAM_toy', plugin = None, m = 2, x_min = 0.0, **kwargs):
+        AMALGAMPar = {'N': N, 'T': 2, 'd': d, 'm': m}
+        Par_info = {'initial': 'latin', 'boundhandling': 'bound', 'min': np.hstack([[[x_min]], np.zeros((1, d - 1))]), 'max': np.ones((1, d))}
+        options = {'failure': 'penalty', 'penalty': 1e10, 'print': 'no', **kwargs}
+        AMALGAMPar, Par_info, options, _ = AF.AMALGAM_setup(AMALGAMPar, Par_info, options)
+        AMALGAMPar, func_handle, base_dir, CPU_info = AF.AMALGAM_calc_setup(AMALGAMPar, Func_name, options, plugin, Par_info)
+        opened.append((AMALGAMPar, options, base_dir, CPU_info))
+
+        return AMALGAMPar, Par_info, options, func_handle, base_dir, CPU_info
+
+    yield setup
+    for env in opened:
+        AF.AMALGAM_end(*env)
+
+
+@pytest.fixture
+def calc_FX(setup):
+    # calc_FX(X, ...) returns FX, Y and CPU_info of AMALGAM_calc_FX
+    def calc_FX(X, Func_name = 'AMALGAM_toy.AMALGAM_toy', plugin = None, m = 2, **kwargs):
+        AMALGAMPar, _, options, func_handle, base_dir, CPU_info = setup(X.shape[1], X.shape[0], Func_name, plugin, m, **kwargs)
+        FX, Y = AF.AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, plugin, set(), CPU_info)
+
+        return FX, Y, CPU_info
+
+    return calc_FX
@@ -0,0 +1,31 @@
+# Early abort of options['abort'] = 'yes': func_handle receives the dominance check of the
+# rank 1 front [CPU_info['front']] and stops an evaluation that cannot become nondominated
+
+import numpy as np
+import pytest
+
+import AMALGAM_functions as AF
+from AMALGAM_toy import AMALGAM_toy
+
+
+def test_dominated():
+    F_front = np.array([[0.2, 0.8], [0.5, 0.5]])
+    assert AF.dominated(F_front, np.array([0.6, 0.6])) and AF.dominated(F_front, np.array([0.5, 0.6]))
+    # Equal to or not dominated by any member of the front
+    assert not AF.dominated(F_front, np.array([0.5, 0.5])) and not AF.dominated(F_front, np.array([0.1, 0.9]))
+    assert np.array_equal(AF.dominated(F_front, np.array([[0.6, 0.6], [0.3, 0.6], [0.2, 0.8]])), [True, False, False])
+
+
+@pytest.mark.parametrize('parallel', ['no', 'yes'])
+def test_abort(setup, parallel):
+    X = np.random.default_rng(10).random((20, 3))
+    AMALGAMPar, _, options, func_handle, base_dir, CPU_info = setup(Func_name='AMALGAM_toy.AMALGAM_toy_abort', parallel=parallel, abort='yes')
+    # No front yet: all rows are evaluated
+    FX, _ = AF.AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, None, set(), CPU_info)
+    assert np.all(CPU_info['status'] != 2)
+    # Rows with x[0] > 0.5 are dominated by front member 0.5, 0: stopped early
+    CPU_info['front'] = np.array([[0.5, 0.0]])
+    FX, _ = AF.AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, None, set(), CPU_info)
+    stopped = X[:, 0] > 0.5
+    assert np.array_equal(CPU_info['status'], 2 * stopped) and CPU_info['failed'][3] == np.sum(stopped)
+    assert np.all(np.isposinf(FX[stopped, :])) and np.allclose(FX[~stopped, :], [AMALGAM_toy(x) for x in X[~stopped, :]])
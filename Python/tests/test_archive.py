@@ -0,0 +1,23 @@
+# Online archive of Update_archive [= output['pareto']]: after each generation the archive
+# holds the rows of Z that are not dominated by any other row of Z
+
+import numpy as np
+import pytest
+
+from AMALGAM_functions import Update_archive
+from test_rank import random_FQ, matlab_rank
+
+
+@pytest.mark.parametrize('m', [2, 3])
+def test_archive(m):
+    AMALGAMPar, N, d = {'d': 2, 'm': m}, 50, 2
+    rng = np.random.default_rng(14)
+    Z = np.hstack([rng.random((N, d)), random_FQ(N, m, 0)])
+    pareto = Update_archive(AMALGAMPar, Z, np.zeros(0, dtype=int), np.arange(N))
+    for t in range(1, 10):
+        # Population of generation t: survivors of generation t - 1 [rows repeat in Z] and children
+        XF = Z[-N:, :][rng.permutation(N)[:N // 2], :]
+        XF = np.vstack([XF, np.hstack([rng.random((N - N // 2, d)), random_FQ(N - N // 2, m, t)])])
+        Z = np.vstack([Z, XF])
+        pareto = Update_archive(AMALGAMPar, Z, pareto, np.arange(t * N, (t + 1) * N))
+        assert np.array_equal(pareto, np.where(matlab_rank(Z[:, d:d + m]) == 1)[0])
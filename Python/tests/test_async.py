@@ -0,0 +1,29 @@
+# Asynchronous steady-state generation of AMALGAM_async: N children are merged with
+# the population as they return, their objective function values are those of the
+# toy function and no child is left with a worker after the last generation
+
+import numpy as np
+
+import AMALGAM_functions as AF
+from AMALGAM_toy import AMALGAM_toy
+
+
+def test_async(setup):
+    np.random.seed(1)
+    AMALGAMPar, Par_info, options, func_handle, base_dir, CPU_info = setup(N=30, parallel='yes', **{'async': 'yes'})
+    AMALGAMPar, Par_info, X, p_rm, PS, _, _ = AF.AMALGAM_initialize(AMALGAMPar, Par_info, None, options)
+    FX, _ = AF.AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, None, set(), CPU_info)
+    RX, dX, FX_min = AF.AMALGAM_rank(FX, options)
+    PS = AF.Update_PS(AMALGAMPar, np.concatenate([X, FX], axis=1), PS, FX_min)
+    for t in range(1, AMALGAMPar['T'] + 1):
+        X, FX, _, RX, dX, _, p_rm, PS = AF.AMALGAM_async(AMALGAMPar, Par_info, options, X, FX, None, RX, dX, FX_min, p_rm, PS, t,
+            None, set(), CPU_info)
+        assert X.shape == (AMALGAMPar['N'], AMALGAMPar['d']) and CPU_info['hits'][0] == AMALGAMPar['N']
+        assert np.isclose(np.sum(p_rm), 1)
+    # Population holds evaluated parameter vectors with their objective function values
+    failed = X[:, 0] > 0.75
+    assert np.all(FX[failed, :] == 1e10)
+    assert np.allclose(FX[~failed, :], [AMALGAM_toy(x) for x in X[~failed, :]])
+    assert np.array_equal(RX, AF.AMALGAM_rank(FX, options)[0])
+    # Last generation: all workers are free
+    assert CPU_info['async']['busy'] == {} and len(CPU_info['async']['free']) == AMALGAMPar['CPU']
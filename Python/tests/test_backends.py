@@ -0,0 +1,18 @@
+# Executors of options['backend']: each backend [and the pool of workers and broker]
+# returns the same objective function values and counts of failed evaluations
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+
+from AMALGAM_toy import AMALGAM_toy
+
+
+@pytest.mark.parametrize('parallel, backend', [('no', 'process'), ('yes', 'process'), ('yes', 'thread'), ('yes', 'serial'),
+                                               ('yes', ThreadPoolExecutor(max_workers=3))])
+def test_backends(calc_FX, parallel, backend):
+    X = np.random.default_rng(1).random((20, 3))
+    failed = X[:, 0] > 0.75
+    FX, _, CPU_info = calc_FX(X, parallel=parallel, backend=backend)
+    assert np.all(FX[failed, :] == 1e10) and np.allclose(FX[~failed, :], [AMALGAM_toy(x) for x in X[~failed, :]])
+    assert CPU_info['failed'][0] == np.sum(failed) and np.array_equal(CPU_info['status'], failed.astype(int))
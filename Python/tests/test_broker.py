@@ -0,0 +1,45 @@
+# Broker of options['parallel'] = 'broker': workers connect to the listener of the broker
+# [local stand-ins are started by AMALGAM_calc_setup], a worker whose task exceeds t_max
+# is dropped and a local stand-in is started again
+
+import signal
+import numpy as np
+import pytest
+
+import AMALGAM_functions as AF
+from AMALGAM_toy import AMALGAM_toy, AMALGAM_toy_hang
+
+
+def test_broker_calc_FX(calc_FX):
+    X = np.random.default_rng(6).random((20, 3))
+    failed = X[:, 0] > 0.75
+    FX, _, CPU_info = calc_FX(X, parallel='broker')
+    assert np.allclose(FX[~failed, :], [AMALGAM_toy(x) for x in X[~failed, :]]) and np.all(FX[failed, :] == 1e10)
+    # Default address binds a free port at localhost
+    host, port = CPU_info['broker']['address'].split(':')
+    assert host == 'localhost' and int(port) > 0 and len(CPU_info['broker']['procs']) == 3
+
+
+def test_broker_authkey(monkeypatch):
+    monkeypatch.delenv('AMALGAM_AUTHKEY', raising=False)
+    with pytest.raises(ValueError, match='AMALGAM_AUTHKEY'):
+        AF.broker_open('0.0.0.0:0', (AMALGAM_toy, None))
+
+
+@pytest.mark.skipif(not hasattr(signal, 'pthread_sigmask'), reason='requires signal.pthread_sigmask')
+def test_broker_respawn():
+    broker = AF.broker_open('localhost:0', (AMALGAM_toy_hang, None))
+    try:
+        for worker_id in range(2):
+            AF.broker_spawn(broker, worker_id)
+        pids = [proc.pid for proc in broker['procs']]
+        X = np.full((6, 3), 0.5)
+        X[0, 0] = 0.9
+        done = AF.broker_evaluate(broker, {i: (i, X[i:i + 1, :], 'no', 0.2, 0, None, None) for i in range(6)}, t_max=2)
+        assert isinstance(done[0], TimeoutError) and all(isinstance(done[i], tuple) for i in range(1, 6))
+        # Hung stand-in is killed and started again
+        assert sum(proc.pid in pids for proc in broker['procs']) == 1 and all(proc.is_alive() for proc in broker['procs'])
+        done = AF.broker_evaluate(broker, {i: (i, X[i:i + 1, :], 'no', 0.2, 0, None, None) for i in range(1, 6)}, t_max=2)
+        assert len(done) == 5 and all(isinstance(result, tuple) for result in done.values())
+    finally:
+        AF.broker_close(broker)
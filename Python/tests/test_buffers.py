@@ -0,0 +1,33 @@
+# Shared result buffers of the workers: once the output signature of the function is
+# known, workers write FX and Y of their rows in memory-mapped arrays of open_buffers
+
+import numpy as np
+
+import AMALGAM_functions as AF
+from AMALGAM_toy import AMALGAM_toy
+
+
+def test_buffers_round_trip(tmp_path):
+    CPU_info = {'buffers': {'m': 2, 'n_Y': 3, 'rows': 0}, 'plugin_dir': str(tmp_path)}
+    files = AF.open_buffers(CPU_info, 4, 2)
+    results = [(np.array([ii, -ii]), np.full(3, ii)) for ii in range(3)] + [ValueError('failed')]
+    written = AF.write_buffers(results, 0, 4, 'no', files)
+    assert written[:3] == [None, None, None] and isinstance(written[3], ValueError)
+    FX, Y = AF.read_buffers(CPU_info['buffers'], 1, 2)
+    assert np.array_equal(FX, [[1, -1], [2, -2]]) and np.array_equal(Y, [[1, 1, 1], [2, 2, 2]])
+    # Buffers grow if a call has more rows
+    assert AF.open_buffers(CPU_info, 2, 2) == files and AF.open_buffers(CPU_info, 8, 2) != files
+    assert CPU_info['buffers']['FX'].shape == (8, 2)
+
+
+def test_buffers_calc_FX(setup):
+    AMALGAMPar, _, options, func_handle, base_dir, CPU_info = setup(N=12, Func_name='AMALGAM_toy.AMALGAM_toy_sim', parallel='yes', modout='yes')
+    rng = np.random.default_rng(5)
+    for k in range(2):
+        X = rng.random((12, 3))
+        failed = X[:, 0] > 0.75
+        FX, Y = AF.AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, None, set(), CPU_info)
+        # Signature known after the first call: the second call reads the results from the buffers
+        assert CPU_info['buffers']['rows'] == 12 * k
+        assert np.allclose(FX[~failed, :], [AMALGAM_toy(x) for x in X[~failed, :]]) and np.all(FX[failed, :] == 1e10)
+        assert np.allclose(Y[~failed, :], np.cumsum(X[~failed, :], axis=1))
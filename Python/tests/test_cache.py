@@ -0,0 +1,45 @@
+# Evaluation cache [options['cache'] = 'yes']: repeated parameter vectors are evaluated
+# once, failed evaluations are not cached and the cache keeps the cache_size most
+# recently used parameter vectors
+
+import numpy as np
+
+import AMALGAM_functions as AF
+from AMALGAM_toy import AMALGAM_toy
+
+
+def test_cache(setup):
+    rng = np.random.default_rng(1)
+    X = rng.random((10, 3))
+    X = np.vstack([X, X[:4, :]])                    # Four repeated rows
+    AMALGAMPar, _, options, func_handle, base_dir, CPU_info = setup(N=X.shape[0], cache='yes')
+    FX, _ = AF.AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, None, set(), CPU_info)
+    failed = X[:, 0] > 0.75
+    assert CPU_info['hits'][:2] == [14, 4]
+    assert np.all(FX[failed, :] == 1e10) and np.allclose(FX[~failed, :], [AMALGAM_toy(x) for x in X[~failed, :]])
+    assert np.array_equal(CPU_info['status'], failed.astype(int))
+    # Same rows again: failed rows are evaluated again, all others are cache hits
+    n_fail = CPU_info['failed'][0]
+    FX_2, _ = AF.AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, None, set(), CPU_info)
+    assert np.array_equal(FX_2, FX) and np.array_equal(CPU_info['status'], failed.astype(int))
+    assert CPU_info['hits'][1] == X.shape[0] - len(np.unique(X[failed, :], axis=0))
+    assert CPU_info['failed'][0] == n_fail + len(np.unique(X[failed, :], axis=0))
+
+
+def test_cache_size(setup):
+    AMALGAMPar, _, options, func_handle, base_dir, CPU_info = setup(N=10, cache='yes', cache_size=5)
+    X = 0.75 * np.random.default_rng(2).random((10, 3))
+    AF.AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, None, set(), CPU_info)
+    assert list(CPU_info['cache']['data']) == AF.cache_keys(X[5:, :], CPU_info['cache'])
+    # Hit moves a row to the end: first new row then removes the least recently used row
+    AF.AMALGAM_calc_FX(X[5:6, :], AMALGAMPar, options, func_handle, base_dir, None, set(), CPU_info)
+    AF.AMALGAM_calc_FX(X[:1, :], AMALGAMPar, options, func_handle, base_dir, None, set(), CPU_info)
+    assert list(CPU_info['cache']['data']) == AF.cache_keys(X[[7, 8, 9, 5, 0], :], CPU_info['cache'])
+
+
+def test_cache_keys_steps():
+    # Discrete space: rows on the same lattice point share a key
+    cache = {'min': np.zeros((1, 2)), 'step_size': np.array([[0.1, 0.5]])}
+    X = np.array([[0.3, 1.0], [0.30000000001, 0.99999999], [0.4, 1.0]])
+    keys = AF.cache_keys(X, cache)
+    assert keys[0] == keys[1] and keys[0] != keys[2]
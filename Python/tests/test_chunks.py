@@ -0,0 +1,26 @@
+# Chunks of rows handed out to workers on demand: distribute_tasks covers each row once,
+# rows return in the order of X and AMALGAM_calc_FX reports wall and idle time
+
+import numpy as np
+import pytest
+
+import AMALGAM_functions as AF
+from AMALGAM_toy import AMALGAM_toy
+
+
+@pytest.mark.parametrize('N, CPU, chunksize', [(1, 4, 'auto'), (50, 4, 'auto'), (50, 3, 7), (10, 16, 'auto')])
+def test_distribute_tasks(N, CPU, chunksize):
+    task_ranges = AF.distribute_tasks(N, CPU, chunksize)
+    rows = np.concatenate([np.arange(start_idx, end_idx) for start_idx, end_idx in task_ranges])
+    assert np.array_equal(rows, np.arange(N))
+    size = int(np.ceil(N / (4 * CPU))) if chunksize == 'auto' else chunksize
+    assert all(end_idx - start_idx <= size for start_idx, end_idx in task_ranges)
+
+
+@pytest.mark.parametrize('chunksize', [1, 4, 'auto'])
+def test_chunks_in_order(calc_FX, chunksize):
+    X = 0.75 * np.random.default_rng(1).random((25, 3))
+    FX, _, CPU_info = calc_FX(X, parallel='yes', chunksize=chunksize)
+    assert np.allclose(FX, [AMALGAM_toy(x) for x in X])
+    T_wall, T_idle = CPU_info['idle']
+    assert T_wall > 0 and T_idle <= 3 * T_wall
@@ -0,0 +1,37 @@
+# Coroutine functions [async def]: rows of X are evaluated concurrently on the event loop
+# of the main process with at most options['concurrency'] evaluations at the same time
+
+import time
+import numpy as np
+import pytest
+
+from AMALGAM_toy import AMALGAM_toy, AMALGAM_toy_async
+
+
+@pytest.mark.parametrize('concurrency', [1, 5, 100])
+def test_coroutine(calc_FX, concurrency):
+    X = np.random.default_rng(7).random((20, 3))
+    failed = X[:, 0] > 0.75
+    AMALGAM_toy_async.running[:] = [0, 0]
+    t0 = time.time()
+    FX, _, CPU_info = calc_FX(X, 'AMALGAM_toy.AMALGAM_toy_async', concurrency=concurrency, retry=1)
+    assert np.all(FX[failed, :] == 1e10) and np.allclose(FX[~failed, :], [AMALGAM_toy(x) for x in X[~failed, :]])
+    assert CPU_info['failed'][0] == np.sum(failed) and CPU_info['failed'][1] == np.sum(failed)
+    # Evaluations overlap: 20 rows [retries in same slot] of 0.1 seconds, concurrency at a time
+    n = 20 + np.sum(failed)
+    assert AMALGAM_toy_async.running == [0, min(concurrency, 20)]
+    assert time.time() - t0 < 0.1 * (np.ceil(n / concurrency) + 1) + 0.5
+
+
+def test_coroutine_timeout(calc_FX):
+    X = np.random.default_rng(8).random((10, 3))
+    FX, _, CPU_info = calc_FX(X, 'AMALGAM_toy.AMALGAM_toy_async', timeout=0.01)
+    assert np.all(FX == 1e10) and np.all(CPU_info['status'] == 1)
+
+
+def test_coroutine_parallel(setup):
+    # No workers: evaluations of async function run on event loop of main process
+    AMALGAMPar, _, options, _, _, CPU_info = setup(Func_name='AMALGAM_toy.AMALGAM_toy_async', parallel='yes')
+    assert options['parallel'] == 'no' and AMALGAMPar['CPU'] == 1 and CPU_info['pool'] is None
+    with open('warning_file.txt') as fid:
+        assert 'async function' in fid.read()
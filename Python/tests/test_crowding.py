@@ -0,0 +1,44 @@
+# Crowding distance of all fronts at once [crowding_distance] against a loop over the
+# fronts and objectives of NSGA-II [Deb et al., 2002]
+
+import numpy as np
+import pytest
+
+from AMALGAM_functions import crowding_distance, ENS_rank
+from test_rank import random_FQ
+
+
+def crowding_loop(FQ, RQ):
+    # Crowding distance of each front: infinite for first and last row of each objective
+    # [range of inf - inf = nan contributes zero]
+    Cr_d = np.zeros(FQ.shape[0])
+    for r in np.unique(RQ):
+        id_r = np.where(RQ == r)[0]
+        for i in range(FQ.shape[1]):
+            order = id_r[np.argsort(FQ[id_r, i], kind='stable')]
+            with np.errstate(invalid='ignore'):
+                F_range = FQ[order[-1], i] - FQ[order[0], i]
+            for j in range(1, len(order) - 1):
+                d = (FQ[order[j + 1], i] - FQ[order[j - 1], i]) / F_range if F_range > 0 else 0
+                Cr_d[order[j]] += d if np.isfinite(d) else 0
+            Cr_d[order[[0, -1]]] = np.inf
+
+    return Cr_d
+
+
+@pytest.mark.parametrize('m', [2, 3, 5])
+@pytest.mark.parametrize('seed', range(3))
+def test_crowding_distance(m, seed):
+    # Ties and duplicate rows [random_FQ] and continuous objective function values
+    for FQ in [random_FQ(200, m, seed), np.random.default_rng(seed).random((200, m))]:
+        RQ = ENS_rank(FQ)
+        assert np.array_equal(crowding_distance(FQ, RQ), crowding_loop(FQ, RQ))
+
+
+def test_crowding_distance_inf():
+    # Failed rows [objective function values of inf] form the last front
+    FQ = np.random.default_rng(11).random((50, 2))
+    FQ[:10, :] = np.inf
+    RQ = ENS_rank(FQ)
+    Cr_d = crowding_distance(FQ, RQ)
+    assert np.array_equal(Cr_d, crowding_loop(FQ, RQ)) and not np.any(np.isnan(Cr_d))
@@ -0,0 +1,43 @@
+# SPEA2 fitness of strength_density [options['density'] = 'strength'] against a loop over
+# all pairs of rows: raw fitness R of dominators and distance sigma_k to k-th neighbour
+
+import sys
+import numpy as np
+import pytest
+
+from AMALGAM_functions import ENS_rank, strength_density
+from test_rank import random_FQ
+
+
+def strength_loop(FQ, k):
+    M = FQ.shape[0]
+    dom = lambda a, b: np.all(FQ[a] <= FQ[b]) and np.any(FQ[a] < FQ[b])
+    S = [sum(dom(p, q) for q in range(M)) for p in range(M)]
+    R = np.array([sum(S[p] for p in range(M) if dom(p, q)) for q in range(M)])
+    # Distance to k-th nearest neighbour of normalized finite rows
+    ok = np.all(np.isfinite(FQ), axis=1)
+    F = (FQ[ok] - FQ[ok].min(axis=0)) / np.where(np.ptp(FQ[ok], axis=0) > 0, np.ptp(FQ[ok], axis=0), 1)
+    sigma = np.zeros(M)
+    sigma[ok] = [np.sort(np.linalg.norm(F - f, axis=1))[min(k, len(F) - 1)] for f in F]
+
+    return 1 / (R + 1 / (sigma + 2))
+
+
+@pytest.mark.parametrize('scipy', [True, False])
+@pytest.mark.parametrize('m', [2, 3])
+def test_strength_density(monkeypatch, scipy, m):
+    if not scipy:
+        monkeypatch.setitem(sys.modules, 'scipy.spatial', None)     # ImportError: batched distances
+    else:
+        pytest.importorskip('scipy.spatial')
+    FQ = random_FQ(60, m, 12)
+    FQ[:3, :] = np.inf                                              # Failed rows: sigma_k = 0
+    assert np.allclose(strength_density(FQ), strength_loop(FQ, int(np.sqrt(60))))
+    assert np.allclose(strength_density(FQ, k=1), strength_loop(FQ, 1))
+
+
+def test_strength_density_rank_1():
+    # Nondominated rows [R = 0] have dQ >= 2, dominated rows dQ < 1
+    FQ = np.random.default_rng(13).random((100, 2))
+    dQ, RQ = strength_density(FQ), ENS_rank(FQ)
+    assert np.all(dQ[RQ == 1] >= 2) and np.all(dQ[RQ > 1] < 1)
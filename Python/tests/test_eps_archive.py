@@ -0,0 +1,47 @@
+# Epsilon-dominance archive of Update_eps_archive: rows are nondominated, the archive
+# holds at most one row per box, is bounded and epsilon-dominates all rows offered
+
+import numpy as np
+import pytest
+
+from AMALGAM_functions import Update_eps_archive
+
+
+def dominates(a, b):
+    return np.all(a <= b) and np.any(a < b)
+
+
+def offspring(rng, n, d, m):
+    # Parameter vectors and objective function values close to front f_m = 1 - sum(f_1:m-1) / (m-1)
+    X = rng.random((n, d))
+    F = rng.random((n, m))
+    F[:, -1] = 1 - np.mean(F[:, :-1], axis=1) + 0.2 * rng.random(n)
+
+    return np.hstack([X, F])
+
+
+@pytest.mark.parametrize('m', [2, 3])
+def test_eps_archive(m):
+    d, eps = 4, np.full(m, 0.05)
+    AMALGAMPar, options = {'d': d, 'm': m}, {'epsilon': eps}
+    rng = np.random.default_rng(m)
+    Z, offered = np.empty((0, d + m)), []
+    for _ in range(50):
+        XF = offspring(rng, 40, d, m)
+        XF[0, d] = np.nan                                       # Not archived
+        Z_new, id_Z, id_new = Update_eps_archive(AMALGAMPar, options, Z, XF)
+        assert np.array_equal(Z_new, np.vstack([Z[id_Z, :], XF[id_new, :]]))
+        assert 0 not in id_new
+        Z = Z_new
+        offered.append(XF[1:, d:])
+    F, F_all = Z[:, d:], np.vstack(offered)
+    B, B_all = np.floor(F / eps), np.floor(F_all / eps)
+    # Rows are mutually nondominated and their boxes are unique and nondominated
+    assert not any(dominates(F[i], F[j]) for i in range(len(F)) for j in range(len(F)))
+    assert np.unique(B, axis=0).shape[0] == B.shape[0]
+    assert not any(np.all(B[i] <= B[j]) for i in range(len(B)) for j in range(len(B)) if i != j)
+    # Bounded: at most (boxes per objective)^(m-1) nondominated boxes
+    K = np.max(B_all, axis=0) - np.min(B_all, axis=0) + 1
+    assert Z.shape[0] <= np.prod(np.sort(K)[:-1])
+    # Each row offered is epsilon-dominated: its box is weakly dominated by the box of an archived row
+    assert all(np.any(np.all(B <= b, axis=1)) for b in B_all)
@@ -0,0 +1,64 @@
+# Built-in runner AMALGAM_exe of an external model: parameter file rendered from a
+# template, output file parsed by a registered reader; failed runs raise an exception
+
+import sys
+import numpy as np
+import pytest
+
+import AMALGAM_functions as AF
+
+model = """
+import sys, time
+p = dict(line.split('=') for line in open('param.txt').read().split())
+a, b = float(p['a']), float(p['b'])
+if a < 0:
+    sys.exit(2)
+if a > 10:
+    time.sleep(30)
+if b < 0:
+    sys.exit(0)
+open('out.txt', 'w').write(f'{a} {a + b}')
+"""
+
+
+@pytest.fixture
+def plugin(workers):
+    # Executable model.py with template of parameter file in working directory of test
+    with open('model.py', 'w') as fid:
+        fid.write(model)
+    with open('param.tpl', 'w') as fid:
+        fid.write('a=${x1}\nb=${beta}\n')
+
+    return {'exe': {'command': [sys.executable, 'model.py'], 'template': {'param.tpl': 'param.txt'}, 'names': ['alpha', 'beta'],
+                    'output': 'out.txt', 'timeout': 5}}
+
+
+def test_exe(plugin):
+    assert np.allclose(AF.AMALGAM_exe(np.array([1.5, 2.0]), plugin), [1.5, 3.5])
+    with open('param.txt') as fid:
+        assert fid.read() == 'a=1.5\nb=2\n'
+
+
+def test_exe_reader(plugin):
+    AF.register_reader('test_sum', lambda file_name, x, plugin: (np.loadtxt(file_name)[:1], np.loadtxt(file_name) + x))
+    plugin['exe']['reader'] = 'test_sum'
+    FX, Y = AF.AMALGAM_exe(np.array([1.0, 1.0]), plugin)
+    assert np.allclose(FX, [1.0]) and np.allclose(Y, [2.0, 3.0])
+
+
+@pytest.mark.parametrize('x, error, match', [([-1.0, 1.0], RuntimeError, 'exit code 2'), ([1.0, -1.0], RuntimeError, 'did not write'),
+                                             ([20.0, 1.0], TimeoutError, 'did not finish')])
+def test_exe_failed(plugin, x, error, match):
+    # Output file of the previous run is removed and not read
+    AF.AMALGAM_exe(np.array([1.0, 1.0]), plugin)
+    plugin['exe']['timeout'] = 1
+    with pytest.raises(error, match=match):
+        AF.AMALGAM_exe(np.array(x), plugin)
+
+
+def test_exe_calc_FX(plugin, calc_FX):
+    # Failed runs are handled by options['failure'] of AMALGAM_calc_FX
+    X = np.array([[1.0, 2.0], [-1.0, 2.0], [3.0, 1.0]])
+    FX, _, CPU_info = calc_FX(X, 'AMALGAM_exe', plugin)
+    assert np.allclose(FX, [[1.0, 3.0], [1e10, 1e10], [3.0, 4.0]])
+    assert np.array_equal(CPU_info['status'], [0, 1, 0])
@@ -0,0 +1,32 @@
+# Failed evaluations of AMALGAM_calc_FX: an evaluation that raises an exception or exceeds
+# options['timeout'] is tried options['retry'] more times and then stops the run
+# [options['failure'] = 'error'] or receives options['penalty']
+
+import numpy as np
+import pytest
+
+from AMALGAM_toy import AMALGAM_toy
+
+
+@pytest.mark.parametrize('parallel', ['no', 'yes', 'broker'])
+def test_retry(calc_FX, parallel):
+    X = np.random.default_rng(2).random((12, 3))
+    failed = X[:, 0] > 0.75
+    FX, _, CPU_info = calc_FX(X, parallel=parallel, retry=2)
+    assert CPU_info['failed'][0] == np.sum(failed) and CPU_info['failed'][1] == 2 * np.sum(failed)
+    assert np.all(FX[failed, :] == 1e10) and np.array_equal(CPU_info['status'], failed.astype(int))
+
+
+def test_failure_error(calc_FX):
+    X = np.random.default_rng(3).random((12, 3))
+    with pytest.raises(ValueError, match='AMALGAM_toy'):
+        calc_FX(X, parallel='yes', failure='error')
+
+
+@pytest.mark.parametrize('parallel', ['no', 'yes'])
+def test_timeout(calc_FX, parallel):
+    X = np.random.default_rng(4).random((8, 3))
+    failed = X[:, 0] > 0.75
+    FX, _, CPU_info = calc_FX(X, 'AMALGAM_toy.AMALGAM_toy_slow', parallel=parallel, timeout=0.2, retry=1)
+    assert np.all(FX[failed, :] == 1e10) and np.allclose(FX[~failed, :], [AMALGAM_toy(x) for x in X[~failed, :]])
+    assert CPU_info['failed'][0] == np.sum(failed) and CPU_info['failed'][1] == np.sum(failed)
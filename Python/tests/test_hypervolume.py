@@ -0,0 +1,72 @@
+# Hypervolume and exclusive contributions of HV_contributions against a brute-force
+# count of the unit cells of an integer grid dominated by the rows of F
+
+import itertools
+import numpy as np
+import pytest
+
+from AMALGAM_functions import HV_contributions, HV_truncate, ENS_rank
+
+
+def grid_HV(F, ref):
+    # Cell with lower corner g is dominated by row k if F[k,:] <= g: HV = number of
+    # dominated cells, contribution of row k = number of cells dominated only by row k
+    G = np.array(list(itertools.product(*[range(int(r)) for r in ref])))
+    B = np.all(F[:, None, :] <= G[None, :, :], axis=2)
+    n_dom = np.sum(B, axis=0)
+
+    return np.sum(n_dom > 0), np.sum(B[:, n_dom == 1], axis=1)
+
+
+def integer_F(M, m, seed, front):
+    # Rows of integer grid 0, ..., 5; if front only the unique rank 1 rows
+    F = np.random.default_rng(seed).integers(0, 6, (M, m)).astype(float)
+    if front:
+        F = np.unique(F, axis=0)
+        F = F[ENS_rank(F) == 1, :]
+
+    return F
+
+
+@pytest.mark.parametrize('m', [2, 3])
+@pytest.mark.parametrize('seed', range(10))
+def test_HV_exact(m, seed):
+    ref = np.full(m, 7.0)
+    F = integer_F(30, m, seed, front=False)
+    assert np.isclose(HV_contributions(F, ref)[0], grid_HV(F, ref)[0])
+    F = integer_F(30, m, seed, front=True)
+    HV, c = HV_contributions(F, ref)
+    HV_grid, c_grid = grid_HV(F, ref)
+    assert np.isclose(HV, HV_grid) and np.allclose(c, c_grid)
+    # Dominance check skipped for a front
+    assert np.allclose(HV_contributions(F, ref, front=True)[1], c_grid)
+
+
+def test_HV_monte_carlo():
+    ref = np.full(4, 7.0)
+    F = integer_F(30, 4, 0, front=True)
+    HV, c = HV_contributions(F, ref, n_MC=200000)
+    HV_grid, c_grid = grid_HV(F, ref)
+    V = np.prod(ref - np.min(F, axis=0))
+    assert abs(HV - HV_grid) < 0.01 * V and np.all(np.abs(c - c_grid) < 0.01 * V)
+
+
+def test_HV_outside_ref():
+    # Rows not smaller than ref in all objectives and duplicates do not contribute
+    F = np.array([[1.0, 4.0], [3.0, 2.0], [3.0, 2.0], [6.0, 0.0], [2.0, np.nan]])
+    HV, c = HV_contributions(F, np.array([5.0, 5.0]))
+    assert np.isclose(HV, 8.0) and np.allclose(c, [2, 0, 0, 0, 0])
+
+
+@pytest.mark.parametrize('m', [2, 3, 4])
+def test_HV_truncate(m):
+    rng = np.random.default_rng(m)
+    F = rng.random((400, m))
+    F = F[ENS_rank(F) == 1, :]
+    n_keep = F.shape[0] // 2
+    keep = HV_truncate(F, n_keep)
+    assert keep.size == n_keep and np.unique(keep).size == n_keep
+    # Random numbers of AMALGAM are not used
+    state = np.random.get_state()[1].copy()
+    assert np.array_equal(HV_truncate(F, n_keep), keep)
+    assert np.array_equal(np.random.get_state()[1], state)
@@ -0,0 +1,37 @@
+# Pareto ranking of dominance_rank [options['ranking'] = 'incremental']: dominance matrix
+# of the parents is kept between generations and only the children are compared
+
+import numpy as np
+import pytest
+
+from AMALGAM_functions import ENS_rank, dominance_rank
+from test_rank import random_FQ, matlab_rank
+
+
+@pytest.mark.parametrize('m', [2, 3, 5])
+def test_incremental_rank(m):
+    FQ = random_FQ(200, m, 1)
+    dominance = {'F': None, 'D': None}
+    assert np.array_equal(dominance_rank(FQ, dominance), matlab_rank(FQ))
+    # New population of 100 rows with 100 children: block of parents is reused
+    id_N = np.argsort(ENS_rank(FQ), kind='stable')[:100]
+    dominance['F'], dominance['D'] = FQ[id_N, :], dominance['D'][np.ix_(id_N, id_N)]
+    FQ = np.vstack([FQ[id_N, :], random_FQ(100, m, 2)])
+    assert np.array_equal(dominance_rank(FQ, dominance), matlab_rank(FQ))
+
+
+@pytest.mark.parametrize('m', [2, 3])
+def test_incremental_rank_n_max(m):
+    # Peeling stops once the fronts hold n_max rows: other rows have rank nan
+    FQ = random_FQ(200, m, 3)
+    RQ, R_all = dominance_rank(FQ, n_max=50), matlab_rank(FQ)
+    sel = ~np.isnan(RQ)
+    assert np.array_equal(RQ[sel], R_all[sel]) and np.sum(sel) >= 50
+    assert np.array_equal(sel, R_all <= np.nanmax(RQ))
+
+
+def test_incremental_rank_changed_parents():
+    # Parents that do not match the first rows of FQ are compared again
+    FQ = random_FQ(100, 2, 4)
+    dominance = {'F': FQ[:50, :] + 1, 'D': np.zeros((50, 50), dtype=bool)}
+    assert np.array_equal(dominance_rank(FQ, dominance), matlab_rank(FQ))
@@ -0,0 +1,42 @@
+# Kernels of NSGA_crossover and NSGA_mutate: NumPy versions SBX_offspring and PM_offspring
+# return the same children as the loops SBX_loop and PM_loop [compiled if numba is
+# installed] for the same random numbers
+
+import numpy as np
+import pytest
+
+import AMALGAM_functions as AF
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_SBX(seed):
+    rng = np.random.default_rng(seed)
+    N, d, m, n_pair = 40, 6, 2, 20
+    yl, yu = -np.ones(d), 2 * np.ones(d)
+    X = yl + (yu - yl) * rng.random((N, d))
+    X[:5, :] = X[5:10, :]                               # Equal parents: children are parents
+    FX = np.round(rng.random((N, m)), 1)                # Ties of dominance and density
+    dX = np.round(rng.random(N), 1)
+    dX[:5] = np.inf
+    idx = rng.integers(0, N, (n_pair, 4))
+    R_T, R_C = rng.random((n_pair, 2)), rng.random((n_pair, 3 * d + 1))
+    args = (X, FX, dX, idx, R_T, R_C, yl, yu, 0.9, 15.0)
+    G = AF.SBX_offspring(*args)
+    assert np.allclose(G, AF.SBX_loop(*args), rtol=1e-12, atol=1e-12) and np.allclose(G, AF.SBX_kernel(*args), rtol=1e-12, atol=1e-12)
+    assert G.shape == (2 * n_pair, d) and np.all(G >= yl) and np.all(G <= yu)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_PM(seed):
+    rng = np.random.default_rng(seed)
+    N, d = 40, 6
+    lo, hi = -np.ones(d), 2 * np.ones(d)
+    G = lo + (hi - lo) * rng.random((N, d))
+    G[0, :], G[1, :] = lo, hi                           # Children at the bounds
+    R_1, R_2 = rng.random((N, d)), rng.random((N, d))
+    G_0, args = G.copy(), (G, lo, hi, R_1, R_2, 20.0, 1 / d)
+    G_new = AF.PM_offspring(*args)
+    assert np.allclose(G_new, AF.PM_loop(*args), rtol=1e-12, atol=1e-12) and np.allclose(G_new, AF.PM_kernel(*args), rtol=1e-12, atol=1e-12)
+    assert np.all(G_new >= lo - 1e-12) and np.all(G_new <= hi + 1e-12)
+    # Only variables with R_2 <= p_M mutate; G is not changed
+    assert np.array_equal(G_new[R_2 > 1 / d], G[R_2 > 1 / d]) and np.array_equal(G, G_0)
@@ -0,0 +1,29 @@
+# Arrays of plugin are written once to disk by share_plugin and attached by the workers
+# of the pool as read-only memory maps; other content of plugin is passed unchanged
+
+import os
+import numpy as np
+
+import AMALGAM_functions as AF
+
+
+def test_share_plugin(tmp_path):
+    plugin = {'w': np.arange(6.0).reshape(2, 3), 'n': 5, 'name': 'model', 'parts': [np.ones(4), (np.zeros(2), 'a')],
+              'empty': np.empty(0), 'obj': np.array([None, 1], dtype=object)}
+    shared = AF.share_plugin(plugin, str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 3                   # Non-empty numeric arrays only
+    attached = AF.attach_plugin(shared)
+    assert np.array_equal(attached['w'], plugin['w']) and not attached['w'].flags.writeable
+    assert np.array_equal(attached['parts'][0], np.ones(4)) and isinstance(attached['parts'][1], tuple)
+    assert np.array_equal(attached['parts'][1][0], np.zeros(2)) and attached['parts'][1][1] == 'a'
+    assert attached['n'] == 5 and attached['name'] == 'model' and attached['empty'].size == 0
+    assert attached['obj'] is plugin['obj']
+
+
+def test_plugin_workers(calc_FX):
+    # Workers of the pool evaluate with the memory-mapped plugin arrays
+    X = np.random.default_rng(1).random((12, 3))
+    plugin = {'w': np.array([1.0, 2.0, 3.0])}
+    FX, _, CPU_info = calc_FX(X, 'AMALGAM_toy.AMALGAM_toy_plugin', plugin, parallel='yes')
+    assert CPU_info['plugin_dir'] is not None
+    assert np.allclose(FX, np.column_stack([X[:, 0], X @ plugin['w']]))
@@ -0,0 +1,38 @@
+# Pareto ranking of ENS_rank [options['ranking'] = 'fast'] against the fast nondominated
+# sorting of Deb et al. [options['ranking'] = 'matlab']
+
+import os, sys
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'miscellaneous'))
+from AMALGAM_functions import AMALGAM_rank, ENS_rank
+
+
+def random_FQ(M, m, seed):
+    # Objective function values with ties and duplicate rows
+    rng = np.random.default_rng(seed)
+    FQ = np.round(rng.random((M, m)), 1)
+    FQ[-5:, :] = FQ[:5, :]
+
+    return FQ
+
+
+def matlab_rank(FQ):
+    return AMALGAM_rank(FQ, {'density': 'crowding', 'ranking': 'matlab'})[0]
+
+
+@pytest.mark.parametrize('m', [2, 3, 5])
+@pytest.mark.parametrize('seed', range(5))
+def test_ENS_rank(m, seed):
+    FQ = random_FQ(200, m, seed)
+    assert np.array_equal(ENS_rank(FQ), matlab_rank(FQ))
+
+
+@pytest.mark.parametrize('density', ['crowding', 'strength'])
+def test_AMALGAM_rank_fast(density):
+    # Same ranks, densities and minima of AMALGAM_rank as with options['ranking'] = 'matlab'
+    FQ = random_FQ(300, 3, 7)
+    RQ, dQ, FQ_min = AMALGAM_rank(FQ, {'density': density, 'ranking': 'fast'})
+    R_m, d_m, F_m = AMALGAM_rank(FQ, {'density': density, 'ranking': 'matlab'})
+    assert np.array_equal(RQ, R_m) and np.allclose(dQ, d_m) and np.array_equal(FQ_min, F_m)
@@ -0,0 +1,39 @@
+# Failed evaluations with options['failure'] = 'resample': failed rows of the initial
+# population are drawn again, failed children of AMALGAM_async are replaced at most
+# options['retry'] + 1 times and then receive options['penalty']
+
+import numpy as np
+import pytest
+
+import AMALGAM_functions as AF
+
+
+@pytest.mark.parametrize('parallel', ['no', 'yes'])
+def test_resample_initial(setup, parallel):
+    np.random.seed(1)
+    AMALGAMPar, Par_info, options, func_handle, base_dir, CPU_info = setup(parallel=parallel, failure='resample', retry=20)
+    AMALGAMPar, Par_info, X, _, _, _, _ = AF.AMALGAM_initialize(AMALGAMPar, Par_info, None, options)
+    FX, YX = AF.AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, None, set(), CPU_info)
+    n_failed = np.sum(X[:, 0] > 0.75)
+    assert n_failed > 0 and np.sum(FX == 1e10) == 2 * n_failed
+    X, FX, _, _ = AF.AMALGAM_resample(AMALGAMPar, Par_info, options, None, None, None, None, None, None, X, FX, YX,
+        np.zeros(AMALGAMPar['N'], dtype=int), func_handle, base_dir, None, set(), CPU_info)
+    # Failed rows are drawn again within the parameter ranges until they evaluate
+    assert np.all(X[:, 0] <= 0.75) and np.all(X >= 0) and np.all(X <= 1)
+    assert np.all(FX < 1e10) and np.all(CPU_info['status'] == 0)
+
+
+def test_async_all_failed(setup):
+    # Each evaluation fails: a generation ends after N children with options['penalty']
+    np.random.seed(2)
+    AMALGAMPar, Par_info, options, func_handle, base_dir, CPU_info = setup(x_min=0.8, parallel='yes', failure='resample', retry=1,
+        timeout=30, **{'async': 'yes'})
+    AMALGAMPar, Par_info, X, p_rm, PS, _, _ = AF.AMALGAM_initialize(AMALGAMPar, Par_info, None, options)
+    FX = np.full((AMALGAMPar['N'], 2), 1e10)
+    RX, dX, FX_min = AF.AMALGAM_rank(FX, options)
+    PS = AF.Update_PS(AMALGAMPar, np.concatenate([X, FX], axis=1), PS, FX_min)
+    X, FX, _, _, _, _, _, _ = AF.AMALGAM_async(AMALGAMPar, Par_info, options, X, FX, None, RX, dX, FX_min, p_rm, PS, 2,
+        None, set(), CPU_info)
+    assert np.all(FX == 1e10)
+    # Merged children were tried retry + 1 times and replaced retry + 1 times
+    assert CPU_info['failed'][0] >= AMALGAMPar['N'] * (options['retry'] + 2)
@@ -0,0 +1,33 @@
+# Ranking of the fronts needed to select N rows [AMALGAM_select_rank]: peeled fronts have
+# the same ranks and densities as AMALGAM_rank of all rows, later fronts rank nan
+
+import numpy as np
+import pytest
+
+from AMALGAM_functions import AMALGAM_rank, AMALGAM_select_rank
+from test_rank import random_FQ
+
+
+@pytest.mark.parametrize('ranking', ['fast', 'incremental'])
+@pytest.mark.parametrize('density', ['crowding', 'hypervolume'])
+@pytest.mark.parametrize('m', [2, 3, 5])
+@pytest.mark.parametrize('N', [1, 50, 100])
+def test_select_rank(ranking, density, m, N):
+    FQ = random_FQ(200, m, N)
+    options = {'density': density, 'ranking': ranking}
+    RQ, dQ = AMALGAM_select_rank(FQ, N, options, {'F': None, 'D': None})
+    R_all, d_all, _ = AMALGAM_rank(FQ, {'density': density, 'ranking': 'matlab'})
+    sel = ~np.isnan(RQ)
+    assert np.array_equal(RQ[sel], R_all[sel]) and np.allclose(dQ[sel], d_all[sel]) and np.all(dQ[~sel] == 0)
+    # Fronts are peeled until they hold N rows or more
+    r_max = np.max(RQ[sel])
+    assert np.array_equal(sel, R_all <= r_max)
+    assert np.sum(sel) >= N and np.sum(R_all < r_max) < N
+
+
+def test_select_rank_strength():
+    # Raw fitness of strength density needs all rows
+    FQ = random_FQ(200, 2, 0)
+    options = {'density': 'strength', 'ranking': 'fast'}
+    RQ, dQ = AMALGAM_select_rank(FQ, 50, options)
+    assert np.allclose(dQ, AMALGAM_rank(FQ, options)[1])
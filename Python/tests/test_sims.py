@@ -0,0 +1,35 @@
+# Store of model simulations of options['modout'] = 'yes': Y of each generation is
+# appended to memory-mapped file AMALGAM_Y.dat, removed by AMALGAM_end unless saved
+
+import os
+import numpy as np
+import pytest
+
+import AMALGAM_functions as AF
+
+
+def test_sims_round_trip(tmp_path):
+    sims = {'file': str(tmp_path / 'AMALGAM_Y.dat'), 'Y': None, 'rows': 0, 'n_Y': 0}
+    assert AF.sims_load(sims, np.arange(3)) == (None, None)
+    # Length of simulation not known yet: failed rows get row -1
+    iY = AF.sims_add(sims, None, 2)
+    assert np.array_equal(iY, [-1, -1]) and sims['rows'] == 0
+    Y_1, Y_2 = np.arange(12.0).reshape(3, 4), -np.arange(8.0).reshape(2, 4)
+    iY = np.concatenate([iY, AF.sims_add(sims, Y_1, 3), AF.sims_add(sims, Y_2, 2), AF.sims_add(sims, None, 1)])
+    assert np.array_equal(iY, [-1, -1, 0, 1, 2, 3, 4, 5]) and sims['rows'] == 6
+    assert os.path.getsize(sims['file']) == 6 * 4 * 8
+    YX, Y = AF.sims_load(sims, iY[[5, 4, 0, 2]])
+    assert np.array_equal(Y[:5], np.vstack([Y_1, Y_2])) and np.all(np.isnan(Y[5]))
+    assert np.array_equal(YX[[0, 1, 3]], [Y_2[0], Y_1[2], Y_1[0]]) and np.all(np.isnan(YX[2]))
+    # Copy in memory
+    _, Y = AF.sims_load(sims, iY, keep=False)
+    assert not isinstance(Y, np.memmap) and Y.shape == (6, 4)
+
+
+@pytest.mark.parametrize('save', ['no', 'yes'])
+def test_sims_end(setup, save):
+    AMALGAMPar, _, options, _, base_dir, CPU_info = setup(modout='yes', save=save)
+    AF.sims_add(CPU_info['sims'], np.ones((AMALGAMPar['N'], 5)), AMALGAMPar['N'])
+    assert CPU_info['sims']['file'] == os.path.abspath('AMALGAM_Y.dat') and os.path.exists('AMALGAM_Y.dat')
+    AF.AMALGAM_end(AMALGAMPar, options, base_dir, CPU_info)
+    assert os.path.exists('AMALGAM_Y.dat') == (save == 'yes')
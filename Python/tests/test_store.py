@@ -0,0 +1,39 @@
+# Evaluation store [options['store'] = 'yes']: evaluations of one run are found by the
+# next run of the same model and plugin; failed evaluations are not stored
+
+import numpy as np
+
+import AMALGAM_functions as AF
+from AMALGAM_toy import AMALGAM_toy
+
+
+def run(setup, X, plugin = None, **kwargs):
+    # New run in the same directory [= same AMALGAM_store.db]
+    Func_name = 'AMALGAM_toy.AMALGAM_toy_plugin' if plugin is not None else 'AMALGAM_toy.AMALGAM_toy_sim'
+    AMALGAMPar, _, options, func_handle, base_dir, CPU_info = setup(N=X.shape[0], Func_name=Func_name, plugin=plugin, store='yes', **kwargs)
+    FX, Y = AF.AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, plugin, set(), CPU_info)
+
+    return FX, Y, CPU_info
+
+
+def test_store(setup):
+    X = np.random.default_rng(1).random((12, 3))
+    failed = X[:, 0] > 0.75
+    FX, Y, CPU_info = run(setup, X, modout='yes')
+    assert CPU_info['hits'][2] == 0
+    # Next run: all rows except the failed ones are read from the store
+    X_2 = np.vstack([X, 0.5 * np.ones((1, 3))])
+    FX_2, Y_2, CPU_info = run(setup, X_2, modout='yes')
+    assert CPU_info['hits'][2] == np.sum(~failed)
+    assert np.array_equal(FX_2[:-1, :], FX) and np.allclose(FX_2[-1, :], AMALGAM_toy(X_2[-1, :]))
+    assert np.array_equal(Y_2[:-1, :][~failed, :], Y[~failed, :]) and np.allclose(Y_2[-1, :], [0.5, 1.0, 1.5])
+    assert np.array_equal(CPU_info['status'][:-1], failed.astype(int))
+
+
+def test_store_plugin(setup):
+    # Evaluations of another plugin are not shared
+    X = 0.75 * np.random.default_rng(2).random((8, 3))
+    run(setup, X, {'w': np.ones(3)})
+    assert run(setup, X, {'w': np.ones(3)})[2]['hits'][2] == 8
+    assert run(setup, X, {'w': np.arange(3.0)})[2]['hits'][2] == 0
+    assert AF.plugin_hash({'w': np.ones(3), 'n': 2}) == AF.plugin_hash({'n': 2, 'w': np.ones(3)})
@@ -0,0 +1,52 @@
+# Surrogate-assisted pre-screening of options['surrogate']: surrogate_predict interpolates
+# the archive and AMALGAM_surrogate selects the N children of the oversampled candidates
+# with lowest rank [largest density] on predicted objective function values
+
+import numpy as np
+import pytest
+
+import AMALGAM_functions as AF
+
+
+@pytest.mark.parametrize('method', ['knn', 'rbf'])
+def test_surrogate_predict(method):
+    rng = np.random.default_rng(9)
+    X_train, X_new = rng.random((60, 3)), rng.random((10, 3))
+    F_train = np.column_stack([X_train @ [1, 2, 3], 1 - X_train[:, 0]])
+    # Exact at training points; a thin-plate spline reproduces linear functions
+    assert np.allclose(AF.surrogate_predict(X_train, F_train, X_train[:10], method), F_train[:10], atol=1e-6)
+    F_new = AF.surrogate_predict(X_train, F_train, X_new, method)
+    if method == 'rbf':
+        assert np.allclose(F_new, np.column_stack([X_new @ [1, 2, 3], 1 - X_new[:, 0]]), atol=1e-6)
+    else:
+        assert np.all(F_new >= F_train.min(axis=0)) and np.all(F_new <= F_train.max(axis=0))
+
+
+@pytest.mark.parametrize('method', ['knn', 'rbf'])
+def test_surrogate_select(setup, monkeypatch, method):
+    np.random.seed(3)
+    AMALGAMPar, Par_info, options, func_handle, base_dir, CPU_info = setup(x_min=0.0, surrogate=method, oversample=4)
+    AMALGAMPar, Par_info, X, p_rm, PS, _, _ = AF.AMALGAM_initialize(AMALGAMPar, Par_info, None, options)
+    FX, _ = AF.AMALGAM_calc_FX(X, AMALGAMPar, options, func_handle, base_dir, None, set(), CPU_info)
+    RX, dX, FX_min = AF.AMALGAM_rank(FX, options)
+    PS = AF.Update_PS(AMALGAMPar, np.concatenate([X, FX], axis=1), PS, FX_min)
+    id, id_rm = AF.AMALGAM_distribution(AMALGAMPar, p_rm)
+    G, PS = AF.AMALGAM_children(AMALGAMPar, Par_info, X, FX, RX, dX, PS, id_rm, None)
+    # Candidates and their predicted objective function values
+    predicted = {}
+    surrogate_predict = AF.surrogate_predict
+    def predict(X_train, F_train, X_new, method):
+        predicted['G'], predicted['F'] = X_new, surrogate_predict(X_train, F_train, X_new, method)
+        return predicted['F']
+    monkeypatch.setattr(AF, 'surrogate_predict', predict)
+    G_sel, id_sel = AF.AMALGAM_surrogate(AMALGAMPar, Par_info, options, X, FX, RX, dX, PS, p_rm,
+        np.concatenate([X, FX], axis=1), G, id, None)
+    N = AMALGAMPar['N']
+    assert G_sel.shape == G.shape and id_sel.shape == id.shape and predicted['G'].shape[0] == 4 * N
+    assert np.array_equal(predicted['G'][:N], G)
+    # Selected children have lowest rank among candidates on predicted values
+    RQ = AF.AMALGAM_rank(np.vstack([FX, predicted['F']]), options)[0][N:]
+    match = np.all(predicted['G'][:, None, :] == G_sel[None, :, :], axis=2)
+    sel = np.any(match, axis=1)
+    assert np.all(np.any(match, axis=0))
+    assert np.max(RQ[sel]) <= np.min(RQ[~sel])
@@ -0,0 +1,25 @@
+# Vectorized objective function [options['vectorized'] = 'yes']: the rows of X (or the
+# rows of a chunk of a worker) are evaluated in one call with the same FX and Y as the
+# evaluation of each row; a failed call fails all rows of its block
+
+import numpy as np
+import pytest
+
+from AMALGAM_toy import AMALGAM_toy
+
+
+@pytest.mark.parametrize('parallel, backend', [('no', 'process'), ('yes', 'process'), ('yes', 'thread')])
+def test_vectorized(calc_FX, parallel, backend):
+    X = 0.75 * np.random.default_rng(1).random((30, 4))
+    FX, Y, CPU_info = calc_FX(X, 'AMALGAM_toy.AMALGAM_toy_vec', vectorized='yes', modout='yes', parallel=parallel, backend=backend)
+    assert np.allclose(FX, [AMALGAM_toy(x) for x in X])
+    assert np.allclose(Y, np.cumsum(X, axis=1))
+    assert np.all(CPU_info['status'] == 0)
+
+
+def test_vectorized_failure(calc_FX):
+    X = np.random.default_rng(2).random((10, 4))
+    X[3, 0] = 0.9
+    FX, Y, CPU_info = calc_FX(X, 'AMALGAM_toy.AMALGAM_toy_vec', vectorized='yes')
+    assert np.all(FX == 1e10) and np.all(CPU_info['status'] == 1)
+    assert CPU_info['failed'][0] == X.shape[0]